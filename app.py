@@ -8,9 +8,7 @@ import re
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.clients.openrouter_client import OpenRouterClient
-from src.core.conversation_manager import ConversationManager
-from src.core.context_manager import ContextManager
-from src.tracking.conversation_tracker import ConversationTracker
+from src.core.session_store import SessionStore
 from src.utils.config import Config
 
 # Configure Streamlit page
@@ -75,29 +73,21 @@ def initialize_client():
     """Initialize and cache the OpenRouter client."""
     try:
         client = OpenRouterClient()
-        test_result = client.test_connection()
-        if test_result["status"] != "success":
-            st.error(f"❌ OpenRouter connection failed: {test_result.get('error')}")
-            return None
+        # Don't block startup on a model round trip: probe in the background instead
+        client.check_health()
         return client
     except Exception as e:
         st.error(f"❌ Failed to initialize OpenRouter client: {str(e)}")
         return None
 
 
-def initialize_conversation_components(client):
-    """Initialize fresh conversation components for each session."""
+@st.cache_resource
+def initialize_session_store(_client):
+    """Initialize and cache the session store shared by every browser session."""
     try:
-        context_manager = ContextManager(client)
-        tracker = ConversationTracker(base_output_dir="conversations")
-        conversation_manager = ConversationManager(
-            client=client,
-            context_manager=context_manager,
-            tracker=tracker
-        )
-        return conversation_manager
+        return SessionStore(client=_client, tracking_dir="conversations")
     except Exception as e:
-        st.error(f"❌ Failed to initialize conversation components: {str(e)}")
+        st.error(f"❌ Failed to initialize the session store: {str(e)}")
         return None
 
 
@@ -123,10 +113,22 @@ def step_back_to(index: int, manager):
         for msg in st.session_state.messages
         if msg["role"] in ("user", "assistant")
     ]
-    manager.conversation_history = new_backend_history
+    # Messages show plans in full; the manager swaps stored plans back to their digest
+    manager.set_conversation_history(new_backend_history)
     return True
 
 
+def get_tool_indicator(tool_name):
+    """Returns the marker shown between the interim response and the tool-enriched answer."""
+    if tool_name == "Weather":
+        return "🌤️ *Weather data incorporated*"
+    elif tool_name == "Planning":
+        return "📋 *Detailed plan created*"
+    elif tool_name == "Plan_Details":
+        return "📋 *Stored plan consulted*"
+    return f"✅ *{tool_name} data incorporated*"
+
+
 def process_and_display_response(user_message, manager):
     """
     Processes a user message with a clear, step-by-step visual flow for tool usage.
@@ -135,15 +137,22 @@ def process_and_display_response(user_message, manager):
         response_placeholder = st.empty()
         status_placeholder = st.empty()
         full_response = ""
+        streamed_text = ""  # Text of the response currently being streamed
 
         # Get the generator object
         response_generator = manager.send_message(user_message)
 
         # Start with the "Thinking..." spinner.
         with st.spinner("Thinking..."):
-            # This loop will run until the first message is ready or a tool is needed.
+            # This loop will run until the first text arrives or a tool is needed.
             for update in response_generator:
-                if update["type"] == "interim_response":
+                if update["type"] == "delta":
+                    # First streamed tokens - show them and let the main loop keep streaming.
+                    streamed_text = update["content"]
+                    response_placeholder.markdown(streamed_text)
+                    break
+
+                elif update["type"] == "interim_response":
                     # The first message before a tool is used.
                     full_response = update["content"]
                     response_placeholder.markdown(full_response)
@@ -154,7 +163,7 @@ def process_and_display_response(user_message, manager):
                     # This is a direct response without any tools.
                     full_response = update["content"]
                     response_placeholder.markdown(full_response)
-                    # Break the "Thinking..." spinner. The process will continue to the context update.
+                    # Break the "Thinking..." spinner. The user context is updated in the background.
                     break
 
                 elif update["type"] == "error":
@@ -168,12 +177,29 @@ def process_and_display_response(user_message, manager):
         tool_spinner_active = False
         current_tool_name = None
         for update in response_generator:
-            if update["type"] == "status":
+            if update["type"] == "delta":
+                streamed_text += update["content"]
+                if tool_spinner_active:
+                    # Streaming the tool-enriched answer below the interim response
+                    response_placeholder.markdown(
+                        full_response + "\n\n" + get_tool_indicator(current_tool_name) + "\n\n" + streamed_text
+                    )
+                else:
+                    response_placeholder.markdown(streamed_text)
+
+            elif update["type"] == "interim_response":
+                # The streamed text before a tool block, now final.
+                full_response = update["content"]
+                response_placeholder.markdown(full_response)
+                streamed_text = ""
+
+            elif update["type"] == "status":
                 # Start the tool operation spinner.
                 tool_spinner_active = True
                 current_tool_name = update.get('tool_name', 'Tool')
                 print(current_tool_name) #print for debugging
                 status_placeholder.info(f"⏳ {update['content']}")  # Show the initial status
+                streamed_text = ""
 
             elif update["type"] == "tool_success" and tool_spinner_active:
                 # Show "Got the weather data" while the spinner is conceptually still running.
@@ -188,12 +214,7 @@ def process_and_display_response(user_message, manager):
                 # Give the final answer with the tool data.
                 if tool_spinner_active:  # This means we had an interim response
                     # Dynamic tool indicator based on which tool was used
-                    if current_tool_name == "Weather":
-                        tool_indicator = "🌤️ *Weather data incorporated*"
-                    elif current_tool_name == "Planning":
-                        tool_indicator = "📋 *Detailed plan created*"
-                    else:
-                        tool_indicator = f"✅ *{current_tool_name} data incorporated*"
+                    tool_indicator = get_tool_indicator(current_tool_name)
                     full_response += "\n\n" + tool_indicator + "\n\n" + update["content"]
                 else:
                      full_response = update["content"]
@@ -202,14 +223,12 @@ def process_and_display_response(user_message, manager):
                 status_placeholder.empty() # Clear all status messages/spinners
                 tool_spinner_active = False
 
-            elif update["type"] == "context_update":
-                # Start the "Updating context..." spinner.
-                with st.spinner("Updating context..."):
-                    # Exhaust the rest of the generator to perform the background update.
-                    for _ in response_generator:
-                        pass
-                # The process is now fully complete.
-                break
+            elif update["type"] == "error":
+                # A streamed reply can still fail part-way through.
+                full_response = ""
+                response_placeholder.error(update["content"])
+                status_placeholder.empty()
+                return
 
     # Add the final, complete response to the session state for history and rerun.
     if full_response:
@@ -224,9 +243,14 @@ def main():
         st.error("❌ Failed to initialize the OpenRouter client. Please check your API configuration.")
         st.stop()
 
-    # Initialize fresh conversation manager for each browser session
-    if "conversation_manager" not in st.session_state:
-        st.session_state.conversation_manager = initialize_conversation_components(client)
+    # Each browser session owns a conversation in the shared store (idle ones are spilled to disk)
+    store = initialize_session_store(client)
+    if store is None:
+        st.error("❌ Failed to initialize the session store. Please refresh the page.")
+        st.stop()
+
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = store.new_session_id()
 
     if "messages" not in st.session_state:
         st.session_state.messages = []
@@ -234,13 +258,16 @@ def main():
     if "session_started" not in st.session_state:
         st.session_state.session_started = False
 
-    # Check if conversation manager initialization succeeded
-    if st.session_state.conversation_manager is None:
-        st.error("❌ Failed to initialize the conversation manager. Please refresh the page.")
-        st.stop()
+    # Pin the conversation for this script run (st.rerun/st.stop raise, so release in finally)
+    manager = store.acquire(st.session_state.session_id)
+    try:
+        render_app(client, manager)
+    finally:
+        store.release(st.session_state.session_id)
 
-    manager = st.session_state.conversation_manager
 
+def render_app(client, manager):
+    """Render the sidebar and chat for one script run, with the session's conversation pinned."""
     # Sidebar
     with st.sidebar:
         # Logo and branding
@@ -261,15 +288,15 @@ def main():
             status_box.success(f"📊 Session started: {session_id}")
 
         # Display conversation stats
-        if st.session_state.conversation_manager:
-            stats = st.session_state.conversation_manager.get_conversation_statistics()
+        if manager:
+            stats = manager.get_conversation_statistics()
             st.markdown("### 📈 Conversation Stats")
             st.metric("Conversation turns", stats["conversation_turns"])
             st.metric("Total messages", stats["total_messages"])
 
             # Display context info
-            if st.session_state.conversation_manager.context_manager:
-                context_summary = st.session_state.conversation_manager.context_manager.get_context_summary()
+            if manager.context_manager:
+                context_summary = manager.context_manager.get_context_summary()
                 if context_summary["has_user_context"]:
                     st.markdown("### 🧠 User Context")
                     st.success("✅ Learning about you")
@@ -279,10 +306,15 @@ def main():
                     st.markdown("### 🧠 User Context")
                     st.info("💭 Building understanding...")
 
+        # Connection status (refreshed lazily; real replies keep it up to date)
+        health = client.check_health()
+        if health["status"] == "unhealthy":
+            st.warning(f"⚠️ OpenRouter may be unavailable: {health['error']}")
+
         # Reset conversation button
         if st.button("🔄 Reset Conversation", type="secondary"):
-            st.session_state.conversation_manager.reset_conversation()
-            st.session_state.conversation_manager.context_manager.reset_context()
+            manager.reset_conversation()
+            manager.context_manager.reset_context()
             st.session_state.messages = []
             st.rerun()
 
@@ -72,13 +72,8 @@ class PhileasCLI:
             print(f"{Colors.OKCYAN}🔌 Initializing OpenRouter client...{Colors.ENDC}")
             self.client = OpenRouterClient()
 
-            # Test connection
-            test_result = self.client.test_connection()
-            if test_result["status"] != "success":
-                print(f"{Colors.FAIL}❌ OpenRouter connection failed: {test_result.get('error')}{Colors.ENDC}")
-                return False
-
-            print(f"{Colors.OKGREEN}✅ OpenRouter connection successful{Colors.ENDC}")
+            # Check the connection in the background; the first reply confirms it anyway
+            self.client.check_health()
 
             # Initialize context manager
             self.context_manager = ContextManager(self.client)
@@ -131,8 +126,11 @@ class PhileasCLI:
         print(f"  • User messages: {stats['user_messages']}")
         print(f"  • Assistant messages: {stats['assistant_messages']}")
 
+        health = self.client.check_health()
+        print(f"  • OpenRouter status: {health['status']}" + (f" ({health['error']})" if health["error"] else ""))
+
         if stats['approaching_limit']:
-            print(f"  {Colors.WARNING}⚠️  Approaching history limit ({stats['history_limit']}){Colors.ENDC}")
+            print(f"  {Colors.WARNING}⚠️  Approaching history limit ({stats['history_tokens']}/{stats['history_limit']} tokens){Colors.ENDC}")
 
         if self.tracker:
             tracking_info = self.conversation_manager.get_tracking_info()
@@ -155,7 +153,7 @@ class PhileasCLI:
 
     def print_history(self):
         """Print conversation history"""
-        history = self.conversation_manager.get_conversation_history(include_system=False)
+        history = self.conversation_manager.get_conversation_history(include_system=False, full_plans=True)
 
         if not history:
             print(f"\n{Colors.WARNING}No conversation history yet.{Colors.ENDC}")
@@ -176,7 +174,7 @@ class PhileasCLI:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"conversation_{timestamp}.md"
 
-        history = self.conversation_manager.get_conversation_history(include_system=False)
+        history = self.conversation_manager.get_conversation_history(include_system=False, full_plans=True)
 
         with open(filename, 'w', encoding='utf-8') as f:
             f.write("# Phileas Travel Assistant Conversation\n\n")
@@ -271,9 +269,24 @@ class PhileasCLI:
         tool_used = False
         response_printed = False
         interim_response = ""
+        streaming = False  # True while the deltas of a response are being printed
 
         for update in response_generator:
-            if update["type"] == "status":
+            if update["type"] == "delta":
+                # Print streamed text as it arrives
+                if not streaming:
+                    if tool_used and interim_response:
+                        print()  # Separate the tool-enriched answer from the tool output
+                    elif not response_printed:
+                        print(f"{Colors.OKCYAN}🤖 Assistant:{Colors.ENDC} ", end="")
+                    streaming = True
+                    response_printed = True
+                print(update["content"], end="", flush=True)
+
+            elif update["type"] == "status":
+                if streaming:
+                    print()
+                    streaming = False
                 # Show status updates for tool usage
                 if not update.get("content", "").startswith("Thinking"):  # Skip the initial "Thinking..." status
                     print(f"{Colors.DIM}⏳ {update['content']}{Colors.ENDC}")
@@ -281,7 +294,11 @@ class PhileasCLI:
             elif update["type"] == "interim_response":
                 # Store interim response (before tool usage) but don't print yet
                 interim_response = update['content']
-                if interim_response:
+                if streaming:
+                    # Already shown while streaming
+                    print()
+                    streaming = False
+                elif interim_response:
                     print(f"{Colors.OKCYAN}🤖 Assistant:{Colors.ENDC} {interim_response}")
                     response_printed = True
 
@@ -296,7 +313,11 @@ class PhileasCLI:
 
             elif update["type"] == "response":
                 # This is the actual response content
-                if tool_used and interim_response:
+                if streaming:
+                    # Already shown while streaming
+                    print()
+                    streaming = False
+                elif tool_used and interim_response:
                     # This is additional content after tool usage
                     print(f"\n{update['content']}")
                 elif not response_printed:
@@ -306,13 +327,12 @@ class PhileasCLI:
                 # If response was already printed (as interim), don't print again
 
             elif update["type"] == "error":
+                if streaming:
+                    print()
+                    streaming = False
                 # Show error
                 print(f"{Colors.FAIL}❌ Error: {update['content']}{Colors.ENDC}")
 
-            elif update["type"] == "context_update":
-                # Context is being updated silently
-                pass
-
             elif update["type"] == "final_response":
                 # Final response with metadata - only show usage info if configured
                 if Config.OPENROUTER_API_KEY.startswith("sk-or-") and update.get("usage"):
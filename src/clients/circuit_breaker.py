@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Dict, Any, Callable
+
+from ..utils.config import Config
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker guarding a single model"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = None, cooldown_seconds: float = None,
+                 half_open_max_calls: int = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a closed breaker
+
+        Args:
+            name: Model name the breaker guards (for logs)
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown_seconds: How long the circuit stays open before allowing a trial call
+            half_open_max_calls: Trial calls allowed at once while half-open
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.cooldown_seconds = cooldown_seconds or Config.CIRCUIT_BREAKER_COOLDOWN
+        self.half_open_max_calls = half_open_max_calls or Config.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_calls = 0
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to this model now
+
+        Returns:
+            False while the circuit is open (or half-open with all trial slots taken)
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            # Open and half-open both re-arm after a cool-down, so a trial call that never
+            # reported back (e.g. an abandoned stream) cannot wedge the breaker
+            if self.clock() - self.opened_at >= self.cooldown_seconds:
+                if self.state == self.OPEN:
+                    print(f"🟡 Circuit for {self.name} half-open, sending a trial request")
+                self.state = self.HALF_OPEN
+                self.opened_at = self.clock()
+                self.trial_calls = 0
+
+            if self.state == self.HALF_OPEN and self.trial_calls < self.half_open_max_calls:
+                self.trial_calls += 1
+                return True
+
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        with self.lock:
+            if self.state != self.CLOSED:
+                print(f"🟢 Circuit for {self.name} closed again")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_calls = 0
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit at the threshold or on a failed trial"""
+        with self.lock:
+            self.consecutive_failures += 1
+
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                    print(f"🔴 Circuit for {self.name} opened after {self.consecutive_failures} failure(s)")
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self.trial_calls = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get the breaker's current state and counters"""
+        with self.lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "seconds_until_trial": (
+                    max(0.0, self.cooldown_seconds - (self.clock() - self.opened_at))
+                    if self.state != self.CLOSED else 0.0
+                )
+            }
+
+
+class CircuitBreakerRegistry:
+    """Holds one circuit breaker per model name"""
+
+    def __init__(self):
+        """Initialize an empty registry; breakers are created on first use"""
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        """Get or create the breaker for a model"""
+        with self.lock:
+            if model not in self.breakers:
+                self.breakers[model] = CircuitBreaker(model)
+            return self.breakers[model]
+
+    def get_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every breaker created so far"""
+        with self.lock:
+            breakers = list(self.breakers.items())
+        return {model: breaker.get_state() for model, breaker in breakers}
+
+
+# Shared by every client in the process: an outage seen by one session protects all of them
+_shared_registry = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get the process-wide circuit breaker registry"""
+    return _shared_registry
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Tuple
+
+from ..utils.config import Config
+
+# Background revalidation of stale entries, shared by every WeatherClient in the process
+_refresh_executor = ThreadPoolExecutor(max_workers=Config.WEATHER_REFRESH_MAX_WORKERS, thread_name_prefix="weather-refresh")
+
+
+class ForecastCache:
+    """
+    In-process cache of OpenWeather payloads, keyed by endpoint and rounded coordinates
+
+    An entry is fresh until the provider's next update boundary (e.g. the next 3-hour mark
+    for the forecast), so it never outlives data that has actually changed. After that it
+    is still served for Config.WEATHER_STALE_TTL seconds while one background request
+    refreshes it; older entries are fetched again before returning.
+
+    Cached payloads are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = None, stale_ttl_seconds: float = None, coord_decimals: int = None):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_entries: Entries kept before the least recently used one is evicted
+            stale_ttl_seconds: How long past its update boundary an entry may be served while refreshing
+            coord_decimals: Decimals lat/lon are rounded to, so nearby lookups share an entry
+        """
+        self.max_entries = max_entries or Config.WEATHER_CACHE_MAX_ENTRIES
+        self.stale_ttl_seconds = Config.WEATHER_STALE_TTL if stale_ttl_seconds is None else stale_ttl_seconds
+        self.coord_decimals = Config.WEATHER_CACHE_COORD_DECIMALS if coord_decimals is None else coord_decimals
+        self.entries: "OrderedDict[Tuple[str, float, float], tuple]" = OrderedDict()  # key -> (fresh_until, payload)
+        self.refreshing = set()  # keys with a background refresh in flight
+        self.lock = threading.Lock()
+
+    def get_or_fetch(self, endpoint: str, lat: float, lon: float, fetch: Callable[[float, float], Dict[str, Any]],
+                     update_interval: float) -> Dict[str, Any]:
+        """
+        Get a payload from the cache, fetching it on a miss
+
+        Args:
+            endpoint: Name of the API endpoint (part of the key)
+            lat: Latitude
+            lon: Longitude
+            fetch: Called with the rounded coordinates to get the payload (its exceptions propagate on a miss)
+            update_interval: Seconds between the provider's updates of this endpoint
+
+        Returns:
+            The payload
+        """
+        lat, lon = round(lat, self.coord_decimals), round(lon, self.coord_decimals)
+        key = (endpoint, lat, lon)
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                fresh_until, payload = entry
+                if now < fresh_until + self.stale_ttl_seconds:
+                    self.entries.move_to_end(key)
+                    if now >= fresh_until:
+                        self._refresh_in_background(key, fetch, update_interval)
+                    return payload
+
+        payload = fetch(lat, lon)
+        self._store(key, payload, update_interval)
+        return payload
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+
+    def _store(self, key: Tuple[str, float, float], payload: Dict[str, Any], update_interval: float):
+        """Store a payload until the next update boundary, evicting the least recently used over the limit"""
+        fresh_until = (time.time() // update_interval + 1) * update_interval
+        with self.lock:
+            self.entries[key] = (fresh_until, payload)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _refresh_in_background(self, key: Tuple[str, float, float], fetch: Callable[[float, float], Dict[str, Any]],
+                               update_interval: float):
+        """Start refreshing a stale entry, unless a refresh is already running (caller holds the lock)"""
+        if key in self.refreshing:
+            return
+        self.refreshing.add(key)
+        _refresh_executor.submit(self._refresh, key, fetch, update_interval)
+
+    def _refresh(self, key: Tuple[str, float, float], fetch: Callable[[float, float], Dict[str, Any]],
+                 update_interval: float):
+        """Worker body of _refresh_in_background (on failure the stale entry stays until it expires)"""
+        try:
+            self._store(key, fetch(key[1], key[2]), update_interval)
+        except Exception as e:
+            print(f"⚠️ Background weather refresh failed for {key[0]} at {key[1]}, {key[2]}: {str(e)}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+
+# Shared by every WeatherClient in the process (each ConversationManager has its own client)
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Get the process-wide forecast cache"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ForecastCache()
+        return _shared_cache
@@ -0,0 +1,145 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..utils.config import Config
+
+# Country spellings users type, mapped to the ISO 3166 code the geocoder resolves them to
+COUNTRY_ALIASES = {
+    "uk": "gb", "united kingdom": "gb", "great britain": "gb", "britain": "gb", "england": "gb",
+    "usa": "us", "u.s.": "us", "u.s.a.": "us", "united states": "us", "united states of america": "us", "america": "us",
+    "uae": "ae", "united arab emirates": "ae",
+    "spain": "es", "france": "fr", "italy": "it", "germany": "de", "portugal": "pt", "greece": "gr",
+    "netherlands": "nl", "holland": "nl", "japan": "jp", "israel": "il", "thailand": "th", "mexico": "mx",
+    "canada": "ca", "australia": "au", "turkey": "tr", "türkiye": "tr", "czech republic": "cz", "czechia": "cz",
+    "south korea": "kr", "korea": "kr"
+}
+
+
+def normalize_location(location: str) -> str:
+    """
+    Cache key of a location string: "  Barcelona ,Spain " and "barcelona, es" give the same key
+
+    Case, Unicode form, whitespace and comma spacing are normalized, and a trailing country
+    name is replaced by its ISO code (see COUNTRY_ALIASES).
+
+    Args:
+        location: Location as the model wrote it
+
+    Returns:
+        The normalized key
+    """
+    text = unicodedata.normalize("NFKC", location).casefold()
+    parts = [re.sub(r"\s+", " ", part).strip(" .") for part in text.split(",")]
+    parts = [part for part in parts if part]
+    if len(parts) > 1:
+        parts[-1] = COUNTRY_ALIASES.get(parts[-1], parts[-1])
+    return ",".join(parts)
+
+
+class GeocodeCache:
+    """
+    Geocoding results: an in-memory LRU in front of a SQLite file that survives restarts
+
+    Values are {"found": True, "lat", "lon", "name"} or {"found": False} for locations the
+    geocoder doesn't know; those expire sooner (Config.GEOCODE_NEGATIVE_TTL).
+    """
+
+    def __init__(self, path: str = None, max_entries: int = None, ttl_seconds: float = None,
+                 negative_ttl_seconds: float = None):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite file path ("" keeps the cache in memory only; default from Config)
+            max_entries: Entries kept in memory before the least recently used one is evicted
+            ttl_seconds: How long coordinates stay valid
+            negative_ttl_seconds: How long a "not found" result stays valid
+        """
+        self.max_entries = max_entries or Config.GEOCODE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.GEOCODE_CACHE_TTL
+        self.negative_ttl_seconds = negative_ttl_seconds or Config.GEOCODE_NEGATIVE_TTL
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self.lock = threading.Lock()
+
+        path = Config.GEOCODE_CACHE_PATH if path is None else path
+        self.connection = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(str(path), check_same_thread=False)
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS geocodes (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result (possibly a "not found" one), or None if missing or expired"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and self.connection:
+                row = self.connection.execute("SELECT stored_at, value FROM geocodes WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if now - stored_at > self._ttl_for(value):
+                self.entries.pop(key, None)
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a result in memory and on disk, and drop expired rows"""
+        now = time.time()
+        with self.lock:
+            self._remember(key, (now, value))
+            if self.connection:
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO geocodes (key, value, stored_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value, ensure_ascii=False), now)
+                    )
+                    self.connection.execute("DELETE FROM geocodes WHERE stored_at < ?", (now - self.ttl_seconds,))
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+            if self.connection:
+                with self.connection:
+                    self.connection.execute("DELETE FROM geocodes")
+
+    def _ttl_for(self, value: Dict[str, Any]) -> float:
+        """Found locations are kept much longer than misses"""
+        return self.ttl_seconds if value["found"] else self.negative_ttl_seconds
+
+    def _remember(self, key: str, entry: tuple):
+        """Put an entry in the memory LRU (caller holds the lock)"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# Shared by every WeatherClient in the process; created on first use so the SQLite file is only opened when needed
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """Get the process-wide geocode cache"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = GeocodeCache()
+        return _shared_cache
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+from ..utils.config import Config
+
+
+class HealthMonitor:
+    """Cached readiness status, fed by real requests and refreshed by a background probe when stale"""
+
+    HEALTHY = "healthy"
+    UNHEALTHY = "unhealthy"
+    UNKNOWN = "unknown"
+
+    def __init__(self, probe: Callable[[], None], ttl_seconds: float = None):
+        """
+        Initialize with an unknown status; nothing is checked until asked
+
+        Args:
+            probe: Cheap call that raises if the service is unreachable
+            ttl_seconds: How long a result stays fresh before a new probe is needed
+        """
+        self.probe = probe
+        self.ttl_seconds = ttl_seconds or Config.HEALTH_CHECK_TTL
+        self.status = self.UNKNOWN
+        self.error: Optional[str] = None
+        self.source: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.probe_done: Optional[threading.Event] = None  # set when the running probe finishes (None if none is running)
+        self.lock = threading.Lock()
+
+    def record_success(self, source: str = "request"):
+        """Mark the service healthy (a successful real request counts as a health check)"""
+        with self.lock:
+            self.status = self.HEALTHY
+            self.error = None
+            self.source = source
+            self.checked_at = time.monotonic()
+
+    def record_failure(self, error: str, source: str = "request"):
+        """Mark the service unhealthy"""
+        with self.lock:
+            if self.status != self.UNHEALTHY:
+                print(f"🩺 OpenRouter marked unhealthy ({source}): {error}")
+            self.status = self.UNHEALTHY
+            self.error = error
+            self.source = source
+            self.checked_at = time.monotonic()
+
+    def _is_fresh(self) -> bool:
+        """Whether the last result is younger than the TTL (caller holds the lock)"""
+        return self.checked_at is not None and time.monotonic() - self.checked_at < self.ttl_seconds
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the cached status without probing
+
+        Returns:
+            Dict with status ("healthy"/"unhealthy"/"unknown"), what produced it, the error if
+            any, its age in seconds and whether a probe is running
+        """
+        with self.lock:
+            return {
+                "status": self.status,
+                "source": self.source,
+                "error": self.error,
+                "age_seconds": round(time.monotonic() - self.checked_at, 1) if self.checked_at else None,
+                "fresh": self._is_fresh(),
+                "probing": self.probe_done is not None
+            }
+
+    def check(self, wait: bool = False) -> Dict[str, Any]:
+        """
+        Return the cached status, starting a probe first if it is stale
+
+        Args:
+            wait: Run the probe in the calling thread instead of in the background, or wait
+                for the probe another caller already started
+
+        Returns:
+            Same dict as get_status(); with wait=False a stale status is returned as-is
+            while the probe runs
+        """
+        with self.lock:
+            probe_done = self.probe_done
+            start_probe = probe_done is None and not self._is_fresh()
+            if start_probe:
+                self.probe_done = threading.Event()
+
+        if start_probe:
+            if wait:
+                self._run_probe()
+            else:
+                threading.Thread(target=self._run_probe, name="health-probe", daemon=True).start()
+        elif wait and probe_done is not None:
+            probe_done.wait()
+
+        return self.get_status()
+
+    def _run_probe(self):
+        """Run the probe and record its outcome"""
+        try:
+            self.probe()
+            self.record_success(source="probe")
+        except Exception as e:
+            self.record_failure(str(e), source="probe")
+        finally:
+            with self.lock:
+                probe_done, self.probe_done = self.probe_done, None
+            probe_done.set()
@@ -0,0 +1,151 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Generator, AsyncGenerator, Optional, Tuple
+
+from ..utils.config import Config
+
+
+class LatencyTracker:
+    """Rolling latency samples per (model, kind), used to pick the hedging delay"""
+
+    def __init__(self, window: int = None):
+        """
+        Initialize an empty tracker
+
+        Args:
+            window: Number of recent samples kept per model and kind
+        """
+        self.window = window or Config.HEDGE_LATENCY_WINDOW
+        self.samples: Dict[Tuple[str, str], deque] = {}
+        self.lock = threading.Lock()
+
+    def record(self, model: str, kind: str, seconds: float):
+        """
+        Record one latency sample
+
+        Args:
+            model: Model name
+            kind: "total" for full completions, "first_token" for streams
+            seconds: Observed latency
+        """
+        with self.lock:
+            self.samples.setdefault((model, kind), deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, kind: str, percentile: float) -> Optional[float]:
+        """Get a latency percentile, or None without any samples"""
+        with self.lock:
+            samples = sorted(self.samples.get((model, kind), ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def hedge_delay(self, model: str, kind: str) -> float:
+        """
+        How long to wait for the primary before starting the backup
+
+        Returns:
+            The configured percentile of recent latency (floored at HEDGE_MIN_DELAY),
+            or HEDGE_DEFAULT_DELAY until HEDGE_MIN_SAMPLES samples exist
+        """
+        with self.lock:
+            sample_count = len(self.samples.get((model, kind), ()))
+        if sample_count < Config.HEDGE_MIN_SAMPLES:
+            return Config.HEDGE_DEFAULT_DELAY
+        return max(Config.HEDGE_MIN_DELAY, self.percentile(model, kind, Config.HEDGE_PERCENTILE))
+
+
+class HedgeStats:
+    """Counts how often hedging fired and which model won"""
+
+    def __init__(self):
+        """Initialize all counters at zero"""
+        self.counts = {"eligible": 0, "hedged": 0, "primary_wins": 0, "backup_wins": 0}
+        self.lock = threading.Lock()
+
+    def record(self, hedged: bool, winner: str = None):
+        """
+        Record the outcome of one hedging-eligible request
+
+        Args:
+            hedged: Whether the backup request was started
+            winner: "primary" or "backup" when hedged and one of them succeeded
+        """
+        with self.lock:
+            self.counts["eligible"] += 1
+            if hedged:
+                self.counts["hedged"] += 1
+            if winner:
+                self.counts[f"{winner}_wins"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the counters plus the fraction of requests that were hedged"""
+        with self.lock:
+            counts = dict(self.counts)
+        counts["hedge_rate"] = counts["hedged"] / counts["eligible"] if counts["eligible"] else 0.0
+        return counts
+
+
+def hedge_leg(model_used: str) -> str:
+    """Which leg of a hedged chat request produced a result: "primary" or "backup" (from the model used)"""
+    return "primary" if model_used == Config.get_model("chat") else "backup"
+
+
+def prime_stream(stream: Generator) -> Tuple[Generator, Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Advance a chat_stream generator to its first delta (runs in a worker thread)
+
+    Returns:
+        (stream, first_delta, None), or (stream, None, result) if it finished without content
+    """
+    try:
+        return stream, next(stream), None
+    except StopIteration as stop:
+        return stream, None, stop.value
+
+
+async def aprime_stream(stream: AsyncGenerator) -> Any:
+    """Get the first item of an async chat_stream (a delta string, or the result dict)"""
+    return await stream.__anext__()
+
+
+def close_primed_stream(future):
+    """Done-callback that closes the stream of a hedging leg that lost the race"""
+    if future.cancelled() or future.exception():
+        return
+    stream, _, _ = future.result()
+    stream.close()
+
+
+def resume_stream(stream: Generator, first_delta: Optional[str],
+                  result: Optional[Dict[str, Any]]) -> Generator[str, None, Dict[str, Any]]:
+    """Continue a primed chat_stream: replay its first delta, then pass the rest through"""
+    if first_delta is None:
+        return result
+    yield first_delta
+    return (yield from stream)
+
+
+# Latency history is shared by every client in the process, so a new session hedges sensibly
+_shared_latency_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker"""
+    return _shared_latency_tracker
+
+
+# Shared worker pool for hedging legs, so hedged calls don't spawn threads per request
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor that runs hedged request legs"""
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=Config.HEDGE_MAX_WORKERS,
+                                                 thread_name_prefix="hedge")
+        return _hedge_executor
@@ -0,0 +1,161 @@
+import importlib.util
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..utils.config import Config
+
+
+def _pool_limits() -> httpx.Limits:
+    """Connection limits for the shared pools, from Config"""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+    )
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 if configured and the optional 'h2' package is installed"""
+    if not Config.HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        print("⚠️  HTTP2_ENABLED is set but the 'h2' package is not installed - using HTTP/1.1")
+        return False
+    return True
+
+
+class _PoolCounters:
+    """Request counter attached to a shared client through httpx event hooks"""
+
+    def __init__(self):
+        """Initialize the counter at zero"""
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def count(self, request: httpx.Request):
+        """Sync event hook: count one outgoing request"""
+        with self.lock:
+            self.requests += 1
+
+    async def count_async(self, request: httpx.Request):
+        """Async event hook: count one outgoing request"""
+        self.count(request)
+
+
+_sync_client: Optional[httpx.Client] = None
+_sync_counters = _PoolCounters()
+# Async connections belong to the event loop that opened them; the async path serves all
+# sessions from one loop, so a single pool is shared as well
+_async_client: Optional[httpx.AsyncClient] = None
+_async_counters = _PoolCounters()
+# Weather requests go through requests; one keep-alive session serves every WeatherClient
+_weather_session: Optional[requests.Session] = None
+_weather_counters = _PoolCounters()
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide pooled HTTP client for the sync OpenAI SDK client
+
+    Returns:
+        An httpx.Client with keep-alive and connection limits from Config
+    """
+    global _sync_client
+    with _lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                limits=_pool_limits(),
+                http2=_http2_enabled(),
+                timeout=Config.REQUEST_TIMEOUT,
+                follow_redirects=True,
+                event_hooks={"request": [_sync_counters.count]}
+            )
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled HTTP client for async OpenAI SDK clients
+
+    Returns:
+        An httpx.AsyncClient with keep-alive and connection limits from Config
+    """
+    global _async_client
+    with _lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                limits=_pool_limits(),
+                http2=_http2_enabled(),
+                timeout=Config.REQUEST_TIMEOUT,
+                follow_redirects=True,
+                event_hooks={"request": [_async_counters.count_async]}
+            )
+        return _async_client
+
+
+def get_weather_session() -> requests.Session:
+    """
+    Get the process-wide pooled requests session for WeatherClient
+
+    Returns:
+        A requests.Session whose keep-alive adapter has the pool size and retries from Config
+    """
+    global _weather_session
+    with _lock:
+        if _weather_session is None:
+            retries = Retry(
+                total=Config.WEATHER_HTTP_MAX_RETRIES,
+                backoff_factor=Config.WEATHER_HTTP_RETRY_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False  # the last response is returned, so raise_for_status() reports it
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.WEATHER_HTTP_POOL_SIZE, max_retries=retries)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.hooks["response"].append(lambda response, *args, **kwargs: _weather_counters.count(response.request))
+            _weather_session = session
+        return _weather_session
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get statistics for the shared connection pools
+
+    Returns:
+        Dict with the configured limits and the number of requests sent through each pool
+        (httpx has no public API for live connection counts, so those aren't reported)
+    """
+    return {
+        "max_connections": Config.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "http2": Config.HTTP2_ENABLED,
+        "sync": {"requests": _sync_counters.requests},
+        "async": {"requests": _async_counters.requests},
+        "weather": {"requests": _weather_counters.requests}
+    }
+
+
+def close_http_client():
+    """Close the shared sync pool (call at process shutdown)"""
+    global _sync_client
+    with _lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+async def close_async_http_client():
+    """Close the shared async pool (call before its event loop stops)"""
+    global _async_client
+    with _lock:
+        client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
@@ -1,23 +1,190 @@
+import asyncio
 import time
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator, Union, Callable
+from openai import OpenAI, AsyncOpenAI
 import requests
 
 from ..utils.config import Config
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .retry_policy import RetryBudget, is_retryable_error, compute_retry_delay, describe_error
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, get_circuit_breakers
+from .health import HealthMonitor
+from .http_pool import get_http_client, get_async_http_client, get_pool_stats
+from .response_cache import make_cache_key, get_response_cache
+from .hedging import (LatencyTracker, HedgeStats, get_latency_tracker, get_hedge_executor, hedge_leg,
+                      prime_stream, resume_stream, aprime_stream, close_primed_stream)
+from .prompt_cache import apply_cache_hints
+from .tool_support import (is_tool_support_error, mark_tool_calling_unsupported, normalize_tool_calls,
+                           accumulate_tool_call_deltas, collect_tool_calls)
 
 DEFAULT_SYSTEM_PROMPT = "You are a helpful travel assistant."
+# Model types with a configured backup; context calls fail over too, so an outage can't stall them
+MODEL_TYPES_WITH_BACKUP = ["chat", "reasoning", "context"]
+FALLBACK_ERROR_MESSAGE = "I apologize, but I'm having trouble processing your request right now. Please try again in a moment."
 
-class OpenRouterClient:
-    """Client for interacting with OpenRouter API"""
+class BaseOpenRouterClient:
+    """State and non-I/O helpers shared by OpenRouterClient and AsyncOpenRouterClient"""
+
+    def __init__(self, rate_limiter: RateLimiter = None, circuit_breakers: CircuitBreakerRegistry = None,
+                 latency_tracker: LatencyTracker = None, response_cache=None):
+        """
+        Initialize the shared state
 
-    def __init__(self):
-        """Initialize the OpenRouter client"""
+        Args:
+            rate_limiter: Rate limiter every request must pass (defaults to the process-wide one)
+            circuit_breakers: Per-model circuit breakers (defaults to the process-wide registry)
+            latency_tracker: Rolling per-model latencies used for hedging (defaults to the process-wide one)
+            response_cache: Cache for use_cache=True calls (defaults to the process-wide one)
+        """
         if not Config.OPENROUTER_API_KEY:
             raise ValueError("OpenRouter API key not found. Please check your .env file.")
 
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.circuit_breakers = circuit_breakers or get_circuit_breakers()
+        self.latency_tracker = latency_tracker or get_latency_tracker()
+        self.hedge_stats = HedgeStats()
+        self.response_cache = response_cache or get_response_cache()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        # Lazy readiness: real requests keep it fresh, a cheap probe runs only when it is stale
+        self.health = HealthMonitor(probe=self._probe_connection)
+
+    def _circuit_open(self, model_name: str, model_type: str, use_backup: bool) -> bool:
+        """Whether to bypass a primary model whose circuit is open (only when a backup exists)"""
+        if use_backup or model_type not in MODEL_TYPES_WITH_BACKUP:
+            return False
+        if self.circuit_breakers.get(model_name).allow_request():
+            return False
+        print(f"⚡ Circuit open for {model_name}, going straight to backup")
+        return True
+
+    def _circuit_open_result(self, model_name: str) -> Dict[str, Any]:
+        """Failed result for a no-fallback request whose model's circuit is open"""
+        return {
+            "success": False,
+            "error": f"Circuit open for {model_name}",
+            "model_used": model_name,
+            "content": FALLBACK_ERROR_MESSAGE
+        }
+
+    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result, counting the hit or miss"""
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            self.cache_stats["misses"] += 1
+            return None
+        self.cache_stats["hits"] += 1
+        print(f"💾 Cache hit for {cached['model_used']}")
+        return {**cached, "cached": True, "queue_wait": 0.0}
+
+    def _store_cached(self, cache_key: str, result: Dict[str, Any]):
+        """Cache a successful result, unless it is empty or was cut off by the token limit"""
+        if result["content"] and result["finish_reason"] != "length":
+            self.response_cache.set(cache_key, {key: value for key, value in result.items() if key != "queue_wait"})
+
+    def _should_hedge(self, model_type: str, use_backup: bool, hedge: Optional[bool]) -> bool:
+        """Whether a request may be hedged: primary chat calls whose circuit is closed"""
+        hedge = Config.HEDGE_CHAT_REQUESTS if hedge is None else hedge
+        if not hedge or use_backup or model_type != "chat":
+            return False
+        # Peek at the state instead of allow_request(), which would use up a half-open trial slot
+        return self.circuit_breakers.get(Config.get_model("chat")).get_state()["state"] == CircuitBreaker.CLOSED
+
+    def check_health(self, wait: bool = False) -> Dict[str, Any]:
+        """
+        Get the cached readiness status, probing in the background if it is stale
+
+        Unlike test_connection(), this never generates text: successful chat calls count as
+        health checks, and the probe only lists the available models.
+
+        Args:
+            wait: Block until the probe has finished instead of returning the stale status
+
+        Returns:
+            Dict with status ("healthy"/"unhealthy"/"unknown"), source, error and age
+        """
+        return self.health.check(wait=wait)
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get the cached readiness status without probing"""
+        return self.health.get_status()
+
+    def _record_health_failure(self, error: Exception):
+        """Count a final request failure against health, unless the request itself was at fault"""
+        if is_retryable_error(error) or getattr(error, "status_code", None) in (401, 403):
+            self.health.record_failure(describe_error(error))
+
+    def _probe_connection(self):
+        """Health probe: raises if OpenRouter is unreachable (implemented by each client)"""
+        raise NotImplementedError
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get rate-limiter queueing statistics
+
+        Returns:
+            Dict mapping model name to acquired/rejected counts and wait times
+        """
+        return self.rate_limiter.get_stats()
+
+    def get_circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the circuit breaker state of every model used so far
+
+        Returns:
+            Dict mapping model name to state ("closed"/"open"/"half_open") and counters
+        """
+        return self.circuit_breakers.get_states()
+
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """
+        Get hedged-request statistics for this client
+
+        Returns:
+            Dict with eligible/hedged counts, wins per leg and the hedge rate
+        """
+        return self.hedge_stats.get_stats()
+
+    def get_connection_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the shared HTTP connection pools
+
+        Returns:
+            Dict with the pool limits and the number of requests sent through each pool
+        """
+        return get_pool_stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache hit/miss counters for this client
+
+        Returns:
+            Dict with hits, misses and the hit rate
+        """
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {**self.cache_stats, "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0}
+
+
+class OpenRouterClient(BaseOpenRouterClient):
+    """Client for interacting with OpenRouter API"""
+
+    def __init__(self, rate_limiter: RateLimiter = None, circuit_breakers: CircuitBreakerRegistry = None,
+                 latency_tracker: LatencyTracker = None, response_cache=None, http_client=None):
+        """
+        Initialize the OpenRouter client
+
+        Args:
+            rate_limiter: Rate limiter every request must pass (defaults to the process-wide one)
+            circuit_breakers: Per-model circuit breakers (defaults to the process-wide registry)
+            latency_tracker: Rolling per-model latencies used for hedging (defaults to the process-wide one)
+            response_cache: Cache for use_cache=True calls (defaults to the process-wide one)
+            http_client: httpx.Client to send requests through (defaults to the shared connection pool)
+        """
+        super().__init__(rate_limiter, circuit_breakers, latency_tracker, response_cache)
         self.client = OpenAI(
             api_key=Config.OPENROUTER_API_KEY,
-            base_url=Config.OPENROUTER_BASE_URL
+            base_url=Config.OPENROUTER_BASE_URL,
+            http_client=http_client or get_http_client()
         )
 
         print("✅ OpenRouter client initialized successfully")
@@ -26,7 +193,13 @@ class OpenRouterClient:
              messages: List[Dict[str, str]],
              model_type: str = "chat",
              response_type: str = "chat",
-             use_backup: bool = False) -> Dict[str, Any]:
+             use_backup: bool = False,
+             retry_budget: RetryBudget = None,
+             hedge: bool = None,
+             use_cache: bool = False,
+             tools: List[Dict[str, Any]] = None,
+             tool_choice: str = None,
+             fallback: bool = True) -> Dict[str, Any]:
         """
         Send a chat completion request to OpenRouter
 
@@ -35,83 +208,399 @@ class OpenRouterClient:
             model_type: "chat" or "reasoning"
             response_type: "chat", "reasoning", or "simple" (for token limits)
             use_backup: Whether to use backup model
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one per call)
+            hedge: Race chat_backup if the primary is slow (defaults to Config.HEDGE_CHAT_REQUESTS)
+            use_cache: Serve identical earlier requests from the response cache (never hedged)
+            tools: Function definitions for native tool calling (requests with tools are never cached)
+            tool_choice: "auto", "none" or "required" (provider default if omitted)
+            fallback: Whether a failing primary may fall back to the backup model (hedge legs disable it)
 
         Returns:
-            Dict with response content and metadata
+            Dict with response content and metadata, plus "tool_calls" if the model called tools
         """
         # Get the appropriate model
         model_name = Config.get_model(model_type, backup=use_backup)
         max_tokens = Config.get_max_tokens(response_type)
+        retry_budget = retry_budget or RetryBudget()
+
+        cache_key = make_cache_key(model_name, messages, max_tokens, Config.TEMPERATURE) if use_cache and not tools else None
+        if cache_key:
+            cached = self._get_cached(cache_key)
+            if cached:
+                return cached
+
+        # Cached calls are background requests, not worth a second in-flight request
+        if not use_cache and self._should_hedge(model_type, use_backup, hedge):
+            return self._hedged_chat(messages, response_type, retry_budget, tools, tool_choice)
+
+        # While the primary's circuit is open, skip its retry sequence entirely
+        if self._circuit_open(model_name, model_type, use_backup):
+            if not fallback:
+                return self._circuit_open_result(model_name)
+            return self.chat(messages, model_type, response_type, use_backup=True, retry_budget=retry_budget,
+                             use_cache=use_cache, tools=tools, tool_choice=tool_choice)
 
         print(f"🤖 Using model: {model_name}")
 
+        breaker = self.circuit_breakers.get(model_name)
+        request_info = {"queue_wait": 0.0}
+        started = time.monotonic()
         try:
-            response = self._make_request(messages, model_name, max_tokens)
+            response = self._make_request(messages, model_name, max_tokens,
+                                            retry_budget=retry_budget, request_info=request_info,
+                                            tools=tools, tool_choice=tool_choice)
+            breaker.record_success()
+            self.health.record_success()
+            self.latency_tracker.record(model_name, "total", time.monotonic() - started)
 
-            return {
+            message = response.choices[0].message
+            result = {
                 "success": True,
-                "content": response.choices[0].message.content,
+                "content": message.content or "",  # None when the model only called tools
                 "model_used": model_name,
                 "usage": response.usage.model_dump() if response.usage else None,
-                "finish_reason": response.choices[0].finish_reason
+                "finish_reason": response.choices[0].finish_reason,
+                "queue_wait": round(request_info["queue_wait"], 3)
             }
+            if message.tool_calls:
+                result["tool_calls"] = normalize_tool_calls(message.tool_calls)
+            if cache_key:
+                self._store_cached(cache_key, result)
+            return result
 
         except Exception as e:
             print(f"❌ Error with {model_name}: {str(e)}")
+            if is_retryable_error(e):
+                breaker.record_failure()
+            if tools and is_tool_support_error(e):
+                mark_tool_calling_unsupported(model_name)
 
             # Try backup model if we haven't already and this isn't already a backup
-            if not use_backup and model_type in ["chat", "reasoning"]:
+            if fallback and not use_backup and model_type in MODEL_TYPES_WITH_BACKUP:
                 print(f"🔄 Trying backup model...")
-                return self.chat(messages, model_type, response_type, use_backup=True)
+                return self.chat(messages, model_type, response_type, use_backup=True, retry_budget=retry_budget,
+                                 use_cache=use_cache, tools=tools, tool_choice=tool_choice)
 
-            # If backup also fails or we're already using backup
+            # If backup also fails or we're already using backup (a hedge leg leaves that to the other leg)
+            if fallback:
+                self._record_health_failure(e)
             return {
                 "success": False,
                 "error": str(e),
                 "model_used": model_name,
-                "content": "I apologize, but I'm having trouble processing your request right now. Please try again in a moment."
+                "content": FALLBACK_ERROR_MESSAGE
             }
 
-    def _make_request(self, messages: List[Dict[str, str]], model: str, max_tokens: int):
+    def chat_stream(self,
+                    messages: List[Dict[str, str]],
+                    model_type: str = "chat",
+                    response_type: str = "chat",
+                    use_backup: bool = False,
+                    retry_budget: RetryBudget = None,
+                    hedge: bool = None,
+                    stop_when: Callable[[], bool] = None,
+                    tools: List[Dict[str, Any]] = None,
+                    tool_choice: str = None,
+                    fallback: bool = True) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Stream a chat completion from OpenRouter, yielding content deltas as they arrive
+
+        Falls back to the backup model only if the primary fails before producing any
+        content - once text has reached the user, switching models would mix two answers.
+
+        Args:
+            messages: List of message dictionaries [{"role": "user", "content": "..."}]
+            model_type: "chat" or "reasoning"
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            use_backup: Whether to use backup model
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one per call)
+            hedge: Race chat_backup if the primary is slow (defaults to Config.HEDGE_CHAT_REQUESTS)
+            stop_when: Checked after each delta is consumed; when it returns True the stream is
+                closed, which ends generation (finish_reason "stop_when", no usage reported)
+            tools: Function definitions for native tool calling (streamed calls end up in "tool_calls")
+            tool_choice: "auto", "none" or "required" (provider default if omitted)
+            fallback: Whether a failing primary may fall back to the backup model (hedge legs disable it)
+
+        Yields:
+            Content deltas (strings) in generation order
+
+        Returns:
+            Dict with the same shape as chat() once the stream is complete
+        """
+        model_name = Config.get_model(model_type, backup=use_backup)
+        max_tokens = Config.get_max_tokens(response_type)
+        retry_budget = retry_budget or RetryBudget()
+
+        if self._should_hedge(model_type, use_backup, hedge):
+            return (yield from self._hedged_chat_stream(messages, response_type, retry_budget, stop_when,
+                                                        tools, tool_choice))
+
+        if self._circuit_open(model_name, model_type, use_backup):
+            if not fallback:
+                return self._circuit_open_result(model_name)
+            return (yield from self.chat_stream(messages, model_type, response_type, use_backup=True,
+                                                retry_budget=retry_budget, stop_when=stop_when,
+                                                tools=tools, tool_choice=tool_choice))
+
+        print(f"🤖 Streaming from model: {model_name}")
+
+        breaker = self.circuit_breakers.get(model_name)
+        content_parts = []
+        request_info = {"queue_wait": 0.0}
+        started = time.monotonic()
+        try:
+            stream = self._make_request(messages, model_name, max_tokens, stream=True,
+                                          retry_budget=retry_budget, request_info=request_info,
+                                          tools=tools, tool_choice=tool_choice)
+            usage = None
+            finish_reason = None
+            tool_call_parts = {}
+
+            try:
+                for chunk in stream:
+                    # The final chunk carries usage only, with an empty choices list
+                    if chunk.usage:
+                        usage = chunk.usage.model_dump()
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+                    if choice.delta and getattr(choice.delta, "tool_calls", None):
+                        accumulate_tool_call_deltas(tool_call_parts, choice.delta.tool_calls)
+
+                    delta = choice.delta.content if choice.delta else None
+                    if delta:
+                        if not content_parts:
+                            self.latency_tracker.record(model_name, "first_token", time.monotonic() - started)
+                        content_parts.append(delta)
+                        yield delta
+                        if stop_when and stop_when():
+                            finish_reason = "stop_when"
+                            print(f"✂️  Stopping generation early ({len(content_parts)} deltas)")
+                            break
+            finally:
+                stream.close()
+            breaker.record_success()
+            self.health.record_success()
+
+            result = {
+                "success": True,
+                "content": "".join(content_parts),
+                "model_used": model_name,
+                "usage": usage,
+                "finish_reason": finish_reason,
+                "queue_wait": round(request_info["queue_wait"], 3)
+            }
+            if tool_call_parts:
+                result["tool_calls"] = collect_tool_calls(tool_call_parts)
+            return result
+
+        except Exception as e:
+            print(f"❌ Error while streaming from {model_name}: {str(e)}")
+            if is_retryable_error(e):
+                breaker.record_failure()
+            if tools and is_tool_support_error(e):
+                mark_tool_calling_unsupported(model_name)
+
+            if fallback and not content_parts and not use_backup and model_type in MODEL_TYPES_WITH_BACKUP:
+                print(f"🔄 Trying backup model...")
+                return (yield from self.chat_stream(messages, model_type, response_type, use_backup=True,
+                                                    retry_budget=retry_budget, stop_when=stop_when,
+                                                    tools=tools, tool_choice=tool_choice))
+
+            if fallback:
+                self._record_health_failure(e)
+            return {
+                "success": False,
+                "error": str(e),
+                "model_used": model_name,
+                "content": FALLBACK_ERROR_MESSAGE,
+                "partial_content": "".join(content_parts)
+            }
+
+    def _hedged_chat(self, messages: List[Dict[str, str]], response_type: str, retry_budget: RetryBudget,
+                     tools: List[Dict[str, Any]] = None, tool_choice: str = None) -> Dict[str, Any]:
+        """
+        Send a chat request to the primary, racing chat_backup if the primary is slower than usual
+
+        The losing request is abandoned, not interrupted: a blocking HTTP call cannot be cancelled
+        from another thread, so its result is discarded when it arrives.
+
+        Args:
+            messages: Chat messages
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            retry_budget: Retry budget shared by both legs
+            tools: Passed to both legs (see chat)
+            tool_choice: Passed to both legs (see chat)
+
+        Returns:
+            Result of the first leg to succeed (or the last failure), with "hedged"/"hedge_winner" if it fired
+        """
+        primary_model = Config.get_model("chat")
+        delay = self.latency_tracker.hedge_delay(primary_model, "total")
+        executor = get_hedge_executor()
+
+        # Legs never fall back themselves: the backup leg is the fallback, and must not run twice
+        leg_kwargs = {"retry_budget": retry_budget, "hedge": False, "tools": tools, "tool_choice": tool_choice,
+                      "fallback": False}
+        primary = executor.submit(self.chat, messages, "chat", response_type, **leg_kwargs)
+        if wait([primary], timeout=delay).done:
+            self.hedge_stats.record(hedged=False)
+            result = primary.result()
+            if result["success"]:
+                return result
+            print(f"🔄 Trying backup model...")
+            return self.chat(messages, "chat", response_type, use_backup=True, **leg_kwargs)
+
+        print(f"🏁 {primary_model} slower than {delay:.1f}s, racing the backup model")
+        backup = executor.submit(self.chat, messages, "chat", response_type, use_backup=True, **leg_kwargs)
+
+        pending = {primary, backup}
+        result = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result["success"]:
+                    for other in pending:
+                        other.cancel()  # only stops a leg that is still queued in the executor
+                    winner = hedge_leg(result["model_used"])
+                    self.hedge_stats.record(hedged=True, winner=winner)
+                    print(f"🏁 {winner.capitalize()} leg won the race ({result['model_used']})")
+                    return {**result, "hedged": True, "hedge_winner": winner}
+
+        self.hedge_stats.record(hedged=True)
+        return result
+
+    def _hedged_chat_stream(self, messages: List[Dict[str, str]], response_type: str, retry_budget: RetryBudget,
+                            stop_when: Callable[[], bool] = None, tools: List[Dict[str, Any]] = None,
+                            tool_choice: str = None) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Streaming variant of _hedged_chat: the race is won by the first leg to produce a token
+
+        The losing stream is closed as soon as its own first token (or failure) arrives.
+
+        Args:
+            messages: Chat messages
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            retry_budget: Retry budget shared by both legs
+            stop_when: Passed to both legs (see chat_stream)
+            tools: Passed to both legs (see chat_stream)
+            tool_choice: Passed to both legs (see chat_stream)
+
+        Yields:
+            Content deltas of the winning leg
+
+        Returns:
+            Dict with the same shape as chat(), plus "hedged"/"hedge_winner" if it fired
+        """
+        primary_model = Config.get_model("chat")
+        delay = self.latency_tracker.hedge_delay(primary_model, "first_token")
+        executor = get_hedge_executor()
+
+        # Legs never fall back themselves: the backup leg is the fallback, and must not run twice
+        leg_kwargs = {"retry_budget": retry_budget, "hedge": False, "stop_when": stop_when, "tools": tools,
+                      "tool_choice": tool_choice, "fallback": False}
+        primary = executor.submit(prime_stream, self.chat_stream(messages, "chat", response_type, **leg_kwargs))
+        if wait([primary], timeout=delay).done:
+            self.hedge_stats.record(hedged=False)
+            stream, first_delta, result = primary.result()
+            if first_delta is not None or result["success"]:
+                return (yield from resume_stream(stream, first_delta, result))
+            print(f"🔄 Trying backup model...")
+            return (yield from self.chat_stream(messages, "chat", response_type, use_backup=True, **leg_kwargs))
+
+        print(f"🏁 {primary_model} sent no token within {delay:.1f}s, racing the backup model")
+        backup = executor.submit(prime_stream, self.chat_stream(messages, "chat", response_type, use_backup=True,
+                                                                **leg_kwargs))
+        legs = [primary, backup]
+
+        pending = set(legs)
+        result = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stream, first_delta, result = future.result()
+                if first_delta is not None or result["success"]:
+                    for other in legs:
+                        if other is not future:
+                            other.add_done_callback(close_primed_stream)
+                    result = yield from resume_stream(stream, first_delta, result)
+                    winner = hedge_leg(result["model_used"]) if result["success"] else None
+                    self.hedge_stats.record(hedged=True, winner=winner)
+                    if winner:
+                        print(f"🏁 {winner.capitalize()} leg won the race ({result['model_used']})")
+                    return {**result, "hedged": True, "hedge_winner": winner}
+
+        self.hedge_stats.record(hedged=True)
+        return result
+
+    def _make_request(self, messages: List[Dict[str, str]], model: str, max_tokens: int, stream: bool = False,
+                      retry_budget: RetryBudget = None, request_info: Optional[Dict[str, Any]] = None,
+                      tools: List[Dict[str, Any]] = None, tool_choice: str = None):
         """
         Make the actual API request with retries
 
+        Only transient errors are retried, using exponential backoff with full jitter or the
+        server's Retry-After. Every attempt first takes a token from the model's rate-limit bucket.
+
         Args:
             messages: Chat messages
             model: Model name to use
             max_tokens: Maximum tokens for response
+            stream: Whether to open a streaming response (retries cover opening the stream only)
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one)
+            request_info: Optional dict whose "queue_wait" is increased by the time spent queuing
+            tools: Function definitions for native tool calling (optional)
+            tool_choice: Tool choice to send along with tools (optional)
 
         Returns:
-            OpenAI response object
+            OpenAI response object, or a chunk stream when stream=True
         """
-        last_error = None
+        # Ask for a trailing usage chunk so streamed turns are tracked like regular ones
+        stream_kwargs = {"stream": True, "stream_options": {"include_usage": True}} if stream else {}
+        tool_kwargs = {"tools": tools, **({"tool_choice": tool_choice} if tool_choice else {})} if tools else {}
+        retry_budget = retry_budget or RetryBudget()
+        attempt = 0
+
+        while True:
+            # Outside the try: a local rate-limit refusal is not worth retrying
+            queue_wait = self.rate_limiter.acquire(model)
+            if request_info is not None:
+                request_info["queue_wait"] = request_info.get("queue_wait", 0.0) + queue_wait
 
-        for attempt in range(Config.MAX_RETRIES + 1):  # +1 for initial attempt
             try:
-                response = self.client.chat.completions.create(
+                return self.client.chat.completions.create(
                     model=model,
-                    messages=messages,
+                    messages=apply_cache_hints(messages, model),
                     max_tokens=max_tokens,
-                    temperature=0.7,
-                    timeout=Config.REQUEST_TIMEOUT
+                    temperature=Config.TEMPERATURE,
+                    timeout=Config.REQUEST_TIMEOUT,
+                    **stream_kwargs,
+                    **tool_kwargs
                 )
-                return response
 
             except Exception as e:
-                last_error = e
-                if attempt < Config.MAX_RETRIES:
-                    print(f"⚠️  Attempt {attempt + 1} failed, retrying in {Config.RETRY_DELAY}s...")
-                    time.sleep(Config.RETRY_DELAY)
-                else:
-                    print(f"❌ All {Config.MAX_RETRIES + 1} attempts failed")
+                if not is_retryable_error(e):
+                    print(f"❌ Non-retryable error ({describe_error(e)}), not retrying")
+                    raise
+
+                delay = compute_retry_delay(e, attempt)
+                if attempt >= Config.MAX_RETRIES or not retry_budget.try_spend(delay):
+                    print(f"❌ Giving up on {model} after {attempt + 1} attempt(s)")
+                    raise
 
-        # If we get here, all retries failed
-        raise last_error
+                print(f"⚠️  Attempt {attempt + 1} failed ({describe_error(e)}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                attempt += 1
 
     def simple_chat(self,
                     user_message: str,
                     model_type: str = "chat",
-                    system_prompt: str = None) -> str:
+                    system_prompt: str = None,
+                    use_cache: bool = False) -> str:
         """
         Simplified chat method for single messages
 
@@ -119,6 +608,7 @@ class OpenRouterClient:
             user_message: The user's message
             model_type: "chat" or "reasoning"
             system_prompt: Custom system prompt (optional, defaults to travel assistant)
+            use_cache: Serve an identical earlier request from the response cache
 
         Returns:
             String response from the model
@@ -131,7 +621,7 @@ class OpenRouterClient:
             {"role": "user", "content": user_message}
         ]
 
-        result = self.chat(messages, model_type)
+        result = self.chat(messages, model_type, use_cache=use_cache)
 
         if result["success"]:
             return result["content"]
@@ -151,8 +641,8 @@ class OpenRouterClient:
             {"role": "user", "content": "Say 'Hello' if you can hear me."}
         ]
 
-        # Test primary chat model
-        result = self.chat(test_messages, model_type="chat", response_type="simple")
+        # Test primary chat model (never from the cache: the request has to reach OpenRouter)
+        result = self.chat(test_messages, model_type="chat", response_type="simple", use_cache=False)
 
         if result["success"]:
             print("✅ Connection test successful!")
@@ -170,6 +660,10 @@ class OpenRouterClient:
                 "model_tested": result.get("model_used")
             }
 
+    def _probe_connection(self):
+        """Health probe: list models, which needs no generation and no rate-limit token"""
+        self.client.models.list(timeout=Config.REQUEST_TIMEOUT)
+
     def get_available_models(self) -> List[str]:
         """
         Get list of configured clients
@@ -217,3 +711,496 @@ class OpenRouterClient:
                 "error": str(e),
                 "model_used": model_name
             }
+
+
+class AsyncOpenRouterClient(BaseOpenRouterClient):
+    """Asyncio-native client for OpenRouter, with the same chat/simple_chat contract as OpenRouterClient"""
+
+    def __init__(self, rate_limiter: RateLimiter = None, circuit_breakers: CircuitBreakerRegistry = None,
+                 latency_tracker: LatencyTracker = None, response_cache=None, http_client=None):
+        """
+        Initialize the async OpenRouter client
+
+        Args:
+            rate_limiter: Rate limiter every request must pass (defaults to the process-wide one)
+            circuit_breakers: Per-model circuit breakers (defaults to the process-wide registry)
+            latency_tracker: Rolling per-model latencies used for hedging (defaults to the process-wide one)
+            response_cache: Cache for use_cache=True calls (defaults to the process-wide one)
+            http_client: httpx.AsyncClient to send requests through (defaults to the shared connection pool)
+        """
+        super().__init__(rate_limiter, circuit_breakers, latency_tracker, response_cache)
+        self.owns_http_client = http_client is not None
+        self.client = AsyncOpenAI(
+            api_key=Config.OPENROUTER_API_KEY,
+            base_url=Config.OPENROUTER_BASE_URL,
+            http_client=http_client or get_async_http_client()
+        )
+        self.probe_client: Optional[OpenAI] = None  # sync client on the shared pool for health probes, built on first probe
+
+        print("✅ Async OpenRouter client initialized successfully")
+
+    async def chat(self,
+                   messages: List[Dict[str, str]],
+                   model_type: str = "chat",
+                   response_type: str = "chat",
+                   use_backup: bool = False,
+                   retry_budget: RetryBudget = None,
+                   hedge: bool = None,
+                   use_cache: bool = False,
+                   tools: List[Dict[str, Any]] = None,
+                   tool_choice: str = None,
+                   fallback: bool = True) -> Dict[str, Any]:
+        """
+        Send a chat completion request to OpenRouter without blocking the event loop
+
+        Args:
+            messages: List of message dictionaries [{"role": "user", "content": "..."}]
+            model_type: "chat" or "reasoning"
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            use_backup: Whether to use backup model
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one per call)
+            hedge: Race chat_backup if the primary is slow (defaults to Config.HEDGE_CHAT_REQUESTS)
+            use_cache: Serve identical earlier requests from the response cache (never hedged)
+            tools: Function definitions for native tool calling (requests with tools are never cached)
+            tool_choice: "auto", "none" or "required" (provider default if omitted)
+            fallback: Whether a failing primary may fall back to the backup model (hedge legs disable it)
+
+        Returns:
+            Dict with response content and metadata, plus "tool_calls" if the model called tools
+        """
+        model_name = Config.get_model(model_type, backup=use_backup)
+        max_tokens = Config.get_max_tokens(response_type)
+        retry_budget = retry_budget or RetryBudget()
+
+        cache_key = make_cache_key(model_name, messages, max_tokens, Config.TEMPERATURE) if use_cache and not tools else None
+        if cache_key:
+            cached = self._get_cached(cache_key)
+            if cached:
+                return cached
+
+        # Cached calls are background requests, not worth a second in-flight request
+        if not use_cache and self._should_hedge(model_type, use_backup, hedge):
+            return await self._hedged_chat(messages, response_type, retry_budget, tools, tool_choice)
+
+        # While the primary's circuit is open, skip its retry sequence entirely
+        if self._circuit_open(model_name, model_type, use_backup):
+            if not fallback:
+                return self._circuit_open_result(model_name)
+            return await self.chat(messages, model_type, response_type, use_backup=True, retry_budget=retry_budget,
+                                   use_cache=use_cache, tools=tools, tool_choice=tool_choice)
+
+        print(f"🤖 Using model: {model_name}")
+
+        breaker = self.circuit_breakers.get(model_name)
+        request_info = {"queue_wait": 0.0}
+        started = time.monotonic()
+        try:
+            response = await self._make_request(messages, model_name, max_tokens,
+                                                  retry_budget=retry_budget, request_info=request_info,
+                                                  tools=tools, tool_choice=tool_choice)
+            breaker.record_success()
+            self.health.record_success()
+            self.latency_tracker.record(model_name, "total", time.monotonic() - started)
+
+            message = response.choices[0].message
+            result = {
+                "success": True,
+                "content": message.content or "",  # None when the model only called tools
+                "model_used": model_name,
+                "usage": response.usage.model_dump() if response.usage else None,
+                "finish_reason": response.choices[0].finish_reason,
+                "queue_wait": round(request_info["queue_wait"], 3)
+            }
+            if message.tool_calls:
+                result["tool_calls"] = normalize_tool_calls(message.tool_calls)
+            if cache_key:
+                self._store_cached(cache_key, result)
+            return result
+
+        except Exception as e:
+            print(f"❌ Error with {model_name}: {str(e)}")
+            if is_retryable_error(e):
+                breaker.record_failure()
+            if tools and is_tool_support_error(e):
+                mark_tool_calling_unsupported(model_name)
+
+            if fallback and not use_backup and model_type in MODEL_TYPES_WITH_BACKUP:
+                print(f"🔄 Trying backup model...")
+                return await self.chat(messages, model_type, response_type, use_backup=True, retry_budget=retry_budget,
+                                       use_cache=use_cache, tools=tools, tool_choice=tool_choice)
+
+            # If backup also fails or we're already using backup (a hedge leg leaves that to the other leg)
+            if fallback:
+                self._record_health_failure(e)
+            return {
+                "success": False,
+                "error": str(e),
+                "model_used": model_name,
+                "content": FALLBACK_ERROR_MESSAGE
+            }
+
+    async def chat_stream(self,
+                          messages: List[Dict[str, str]],
+                          model_type: str = "chat",
+                          response_type: str = "chat",
+                          use_backup: bool = False,
+                          retry_budget: RetryBudget = None,
+                          hedge: bool = None,
+                          stop_when: Callable[[], bool] = None,
+                          tools: List[Dict[str, Any]] = None,
+                          tool_choice: str = None,
+                          fallback: bool = True) -> AsyncGenerator[Union[str, Dict[str, Any]], None]:
+        """
+        Stream a chat completion from OpenRouter, yielding content deltas as they arrive
+
+        Async generators cannot return a value, so the result dict is yielded last.
+
+        Args:
+            messages: List of message dictionaries [{"role": "user", "content": "..."}]
+            model_type: "chat" or "reasoning"
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            use_backup: Whether to use backup model
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one per call)
+            hedge: Race chat_backup if the primary is slow (defaults to Config.HEDGE_CHAT_REQUESTS)
+            stop_when: Checked after each delta is consumed; when it returns True the stream is
+                closed, which ends generation (finish_reason "stop_when", no usage reported)
+            tools: Function definitions for native tool calling (streamed calls end up in "tool_calls")
+            tool_choice: "auto", "none" or "required" (provider default if omitted)
+            fallback: Whether a failing primary may fall back to the backup model (hedge legs disable it)
+
+        Yields:
+            Content deltas (strings), then a dict with the same shape as chat()
+        """
+        model_name = Config.get_model(model_type, backup=use_backup)
+        max_tokens = Config.get_max_tokens(response_type)
+        retry_budget = retry_budget or RetryBudget()
+
+        if self._should_hedge(model_type, use_backup, hedge):
+            async for item in self._hedged_chat_stream(messages, response_type, retry_budget, stop_when,
+                                                       tools, tool_choice):
+                yield item
+            return
+
+        if self._circuit_open(model_name, model_type, use_backup):
+            if not fallback:
+                yield self._circuit_open_result(model_name)
+                return
+            async for item in self.chat_stream(messages, model_type, response_type, use_backup=True,
+                                               retry_budget=retry_budget, stop_when=stop_when,
+                                               tools=tools, tool_choice=tool_choice):
+                yield item
+            return
+
+        print(f"🤖 Streaming from model: {model_name}")
+
+        breaker = self.circuit_breakers.get(model_name)
+        content_parts = []
+        request_info = {"queue_wait": 0.0}
+        started = time.monotonic()
+        try:
+            stream = await self._make_request(messages, model_name, max_tokens, stream=True,
+                                                retry_budget=retry_budget, request_info=request_info,
+                                                tools=tools, tool_choice=tool_choice)
+            usage = None
+            finish_reason = None
+            tool_call_parts = {}
+
+            try:
+                async for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage.model_dump()
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+                    if choice.delta and getattr(choice.delta, "tool_calls", None):
+                        accumulate_tool_call_deltas(tool_call_parts, choice.delta.tool_calls)
+
+                    delta = choice.delta.content if choice.delta else None
+                    if delta:
+                        if not content_parts:
+                            self.latency_tracker.record(model_name, "first_token", time.monotonic() - started)
+                        content_parts.append(delta)
+                        yield delta
+                        if stop_when and stop_when():
+                            finish_reason = "stop_when"
+                            print(f"✂️  Stopping generation early ({len(content_parts)} deltas)")
+                            break
+            finally:
+                await stream.close()
+            breaker.record_success()
+            self.health.record_success()
+
+            result = {
+                "success": True,
+                "content": "".join(content_parts),
+                "model_used": model_name,
+                "usage": usage,
+                "finish_reason": finish_reason,
+                "queue_wait": round(request_info["queue_wait"], 3)
+            }
+            if tool_call_parts:
+                result["tool_calls"] = collect_tool_calls(tool_call_parts)
+
+        except Exception as e:
+            print(f"❌ Error while streaming from {model_name}: {str(e)}")
+            if is_retryable_error(e):
+                breaker.record_failure()
+            if tools and is_tool_support_error(e):
+                mark_tool_calling_unsupported(model_name)
+
+            if fallback and not content_parts and not use_backup and model_type in MODEL_TYPES_WITH_BACKUP:
+                print(f"🔄 Trying backup model...")
+                async for item in self.chat_stream(messages, model_type, response_type, use_backup=True,
+                                                   retry_budget=retry_budget, stop_when=stop_when,
+                                                   tools=tools, tool_choice=tool_choice):
+                    yield item
+                return
+
+            if fallback:
+                self._record_health_failure(e)
+            result = {
+                "success": False,
+                "error": str(e),
+                "model_used": model_name,
+                "content": FALLBACK_ERROR_MESSAGE,
+                "partial_content": "".join(content_parts)
+            }
+
+        yield result
+
+    async def _hedged_chat(self, messages: List[Dict[str, str]], response_type: str, retry_budget: RetryBudget,
+                           tools: List[Dict[str, Any]] = None, tool_choice: str = None) -> Dict[str, Any]:
+        """
+        Send a chat request to the primary, racing chat_backup if the primary is slower than usual
+
+        Unlike the sync client, the losing request is cancelled outright.
+
+        Args:
+            messages: Chat messages
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            retry_budget: Retry budget shared by both legs
+            tools: Passed to both legs (see chat)
+            tool_choice: Passed to both legs (see chat)
+
+        Returns:
+            Result of the first leg to succeed (or the last failure), with "hedged"/"hedge_winner" if it fired
+        """
+        primary_model = Config.get_model("chat")
+        delay = self.latency_tracker.hedge_delay(primary_model, "total")
+
+        # Legs never fall back themselves: the backup leg is the fallback, and must not run twice
+        leg_kwargs = {"retry_budget": retry_budget, "hedge": False, "tools": tools, "tool_choice": tool_choice,
+                      "fallback": False}
+        primary = asyncio.create_task(self.chat(messages, "chat", response_type, **leg_kwargs))
+        legs = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                self.hedge_stats.record(hedged=False)
+                result = primary.result()
+                if result["success"]:
+                    return result
+                print(f"🔄 Trying backup model...")
+                return await self.chat(messages, "chat", response_type, use_backup=True, **leg_kwargs)
+
+            print(f"🏁 {primary_model} slower than {delay:.1f}s, racing the backup model")
+            legs.append(asyncio.create_task(self.chat(messages, "chat", response_type, use_backup=True, **leg_kwargs)))
+
+            pending = set(legs)
+            result = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result["success"]:
+                        winner = hedge_leg(result["model_used"])
+                        self.hedge_stats.record(hedged=True, winner=winner)
+                        print(f"🏁 {winner.capitalize()} leg won the race ({result['model_used']})")
+                        return {**result, "hedged": True, "hedge_winner": winner}
+
+            self.hedge_stats.record(hedged=True)
+            return result
+        finally:
+            for task in legs:
+                if not task.done():
+                    task.cancel()
+
+    async def _hedged_chat_stream(self, messages: List[Dict[str, str]], response_type: str, retry_budget: RetryBudget,
+                                  stop_when: Callable[[], bool] = None, tools: List[Dict[str, Any]] = None,
+                                  tool_choice: str = None) -> AsyncGenerator[Union[str, Dict[str, Any]], None]:
+        """
+        Streaming variant of _hedged_chat: the race is won by the first leg to produce a token
+
+        Args:
+            messages: Chat messages
+            response_type: "chat", "reasoning", or "simple" (for token limits)
+            retry_budget: Retry budget shared by both legs
+            stop_when: Passed to both legs (see chat_stream)
+            tools: Passed to both legs (see chat_stream)
+            tool_choice: Passed to both legs (see chat_stream)
+
+        Yields:
+            Content deltas of the winning leg, then a dict with the same shape as chat()
+        """
+        primary_model = Config.get_model("chat")
+        delay = self.latency_tracker.hedge_delay(primary_model, "first_token")
+
+        # Legs never fall back themselves: the backup leg is the fallback, and must not run twice
+        leg_kwargs = {"retry_budget": retry_budget, "hedge": False, "stop_when": stop_when, "tools": tools,
+                      "tool_choice": tool_choice, "fallback": False}
+        streams = {"primary": self.chat_stream(messages, "chat", response_type, **leg_kwargs)}
+        tasks = {asyncio.create_task(aprime_stream(streams["primary"])): "primary"}
+        hedged = False
+        winner = None
+        item = None
+        try:
+            done, _ = await asyncio.wait(set(tasks), timeout=delay)
+            if not done:
+                hedged = True
+                print(f"🏁 {primary_model} sent no token within {delay:.1f}s, racing the backup model")
+                streams["backup"] = self.chat_stream(messages, "chat", response_type, use_backup=True, **leg_kwargs)
+                tasks[asyncio.create_task(aprime_stream(streams["backup"]))] = "backup"
+
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = task.result()
+                    if isinstance(item, str) or item["success"]:
+                        winner = tasks[task]
+                        break
+        finally:
+            # Cancel the losing legs; cancellation runs their cleanup, which closes the HTTP stream
+            for task, leg in tasks.items():
+                if leg != winner:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    await streams[leg].aclose()
+
+        if not hedged:
+            self.hedge_stats.record(hedged=False)
+            if winner is None:
+                # The primary failed before its first token: the backup model is the fallback
+                print(f"🔄 Trying backup model...")
+                async for item in self.chat_stream(messages, "chat", response_type, use_backup=True, **leg_kwargs):
+                    yield item
+                return
+
+        # item is the winner's first delta, or a result dict if no leg produced content
+        try:
+            while True:
+                if isinstance(item, dict):
+                    if hedged:
+                        leg = hedge_leg(item["model_used"]) if item["success"] else None
+                        self.hedge_stats.record(hedged=True, winner=leg)
+                        if leg:
+                            print(f"🏁 {leg.capitalize()} leg won the race ({item['model_used']})")
+                        item = {**item, "hedged": True, "hedge_winner": leg}
+                    yield item
+                    return
+                yield item
+                item = await streams[winner].__anext__()
+        finally:
+            if winner:
+                await streams[winner].aclose()
+
+    async def _make_request(self, messages: List[Dict[str, str]], model: str, max_tokens: int, stream: bool = False,
+                            retry_budget: RetryBudget = None, request_info: Optional[Dict[str, Any]] = None,
+                            tools: List[Dict[str, Any]] = None, tool_choice: str = None):
+        """
+        Make the actual API request with retries, sleeping on the event loop between attempts
+
+        Args:
+            messages: Chat messages
+            model: Model name to use
+            max_tokens: Maximum tokens for response
+            stream: Whether to open a streaming response (retries cover opening the stream only)
+            retry_budget: Retry budget shared by the whole turn (defaults to a fresh one)
+            request_info: Optional dict whose "queue_wait" is increased by the time spent queuing
+            tools: Function definitions for native tool calling (optional)
+            tool_choice: Tool choice to send along with tools (optional)
+
+        Returns:
+            OpenAI response object, or an async chunk stream when stream=True
+        """
+        stream_kwargs = {"stream": True, "stream_options": {"include_usage": True}} if stream else {}
+        tool_kwargs = {"tools": tools, **({"tool_choice": tool_choice} if tool_choice else {})} if tools else {}
+        retry_budget = retry_budget or RetryBudget()
+        attempt = 0
+
+        while True:
+            queue_wait = await self.rate_limiter.acquire_async(model)
+            if request_info is not None:
+                request_info["queue_wait"] = request_info.get("queue_wait", 0.0) + queue_wait
+
+            try:
+                return await self.client.chat.completions.create(
+                    model=model,
+                    messages=apply_cache_hints(messages, model),
+                    max_tokens=max_tokens,
+                    temperature=Config.TEMPERATURE,
+                    timeout=Config.REQUEST_TIMEOUT,
+                    **stream_kwargs,
+                    **tool_kwargs
+                )
+
+            except Exception as e:
+                if not is_retryable_error(e):
+                    print(f"❌ Non-retryable error ({describe_error(e)}), not retrying")
+                    raise
+
+                delay = compute_retry_delay(e, attempt)
+                if attempt >= Config.MAX_RETRIES or not retry_budget.try_spend(delay):
+                    print(f"❌ Giving up on {model} after {attempt + 1} attempt(s)")
+                    raise
+
+                print(f"⚠️  Attempt {attempt + 1} failed ({describe_error(e)}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def simple_chat(self,
+                          user_message: str,
+                          model_type: str = "chat",
+                          system_prompt: str = None,
+                          use_cache: bool = False) -> str:
+        """
+        Simplified chat method for single messages
+
+        Args:
+            user_message: The user's message
+            model_type: "chat" or "reasoning"
+            system_prompt: Custom system prompt (optional, defaults to travel assistant)
+            use_cache: Serve an identical earlier request from the response cache
+
+        Returns:
+            String response from the model
+        """
+        system_content = system_prompt if system_prompt else DEFAULT_SYSTEM_PROMPT
+
+        messages = [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_message}
+        ]
+
+        result = await self.chat(messages, model_type, use_cache=use_cache)
+
+        if result["success"]:
+            return result["content"]
+        else:
+            return f"Error: {result.get('error', 'Unknown error occurred')}"
+
+    def _probe_connection(self):
+        """Health probe: list models through the shared sync pool (probes run on a worker thread, off the event loop)"""
+        # The health monitor runs one probe at a time, so the client is built once without a lock
+        if self.probe_client is None:
+            self.probe_client = OpenAI(api_key=Config.OPENROUTER_API_KEY, base_url=Config.OPENROUTER_BASE_URL,
+                                       http_client=get_http_client())
+        self.probe_client.models.list(timeout=Config.REQUEST_TIMEOUT)
+
+    async def close(self):
+        """Close the HTTP connections this client owns; the shared pool stays open for other clients"""
+        if self.owns_http_client:
+            await self.client.close()
@@ -0,0 +1,44 @@
+from typing import List, Dict, Any
+
+from ..utils.config import Config
+
+# Message key marking the end of the stable, cacheable prompt prefix. It is stripped before sending.
+CACHE_BREAKPOINT = "cache_breakpoint"
+
+
+def supports_cache_control(model: str) -> bool:
+    """Whether a model needs explicit cache_control breakpoints (others cache long prefixes automatically)"""
+    return any(model.startswith(prefix) for prefix in Config.PROMPT_CACHE_CONTROL_MODELS)
+
+
+def apply_cache_hints(messages: List[Dict[str, Any]], model: str) -> List[Dict[str, Any]]:
+    """
+    Turn cache breakpoint markers into what the model's provider understands
+
+    For models that need it, a marked message's text gets an ephemeral cache_control
+    breakpoint (OpenRouter passes it on to Anthropic and Gemini). For the others the
+    marker is just dropped.
+
+    Args:
+        messages: Chat messages, possibly marked with CACHE_BREAKPOINT
+        model: Model the request goes to
+
+    Returns:
+        Messages ready to send (the input list is left unchanged)
+    """
+    if not any(CACHE_BREAKPOINT in message for message in messages):
+        return messages
+
+    use_cache_control = supports_cache_control(model)
+    prepared = []
+    for message in messages:
+        if CACHE_BREAKPOINT not in message:
+            prepared.append(message)
+            continue
+
+        message = {key: value for key, value in message.items() if key != CACHE_BREAKPOINT}
+        if use_cache_control and isinstance(message.get("content"), str):
+            message["content"] = [{"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}}]
+        prepared.append(message)
+    return prepared
+
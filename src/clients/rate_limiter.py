@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+from ..utils.config import Config
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than allowed for a rate-limit token"""
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, requests_per_minute: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket full, so a cold process can burst immediately
+
+        Args:
+            requests_per_minute: Sustained refill rate
+            capacity: Maximum number of tokens (burst size)
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last update (caller holds the lock)"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve the next token, going into debt if none is available
+
+        Reservations are handed out in call order, so waiting callers are served FIFO.
+
+        Args:
+            max_wait: Refuse the reservation if it would take longer than this (seconds)
+
+        Returns:
+            Seconds the caller must wait before using the token, or None if refused
+        """
+        with self.lock:
+            self._refill()
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+class RateLimiter:
+    """Process-wide rate limiter with a separate token bucket per model"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty limiter; buckets are created on first use of each model
+
+        Args:
+            clock: Monotonic time source the buckets refill by (injectable for tests)
+        """
+        self.clock = clock
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def _get_bucket(self, model: str) -> TokenBucket:
+        """Get or create the bucket for a model, sized from Config"""
+        with self.lock:
+            if model not in self.buckets:
+                requests_per_minute = Config.MODEL_REQUESTS_PER_MINUTE.get(model, Config.REQUESTS_PER_MINUTE)
+                self.buckets[model] = TokenBucket(requests_per_minute, Config.RATE_LIMIT_BURST, self.clock)
+                self.stats[model] = {"acquired": 0, "rejected": 0, "total_wait": 0.0, "max_wait": 0.0}
+            return self.buckets[model]
+
+    def _record(self, model: str, wait: Optional[float]):
+        """Update the per-model counters after an acquire attempt"""
+        with self.lock:
+            stats = self.stats[model]
+            if wait is None:
+                stats["rejected"] += 1
+                return
+            stats["acquired"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+    def try_acquire(self, model: str) -> bool:
+        """
+        Non-blocking acquire
+
+        Args:
+            model: Model name the request is for
+
+        Returns:
+            True if a token was taken, False if the caller would have to wait
+        """
+        acquired = self._get_bucket(model).try_acquire()
+        self._record(model, 0.0 if acquired else None)
+        return acquired
+
+    def acquire(self, model: str, timeout: Optional[float] = None) -> float:
+        """
+        Blocking acquire
+
+        Args:
+            model: Model name the request is for
+            timeout: Maximum seconds to wait (defaults to Config.RATE_LIMIT_MAX_WAIT)
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        wait = self._reserve(model, timeout)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, model: str, timeout: Optional[float] = None) -> float:
+        """
+        Blocking acquire that waits on the event loop instead of a thread
+
+        Args:
+            model: Model name the request is for
+            timeout: Maximum seconds to wait (defaults to Config.RATE_LIMIT_MAX_WAIT)
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        wait = self._reserve(model, timeout)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self, model: str, timeout: Optional[float]) -> float:
+        """Reserve a token for a blocking acquire, raising if the wait is too long"""
+        max_wait = Config.RATE_LIMIT_MAX_WAIT if timeout is None else timeout
+        wait = self._get_bucket(model).reserve(max_wait)
+        self._record(model, wait)
+
+        if wait is None:
+            raise RateLimitExceeded(f"Local rate limit for {model} would require waiting over {max_wait}s")
+        if wait > 0:
+            print(f"⏳ Rate limit reached for {model}, queuing for {wait:.1f}s...")
+        return wait
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get queueing statistics per model
+
+        Returns:
+            Dict mapping model name to acquired/rejected counts and wait times
+        """
+        with self.lock:
+            return {
+                model: {
+                    **stats,
+                    "avg_wait": stats["total_wait"] / stats["acquired"] if stats["acquired"] else 0.0,
+                    "tokens_available": round(max(self.buckets[model].tokens, 0.0), 2)
+                }
+                for model, stats in self.stats.items()
+            }
+
+
+# Shared by every client in the process, so all sessions draw from the same buckets
+_shared_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter"""
+    return _shared_rate_limiter
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from ..utils.config import Config
+
+
+def make_cache_key(model: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+    """
+    Content address of a chat request
+
+    Args:
+        model: Model name the request is sent to
+        messages: Chat messages
+        max_tokens: Maximum tokens for response
+        temperature: Sampling temperature
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON form of the request
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseCache:
+    """In-process LRU cache of chat results with a TTL"""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_entries: Entries kept before the least recently used one is evicted
+            ttl_seconds: How long an entry stays valid
+        """
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.RESPONSE_CACHE_TTL
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None if missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a result, evicting the least recently used entries over the size limit"""
+        with self.lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+
+
+class SQLiteResponseCache:
+    """On-disk cache of chat results with a TTL and LRU eviction, shared across restarts"""
+
+    def __init__(self, path: str = None, max_entries: int = None, ttl_seconds: float = None):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite file path
+            max_entries: Entries kept before the least recently used ones are evicted
+            ttl_seconds: How long an entry stays valid
+        """
+        self.path = Path(path or Config.RESPONSE_CACHE_PATH)
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.RESPONSE_CACHE_TTL
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None if missing or expired"""
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a result, then drop expired entries and evict the least recently used over the limit"""
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self.connection.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.ttl_seconds,))
+            self.connection.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+
+
+# Shared by every client in the process; created on first use so the SQLite file is only opened when needed
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get the process-wide response cache
+
+    Returns:
+        A MemoryResponseCache or SQLiteResponseCache, depending on Config.RESPONSE_CACHE_BACKEND
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            if Config.RESPONSE_CACHE_BACKEND == "sqlite":
+                _shared_cache = SQLiteResponseCache()
+            else:
+                _shared_cache = MemoryResponseCache()
+        return _shared_cache
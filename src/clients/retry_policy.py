@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable
+
+import openai
+
+from ..utils.config import Config
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server-side failures
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class RetryBudget:
+    """Caps the retries (and the time spent on them) across every request of one turn"""
+
+    def __init__(self, max_seconds: float = None, max_retries: int = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the budget; the clock starts now
+
+        Args:
+            max_seconds: Wall-clock time after which no more retries are allowed
+            max_retries: Total retries allowed across all requests sharing this budget
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        max_seconds = Config.TURN_RETRY_BUDGET_SECONDS if max_seconds is None else max_seconds
+        self.clock = clock
+        self.deadline = clock() + max_seconds
+        self.retries_left = Config.TURN_MAX_RETRIES if max_retries is None else max_retries
+        self.lock = threading.Lock()  # hedge legs and early-started tools spend from one budget concurrently
+
+    def remaining(self) -> float:
+        """Seconds left before the budget expires"""
+        return max(0.0, self.deadline - self.clock())
+
+    def try_spend(self, delay: float) -> bool:
+        """
+        Claim one retry that starts after `delay` seconds
+
+        Returns:
+            True if the retry fits in the budget, False if the caller should give up
+        """
+        with self.lock:
+            if self.retries_left <= 0 or delay > self.remaining():
+                return False
+            self.retries_left -= 1
+            return True
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Decide whether a failed request could succeed if sent again
+
+    Args:
+        error: Exception raised by the OpenAI SDK
+
+    Returns:
+        True for timeouts, connection problems, 429s and 5xx; False otherwise
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def get_retry_after(error: Exception, now: datetime = None) -> Optional[float]:
+    """
+    Read the server's requested delay from Retry-After style headers
+
+    Args:
+        error: Exception raised by the OpenAI SDK
+        now: Current UTC time an HTTP-date is measured from (defaults to the system clock)
+
+    Returns:
+        Seconds to wait, or None if the response did not say
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        # HTTP-date form
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+        except (TypeError, ValueError):
+            pass
+
+    return None
+
+
+def compute_retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Delay before the next attempt: the server's Retry-After if given, else full-jitter backoff
+
+    Args:
+        error: Exception from the failed attempt
+        attempt: Zero-based index of the failed attempt
+
+    Returns:
+        Seconds to sleep before retrying
+    """
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        return retry_after
+
+    # Full jitter: uniform over [0, exponential cap] spreads out clients that failed together
+    return random.uniform(0, min(Config.RETRY_MAX_DELAY, Config.RETRY_DELAY * (2 ** attempt)))
+
+
+def describe_error(error: Exception) -> str:
+    """Short label for log lines, e.g. 'HTTP 429' or 'APITimeoutError'"""
+    status_code = getattr(error, "status_code", None)
+    return f"HTTP {status_code}" if status_code else type(error).__name__
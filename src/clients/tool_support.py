@@ -0,0 +1,69 @@
+import threading
+from typing import List, Dict, Any
+
+from ..utils.config import Config
+
+# Models seen rejecting the `tools` parameter, on top of the ones configured
+_unsupported_models = set()
+_lock = threading.Lock()
+
+
+def supports_tool_calling(model: str) -> bool:
+    """Whether a model is expected to accept native (OpenAI-style) tool calls"""
+    with _lock:
+        return model not in _unsupported_models and model not in Config.MODELS_WITHOUT_TOOL_SUPPORT
+
+
+def mark_tool_calling_unsupported(model: str):
+    """Remember that a model rejected a request with tools, so later turns use the text protocol"""
+    with _lock:
+        if model not in _unsupported_models:
+            print(f"🧰 {model} does not support tool calling, falling back to the text protocol")
+        _unsupported_models.add(model)
+
+
+def is_tool_support_error(error: Exception) -> bool:
+    """
+    Whether an API error means the model (or every provider serving it) can't handle tools
+
+    OpenRouter answers 404 "No endpoints found that support tool use" for such models;
+    some providers answer 400 instead.
+    """
+    status_code = getattr(error, "status_code", None)
+    return status_code in (400, 404) and "tool" in str(error).lower()
+
+
+def normalize_tool_calls(tool_calls) -> List[Dict[str, str]]:
+    """
+    Convert SDK tool call objects into plain dicts
+
+    Returns:
+        List of {"id", "name", "arguments"} dicts, arguments being the raw JSON string
+    """
+    return [
+        {"id": call.id, "name": call.function.name, "arguments": call.function.arguments or ""}
+        for call in tool_calls or []
+    ]
+
+
+def accumulate_tool_call_deltas(parts: Dict[int, Dict[str, str]], deltas):
+    """
+    Merge streamed tool call fragments into `parts` (by call index)
+
+    The id and name arrive with a call's first fragment; its arguments arrive in pieces.
+    """
+    for delta in deltas:
+        index = delta.index if delta.index is not None else len(parts)
+        entry = parts.setdefault(index, {"id": "", "name": "", "arguments": ""})
+        if delta.id:
+            entry["id"] = delta.id
+        if delta.function:
+            if delta.function.name:
+                entry["name"] = entry["name"] or delta.function.name
+            if delta.function.arguments:
+                entry["arguments"] += delta.function.arguments
+
+
+def collect_tool_calls(parts: Dict[int, Dict[str, str]]) -> List[Dict[str, str]]:
+    """Finished tool calls from accumulate_tool_call_deltas, in call order"""
+    return [parts[index] for index in sorted(parts)]
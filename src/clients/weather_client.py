@@ -1,19 +1,35 @@
 import requests
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 
 from ..utils.config import Config
+from .geocode_cache import GeocodeCache, get_geocode_cache, normalize_location
+from .forecast_cache import ForecastCache, get_forecast_cache
+from .http_pool import get_weather_session
 
 
 class WeatherClient:
     """Client for OpenWeatherMap API"""
 
-    def __init__(self):
-        """Initialize the weather client"""
+    def __init__(self, geocode_cache: GeocodeCache = None, forecast_cache: ForecastCache = None,
+                 session: requests.Session = None):
+        """
+        Initialize the weather client
+
+        Args:
+            geocode_cache: Cache of geocoding results (default: the process-wide one)
+            forecast_cache: Cache of weather payloads (default: the process-wide one)
+            session: Pooled HTTP session (default: the process-wide keep-alive session)
+        """
         self.api_key = Config.OPENWEATHER_API_KEY
         self.base_url = Config.OPENWEATHER_BASE_URL
+        self.geo_url = Config.OPENWEATHER_GEO_URL
         self.timeout = 10  # seconds
+        self.session = session or get_weather_session()
+        self.geocode_cache = geocode_cache or get_geocode_cache()
+        self.forecast_cache = forecast_cache or get_forecast_cache()
 
         if not self.api_key:
             print("⚠️ OpenWeather API key not found - weather features disabled")
@@ -47,12 +63,15 @@ class WeatherClient:
             lon = coords_result["lon"]
             location_name = coords_result["name"]
 
-            # Get current weather
-            current_weather = self._get_current_weather(lat, lon)
-
             # Get 5-day forecast (free tier limitation)
             forecast_weather = self._get_forecast_data(lat, lon)
 
+            # Get current weather (in low-latency mode, from the forecast we already have)
+            if Config.WEATHER_CURRENT_FROM_FORECAST and forecast_weather.get("list"):
+                current_weather = self._current_from_forecast(forecast_weather)
+            else:
+                current_weather = self._get_current_weather(lat, lon)
+
             # Process and format the weather data
             formatted_data = self._format_weather_data(
                 location_name, start_date, end_date,
@@ -79,36 +98,64 @@ class WeatherClient:
             }
 
     def _get_coordinates(self, location: str) -> Dict[str, Any]:
-        """Get coordinates for a location using geocoding API"""
-        url = f"http://api.openweathermap.org/geo/1.0/direct"
+        """Get coordinates for a location, from the geocode cache or the geocoding API"""
+        cache_key = normalize_location(location)
+        geocode = self.geocode_cache.get(cache_key)
+        if geocode is None:
+            geocode = self._geocode(location)
+            self.geocode_cache.set(cache_key, geocode)
+
+        if not geocode["found"]:
+            return {
+                "success": False,
+                "error": f"Location '{location}' not found",
+                "data": f"Could not find weather data for '{location}'. Please check the location name."
+            }
+
+        return {
+            "success": True,
+            "lat": geocode["lat"],
+            "lon": geocode["lon"],
+            "name": geocode["name"]
+        }
+
+    def _geocode(self, location: str) -> Dict[str, Any]:
+        """Look a location up with the geocoding API (request errors are raised, so they aren't cached)"""
+        url = f"{self.geo_url}/direct"
         params = {
             "q": location,
             "limit": 1,
             "appid": self.api_key
         }
 
-        response = requests.get(url, params=params, timeout=self.timeout)
+        response = self.session.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
 
         data = response.json()
 
         if not data:
-            return {
-                "success": False,
-                "error": f"Location '{location}' not found",
-                "data": f"Could not find weather data for '{location}'. Please check the location name."
-            }
+            return {"found": False}
 
         location_data = data[0]
         return {
-            "success": True,
+            "found": True,
             "lat": location_data["lat"],
             "lon": location_data["lon"],
             "name": f"{location_data['name']}, {location_data.get('country', '')}"
         }
 
     def _get_current_weather(self, lat: float, lon: float) -> Dict[str, Any]:
-        """Get current weather for coordinates"""
+        """Get current weather for coordinates, from the forecast cache or the API"""
+        return self.forecast_cache.get_or_fetch("weather", lat, lon, self._fetch_current_weather,
+                                                Config.CURRENT_WEATHER_UPDATE_INTERVAL)
+
+    def _get_forecast_data(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Get 5-day forecast for coordinates, from the forecast cache or the API"""
+        return self.forecast_cache.get_or_fetch("forecast", lat, lon, self._fetch_forecast_data,
+                                                Config.FORECAST_UPDATE_INTERVAL)
+
+    def _fetch_current_weather(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Request current weather for coordinates"""
         url = f"{self.base_url}/weather"
         params = {
             "lat": lat,
@@ -117,13 +164,13 @@ class WeatherClient:
             "units": "metric"
         }
 
-        response = requests.get(url, params=params, timeout=self.timeout)
+        response = self.session.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
 
         return response.json()
 
-    def _get_forecast_data(self, lat: float, lon: float) -> Dict[str, Any]:
-        """Get 5-day forecast for coordinates"""
+    def _fetch_forecast_data(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Request the 5-day forecast for coordinates"""
         url = f"{self.base_url}/forecast"
         params = {
             "lat": lat,
@@ -132,11 +179,16 @@ class WeatherClient:
             "units": "metric"
         }
 
-        response = requests.get(url, params=params, timeout=self.timeout)
+        response = self.session.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
 
         return response.json()
 
+    def _current_from_forecast(self, forecast: Dict[str, Any]) -> Dict[str, Any]:
+        """Current conditions approximated by the forecast slot nearest to now (slots have the /weather fields used)"""
+        now = time.time()
+        return min(forecast["list"], key=lambda item: abs(item["dt"] - now))
+
     def _format_weather_data(self, location: str, start_date: str, end_date: str,
                              current: Dict, forecast: Dict) -> str:
         """Format weather data into readable text with daily breakdown"""
@@ -269,9 +321,9 @@ class WeatherClient:
             }
 
         try:
-            # Test with a simple location
-            result = self._get_coordinates("London, UK")
-            if result["success"]:
+            # Test with a simple location, bypassing the geocode cache so the API is actually reached
+            result = self._geocode("London, UK")
+            if result["found"]:
                 return {
                     "success": True,
                     "message": "Weather API connection successful"
@@ -279,7 +331,7 @@ class WeatherClient:
             else:
                 return {
                     "success": False,
-                    "message": f"API test failed: {result['error']}"
+                    "message": "API test failed: test location 'London, UK' not found"
                 }
         except Exception as e:
             return {
@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..utils.config import Config
+
+# Bumped whenever the checkpoint layout changes; checkpoints of another version are refused
+CHECKPOINT_VERSION = 1
+_SESSION_ID = re.compile(r"^[\w.-]+$")
+
+
+def check_checkpoint_version(checkpoint: Dict[str, Any]):
+    """Raise ValueError unless the checkpoint was written in the current format"""
+    version = checkpoint.get("version") if isinstance(checkpoint, dict) else None
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version!r} (expected {CHECKPOINT_VERSION})")
+
+
+def encode_checkpoint(checkpoint: Dict[str, Any]) -> bytes:
+    """
+    Serialize a session checkpoint compactly
+
+    Args:
+        checkpoint: Dict from ConversationManager.to_checkpoint()
+
+    Returns:
+        zlib-compressed compact JSON
+    """
+    check_checkpoint_version(checkpoint)
+    payload = json.dumps(checkpoint, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def decode_checkpoint(data: bytes) -> Dict[str, Any]:
+    """
+    Inverse of encode_checkpoint
+
+    Raises:
+        ValueError: If the data is corrupt or in another checkpoint version
+    """
+    try:
+        checkpoint = json.loads(zlib.decompress(data).decode("utf-8"))
+    except zlib.error as e:
+        raise ValueError(f"Corrupt checkpoint: {str(e)}")
+    check_checkpoint_version(checkpoint)
+    return checkpoint
+
+
+class DirectoryCheckpointStore:
+    """Checkpoints as one file per session in a directory (a shared volume lets every worker resume them)"""
+
+    def __init__(self, directory: str = None):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding the checkpoint files (default from Config)
+        """
+        self.directory = Path(directory or Config.CHECKPOINT_DIR)
+
+    def save(self, session_id: str, checkpoint: Dict[str, Any]):
+        """Store a session's checkpoint, replacing the previous one atomically"""
+        path = self._path(session_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(encode_checkpoint(checkpoint))
+        os.replace(temp_path, path)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session's checkpoint, or None if there is none"""
+        try:
+            data = self._path(session_id).read_bytes()
+        except FileNotFoundError:
+            return None
+        return decode_checkpoint(data)
+
+    def delete(self, session_id: str):
+        """Remove a session's checkpoint, if any"""
+        self._path(session_id).unlink(missing_ok=True)
+
+    def _path(self, session_id: str) -> Path:
+        """File of a session's checkpoint"""
+        if not _SESSION_ID.match(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return self.directory / f"{session_id}.ckpt"
+
+
+class SQLiteCheckpointStore:
+    """Checkpoints as rows of one SQLite database, which every worker on the host can share"""
+
+    def __init__(self, path: str = None):
+        """
+        Open (or create) the checkpoint database
+
+        Args:
+            path: SQLite file path (default from Config)
+        """
+        self.path = Path(path or Config.CHECKPOINT_DB_PATH)
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, version INTEGER NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    def save(self, session_id: str, checkpoint: Dict[str, Any]):
+        """Store a session's checkpoint, replacing the previous one"""
+        data = encode_checkpoint(checkpoint)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (session_id, data, version, saved_at) VALUES (?, ?, ?, ?)",
+                (session_id, data, CHECKPOINT_VERSION, time.time())
+            )
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session's checkpoint, or None if there is none"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM checkpoints WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return decode_checkpoint(row[0]) if row else None
+
+    def delete(self, session_id: str):
+        """Remove a session's checkpoint, if any"""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM checkpoints WHERE session_id = ?", (session_id,))
+
+
+# Shared by every session store in the process; created on first use
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_checkpoint_store():
+    """
+    Get the process-wide checkpoint store
+
+    Returns:
+        A DirectoryCheckpointStore or SQLiteCheckpointStore, depending on Config.CHECKPOINT_BACKEND
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            if Config.CHECKPOINT_BACKEND == "sqlite":
+                _shared_store = SQLiteCheckpointStore()
+            else:
+                _shared_store = DirectoryCheckpointStore()
+        return _shared_store
@@ -1,27 +1,56 @@
+import asyncio
+import threading
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Any, Optional
 
-from ..clients.openrouter_client import OpenRouterClient
+from ..clients.openrouter_client import OpenRouterClient, AsyncOpenRouterClient
 from ..utils.config import Config
 from datetime import datetime
 import calendar
 
+CONTEXT_ANALYSIS_REQUEST = "Please analyze the conversation and update the user context based on the instructions above."
+RECENT_MESSAGES_ANALYZED = 6  # last 3 turns; only these are passed to (and copied for) an update
+
+# Shared by all sessions; a session has at most one update in flight, since the next turn joins on it
+_context_update_executor = ThreadPoolExecutor(max_workers=Config.CONTEXT_UPDATE_MAX_WORKERS, thread_name_prefix="context")
+
 class ContextManager:
     """Manages user insights using flexible text-based storage"""
 
-    def __init__(self, client: OpenRouterClient):
+    def __init__(self, client: OpenRouterClient, async_client: AsyncOpenRouterClient = None):
         """
         Initialize the context manager with dependency injection
 
         Args:
             client: OpenRouter client instance (dependency injection)
+            async_client: AsyncOpenRouterClient instance for update_context_async (optional)
         """
         self.client = client
+        self.async_client = async_client
+        self.context_version = 0  # bumped on every change of user_context, so prompts built from it can be cached
         self.user_context = self._create_initial_context()
-        self.context_snapshots = deque(maxlen=5)  # Store last few context states for undo functionality
+        self.context_snapshots = deque(maxlen=Config.HISTORY_ROLLBACK_TURNS)  # Store last few context states for undo functionality
+        self.update_generation = 0  # bumped by undo/reset/manual edits, so an update started before them is discarded
+        self.pending_update: Optional[Future] = None  # background update the next turn joins on
+        self.pending_async_update: Optional[asyncio.Task] = None  # same, for the async path
+        self.unlanded_updates = set()  # ids of started updates that haven't landed; their turn has no snapshot yet
+        self.next_update_id = 0
+        self.lock = threading.Lock()
 
         print("✅ Context Manager initialized with dependency injection")
 
+    @property
+    def user_context(self) -> str:
+        """The current user context text"""
+        return self._user_context
+
+    @user_context.setter
+    def user_context(self, context: str):
+        """Replace the user context and bump context_version"""
+        self._user_context = context
+        self.context_version += 1
+
     def _create_initial_context(self) -> str:
         """
         Create initial context with current date and seasonal information
@@ -81,13 +110,211 @@ class ContextManager:
         if len(conversation_history) < 2:  # Need at least one full turn
             return
 
+        updated_context = self._generate_context_update(conversation_history)
+        if updated_context is not None:
+            self._apply_context_update(updated_context)
+
+    async def update_context_async(self, conversation_history: List[Dict[str, str]]):
+        """
+        Async twin of update_context, using the injected AsyncOpenRouterClient.
+        Without an async client, the blocking update runs in a worker thread instead.
+
+        Args:
+            conversation_history: Current conversation history from ConversationManager
+        """
+        if len(conversation_history) < 2:  # Need at least one full turn
+            return
+
+        if not self.async_client:
+            await asyncio.to_thread(self.update_context, conversation_history)
+            return
+
+        updated_context = await self._generate_context_update_async(conversation_history)
+        if updated_context is not None:
+            self._apply_context_update(updated_context)
+
+    def _generate_context_update(self, conversation_history: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Ask the context model for the updated context, without applying it
+
+        Returns:
+            Raw text returned by the context model, or None if the request failed
+        """
+        try:
+            analysis_system_prompt = self._build_analysis_prompt(conversation_history)
+
+            # Get updated context from LLM with proper system prompt
+            return self.client.simple_chat(
+                user_message=CONTEXT_ANALYSIS_REQUEST,
+                model_type="context",
+                system_prompt=analysis_system_prompt,
+                use_cache=True  # identical after retry/edit rollbacks
+            )
+
+        except Exception as e:
+            print(f"⚠️  Error updating user context: {str(e)}")
+            # Continue without context update - not critical
+            return None
+
+    async def _generate_context_update_async(self, conversation_history: List[Dict[str, str]]) -> Optional[str]:
+        """Async twin of _generate_context_update"""
+        try:
+            analysis_system_prompt = self._build_analysis_prompt(conversation_history)
+
+            return await self.async_client.simple_chat(
+                user_message=CONTEXT_ANALYSIS_REQUEST,
+                model_type="context",
+                system_prompt=analysis_system_prompt,
+                use_cache=True  # identical after retry/edit rollbacks
+            )
+
+        except Exception as e:
+            print(f"⚠️  Error updating user context: {str(e)}")
+            return None
+
+    # Background updates: the reply is shown while the context is analyzed, and the next
+    # turn joins on the result before building its system prompt
+
+    def update_context_in_background(self, conversation_history: List[Dict[str, str]]) -> Optional[Future]:
+        """
+        Start update_context on a worker thread and return immediately
+
+        Args:
+            conversation_history: Current conversation history (its recent messages are copied, so later turns don't leak in)
+
+        Returns:
+            Future resolving to the applied context (None if nothing was applied),
+            or None if there is no full turn to analyze yet
+        """
+        if len(conversation_history) < 2:  # Need at least one full turn
+            return None
+
+        self.pending_update = _context_update_executor.submit(
+            self._run_background_update, conversation_history[-RECENT_MESSAGES_ANALYZED:], self.update_generation,
+            self._start_update()
+        )
+        return self.pending_update
+
+    def update_context_in_background_async(self, conversation_history: List[Dict[str, str]]) -> Optional[asyncio.Task]:
+        """
+        Async twin of update_context_in_background: schedules the update as a task on the running loop
+
+        Args:
+            conversation_history: Current conversation history (its recent messages are copied, so later turns don't leak in)
+
+        Returns:
+            Task resolving to the applied context (None if nothing was applied),
+            or None if there is no full turn to analyze yet
+        """
+        if len(conversation_history) < 2:  # Need at least one full turn
+            return None
+
+        self.pending_async_update = asyncio.create_task(
+            self._run_background_update_async(conversation_history[-RECENT_MESSAGES_ANALYZED:], self.update_generation,
+                                              self._start_update())
+        )
+        return self.pending_async_update
+
+    def _start_update(self) -> int:
+        """Register a background update as not landed yet, returning its id"""
+        with self.lock:
+            update_id = self.next_update_id
+            self.next_update_id += 1
+            self.unlanded_updates.add(update_id)
+            return update_id
+
+    def _run_background_update(self, conversation_history: List[Dict[str, str]], generation: int,
+                               update_id: int) -> Optional[str]:
+        """Worker body of update_context_in_background"""
+        try:
+            updated_context = self._generate_context_update(conversation_history)
+            if updated_context is None:
+                return None
+            return self._apply_if_current(updated_context, generation, update_id)
+        finally:
+            with self.lock:
+                self.unlanded_updates.discard(update_id)
+
+    async def _run_background_update_async(self, conversation_history: List[Dict[str, str]], generation: int,
+                                           update_id: int) -> Optional[str]:
+        """Task body of update_context_in_background_async"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run_background_update, conversation_history, generation, update_id)
+
+        try:
+            updated_context = await self._generate_context_update_async(conversation_history)
+            if updated_context is None:
+                return None
+            return self._apply_if_current(updated_context, generation, update_id)
+        finally:
+            with self.lock:
+                self.unlanded_updates.discard(update_id)
+
+    def _apply_if_current(self, updated_context: str, generation: int, update_id: int) -> Optional[str]:
+        """
+        Apply a background result unless the context was restored, reset or set since it started
+
+        Returns:
+            The new context if it was applied, else None
+        """
+        with self.lock:
+            self.unlanded_updates.discard(update_id)  # landed, in the same critical section as its snapshot
+            if generation != self.update_generation:
+                print("⏭️  Discarding a context update that started before an undo/reset")
+                return None
+            if not self._apply_context_update(updated_context):
+                return None
+            return self.user_context
+
+    def wait_for_pending_update(self, timeout: float = None):
+        """
+        Join point: block until the background update (if any) has been applied
+
+        Args:
+            timeout: Seconds to wait before continuing with the current context (default from Config)
+        """
+        pending = self.pending_update
+        if pending is None or pending.done():
+            return
+
+        print("⏳ Waiting for the previous context update...")
         try:
-            # Get recent conversation for analysis (last few turns)
-            recent_messages = conversation_history[-6:]  # Last 3 turns (6 messages)
-            conversation_text = self._format_messages_as_text(recent_messages)
+            pending.result(timeout=timeout or Config.CONTEXT_UPDATE_JOIN_TIMEOUT)
+        except FutureTimeoutError:
+            print("⚠️  Context update still running, continuing with the current context")
+
+    async def wait_for_pending_update_async(self, timeout: float = None):
+        """Async twin of wait_for_pending_update (the task keeps running if the wait times out)"""
+        pending = self.pending_async_update
+        if pending is None or pending.done():
+            return
+
+        print("⏳ Waiting for the previous context update...")
+        try:
+            await asyncio.wait_for(asyncio.shield(pending), timeout or Config.CONTEXT_UPDATE_JOIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("⚠️  Context update still running, continuing with the current context")
+
+    def _invalidate_pending_update(self):
+        """Make any in-flight background update discard its result (caller holds the lock)"""
+        self.update_generation += 1
+
+    def _build_analysis_prompt(self, conversation_history: List[Dict[str, str]]) -> str:
+        """
+        Build the system prompt for the context analysis agent
+
+        Args:
+            conversation_history: Current conversation history from ConversationManager
+
+        Returns:
+            Analysis system prompt with the current context and recent conversation
+        """
+        # Get recent conversation for analysis (last few turns)
+        recent_messages = conversation_history[-RECENT_MESSAGES_ANALYZED:]
+        conversation_text = self._format_messages_as_text(recent_messages)
 
-            # Create analysis system prompt
-            analysis_system_prompt = f"""You are a specialized **Context Analysis Agent** for an AI Travel Assistant. Your primary function is to analyze conversation snippets and maintain a comprehensive, up-to-date user profile. This profile is crucial for the AI Travel Assistant to provide personalized, relevant, and effective support.
+        # Create analysis system prompt
+        analysis_system_prompt = f"""You are a specialized **Context Analysis Agent** for an AI Travel Assistant. Your primary function is to analyze conversation snippets and maintain a comprehensive, up-to-date user profile. This profile is crucial for the AI Travel Assistant to provide personalized, relevant, and effective support.
 
 ### **Core Directives**
 
@@ -134,25 +361,27 @@ RECENT CONVERSATION:
 That is all. Please now output the updated context according to these instructions.
 """
 
+        return analysis_system_prompt
 
-            # Get updated context from LLM with proper system prompt
-            updated_context = self.client.simple_chat(
-                user_message="Please analyze the conversation and update the user context based on the instructions above.",
-                model_type="context",
-                system_prompt=analysis_system_prompt
-            )
+    def _apply_context_update(self, updated_context: str) -> bool:
+        """
+        Replace the user context with the analysis result, keeping a snapshot for undo
 
-            # Only update if we got a reasonable response
-            if updated_context and len(updated_context.strip()) > 10:
-                self.save_context_snapshot()
-                self.user_context = updated_context.strip()
-                print("🧠 User context updated")
-            else:
-                print("⚠️  Context analysis returned empty result, keeping existing context")
+        Args:
+            updated_context: Raw text returned by the context model
 
-        except Exception as e:
-            print(f"⚠️  Error updating user context: {str(e)}")
-            # Continue without context update - not critical
+        Returns:
+            True if the context was replaced
+        """
+        # Only update if we got a reasonable response
+        if updated_context and len(updated_context.strip()) > 10:
+            self.save_context_snapshot()
+            self.user_context = updated_context.strip()
+            print("🧠 User context updated")
+            return True
+
+        print("⚠️  Context analysis returned empty result, keeping existing context")
+        return False
 
     def _format_messages_as_text(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -185,8 +414,10 @@ That is all. Please now output the updated context according to these instructio
         return self.user_context
 
     def reset_context(self):
-        """Reset user context"""
-        self.user_context = self._create_initial_context()
+        """Reset user context (an update still running is discarded)"""
+        with self.lock:
+            self._invalidate_pending_update()
+            self.user_context = self._create_initial_context()
         print("🔄 User context reset")
 
     def get_context_summary(self) -> Dict[str, Any]:
@@ -212,7 +443,9 @@ That is all. Please now output the updated context according to these instructio
         if not context or not context.strip():
             raise ValueError("Context cannot be empty")
 
-        self.user_context = context.strip()
+        with self.lock:
+            self._invalidate_pending_update()
+            self.user_context = context.strip()
         print(f"✅ Context set manually: {context[:50]}...")
 
     # HELPERS for handling conversation branching and snapshots
@@ -223,18 +456,52 @@ That is all. Please now output the updated context according to these instructio
 
     def restore_context_snapshot(self, steps_back: int = 1):
         """Restore context to a previous state"""
-        if len(self.context_snapshots) >= steps_back:
-            # Pop items from the end to go back in time
-            restored_context = None
-            for _ in range(steps_back):
-                restored_context = self.context_snapshots.pop()
-
-            self.user_context = restored_context
-            print(f"🔄 Context restored {steps_back} step(s) back.")
-            return True
-        else:
-            print(f"⚠️ Cannot restore {steps_back} steps back, only {len(self.context_snapshots)} snapshots available")
-            return False
+        # The latest turn's update saves its snapshot when it lands, so let it finish first
+        self.wait_for_pending_update()
+
+        with self.lock:
+            # An update still in flight (an async one, or a sync one past the join timeout) is discarded
+            # below without saving its snapshot, so its turn is undone by keeping the current context
+            skipped = min(len(self.unlanded_updates), steps_back)
+            self.unlanded_updates.clear()
+            self._invalidate_pending_update()
+            if len(self.context_snapshots) >= steps_back - skipped:
+                # Pop items from the end to go back in time
+                restored_context = self.user_context
+                for _ in range(steps_back - skipped):
+                    restored_context = self.context_snapshots.pop()
+
+                self.user_context = restored_context
+                print(f"🔄 Context restored {steps_back} step(s) back.")
+                return True
+            else:
+                print(f"⚠️ Cannot restore {steps_back} steps back, only {len(self.context_snapshots)} snapshots available")
+                return False
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """The user context and its undo snapshots, for a session checkpoint (a running update is joined first)"""
+        self.wait_for_pending_update()
+        with self.lock:
+            return {"user_context": self.user_context, "context_snapshots": list(self.context_snapshots)}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], client: OpenRouterClient,
+                        async_client: AsyncOpenRouterClient = None) -> "ContextManager":
+        """
+        Rebuild a context manager from to_checkpoint() output
+
+        Args:
+            checkpoint: Dict from to_checkpoint()
+            client: OpenRouter client instance (dependency injection)
+            async_client: AsyncOpenRouterClient instance (optional)
+
+        Returns:
+            The restored ContextManager
+        """
+        context_manager = cls(client, async_client=async_client)
+        context_manager.user_context = checkpoint["user_context"]
+        context_manager.context_snapshots.extend(checkpoint["context_snapshots"])
+        return context_manager
 
     def get_available_snapshots(self) -> int:
         """Get number of available context snapshots for undo"""
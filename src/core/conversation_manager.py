@@ -1,18 +1,52 @@
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator
 
-from ..clients.openrouter_client import OpenRouterClient
+from ..clients.openrouter_client import OpenRouterClient, AsyncOpenRouterClient
 from ..utils.config import Config
 from ..tracking.conversation_tracker import ConversationTracker
 from ..clients.weather_client import WeatherClient
-
+from ..clients.retry_policy import RetryBudget
+from ..utils.tokens import count_message_tokens, split_into_turns, trim_history_to_budget
+from .tool_parser import ToolBlockParser
+from .plan_store import PlanStore
+from .history_summarizer import HistorySummarizer
+from .context_manager import ContextManager
+from .checkpoints import CHECKPOINT_VERSION, check_checkpoint_version
+from .tool_calling import TOOL_DEFINITIONS, NATIVE_TOOL_USAGE_PROMPT, tool_calls_to_tools, build_tool_result_messages
+from ..clients.tool_support import supports_tool_calling
+from ..clients.prompt_cache import CACHE_BREAKPOINT
+
+import asyncio
 import re
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+# Bounded pool for blocking tool calls, shared by every session in the process
+_tool_executor = ThreadPoolExecutor(max_workers=Config.TOOL_MAX_WORKERS, thread_name_prefix="tool")
+# Planner calls take tens of seconds, so they get their own pool rather than starving weather lookups
+_planner_executor = ThreadPoolExecutor(max_workers=Config.PLANNER_MAX_WORKERS, thread_name_prefix="planner")
 
 
 
 class ConversationManager:
     """Manages conversation flow between user and AI travel assistant"""
 
-    def __init__(self, client: OpenRouterClient, context_manager=None, tracker: ConversationTracker = None):
+    # User context, sent as its own system message after the static (cacheable) base prompt
+    USER_CONTEXT_PROMPT = """<User_Context>
+    This information has been gathered about the user to help you provide a personalized service. Leverage it to inform your suggestions and responses.
+    ### User-Context START
+    {user_context}
+    ### User-Context END
+    Note that the context above isn't updated on the last user reply, so while the context is very helpful, be aware of possible slight changes and updates in the user's last message. You are now continuing an ongoing conversation. The history of that conversation will follow this message. Respond to the user's latest message based on both their personal context above and the recent conversation history.
+</User_Context>"""
+
+    # Tools whose results go back to the model for a follow-up reply: UI labels for that step
+    FOLLOWUP_TOOLS = {
+        "Weather": {"status": "Interpreting weather data...", "subject": "weather data"},
+        "Plan_Details": {"status": "Reviewing the stored plan...", "subject": "plan details"}
+    }
+
+    def __init__(self, client: OpenRouterClient, context_manager=None, tracker: ConversationTracker = None,
+                 async_client: AsyncOpenRouterClient = None, weather_client: WeatherClient = None):
         """
         Initialize the conversation manager with dependency injection
 
@@ -20,12 +54,20 @@ class ConversationManager:
             client: OpenRouter client instance (dependency injection)
             context_manager: ContextManager instance for user insights (optional for now)
             tracker: ConversationTracker instance for session tracking (optional)
+            async_client: AsyncOpenRouterClient instance, required by send_message_async (optional)
+            weather_client: WeatherClient instance, may be shared between sessions (optional, one is created)
         """
         self.client = client
+        self.async_client = async_client
         self.context_manager = context_manager
         self.tracker = tracker
-        self.weather_client = WeatherClient()
+        self.weather_client = weather_client or WeatherClient()
         self.conversation_history = []
+        self.plan_store = PlanStore(Config.PLAN_DIGEST_TOKENS)  # full planner output; the history keeps digests
+        self.history_summarizer = HistorySummarizer(client, async_client)  # running summary of the oldest turns
+        self.retry_budget = None  # shared by every LLM call of the turn in progress
+        self.system_messages_cache = {}  # native_tools -> (base prompt, context version, system messages)
+        self.custom_system_prompt = None  # set by change_system_prompt; checkpointed, unlike the built-in prompt
 
         self.base_system_prompt = f"""<System_Instructions>
     <Role>
@@ -156,6 +198,20 @@ class ConversationManager:
             - This tool can be used only once!
 
         </Deep_Planning_Tool>
+
+        <Plan_Details_Tool>
+            **When to Use:** Plans you created earlier appear in the conversation as a short outline with a plan id (the user saw the full plan). When the user asks about details of such a plan that the outline doesn't show, use this tool to read the full plan again.
+
+            **How to Use:** Output the following format exactly:
+
+            $!$TOOL_USE_START$!$
+            Tool: Plan_Details
+            Plan_Id: <the plan id from the outline, e.g. plan-1>
+            $!$TOOL_USE_END$!$
+
+            **Important Notes:**
+            - Use it at most once per response, on its own. Don't repeat the whole plan to the user afterwards; answer their question.
+        </Plan_Details_Tool>
     </Tool_Usage>
     
     <Core_Logic_Flow>
@@ -183,37 +239,69 @@ class ConversationManager:
         - **Framing Plans:** Always present a full itinerary as a "sample plan," "suggested itinerary," or a "flexible template." This frames it as a collaborative starting point, not a rigid final command.
         - **Price Estimates:** If you include specific cost estimates (€50, $100/night, etc.), you MUST add a disclaimer at the end of the message, such as "*Note: All prices are estimates based on typical costs and should be verified when booking.*"
     </Output_Formatting>
-    
-    <User_Context>
-        This information has been gathered about the user to help you provide a personalized service. Leverage it to inform your suggestions and responses.
+</System_Instructions>
 """
+        self.native_tools_system_prompt = self._build_native_tools_prompt(self.base_system_prompt)
+
         print("✅ Conversation Manager initialized with dependency injection")
         print("🎯 Travel assistant ready to help!")
 
-    def _build_dynamic_system_prompt(self) -> str:
+    @staticmethod
+    @lru_cache(maxsize=8)  # every session derives the same text from the same base prompt: share one copy
+    def _build_native_tools_prompt(base_system_prompt: str) -> str:
+        """Same prompt without the text tool protocol, for native tool calling (tools are declared to the API)."""
+        if "    <Tool_Usage>" not in base_system_prompt or "</Tool_Usage>" not in base_system_prompt:
+            return base_system_prompt
+        tool_usage_start = base_system_prompt.index("    <Tool_Usage>")
+        tool_usage_end = base_system_prompt.index("</Tool_Usage>") + len("</Tool_Usage>")
+        return base_system_prompt[:tool_usage_start] + NATIVE_TOOL_USAGE_PROMPT + base_system_prompt[tool_usage_end:]
+
+    def _build_system_messages(self, native_tools: bool = False) -> List[Dict[str, Any]]:
         """
-        Build dynamic system prompt with user context
+        Build the system messages: the static base prompt, then the user context
+
+        The base prompt is identical on every turn, so it is marked as a cache breakpoint and
+        providers can serve it from their prompt cache. The user context changes from turn to
+        turn, so it comes after it rather than inside it.
+
+        Args:
+            native_tools: Use the prompt for native tool calling (without the text tool protocol)
 
         Returns:
-            Complete system prompt with context
+            System messages to put before the history (cached per base prompt and context version, don't modify)
         """
-        # Start with base prompt
-        system_prompt = self.base_system_prompt
+        base_system_prompt = self.native_tools_system_prompt if native_tools else self.base_system_prompt
+
+        # The previous turn's background update was joined at the start of the turn
+        context_version = self.context_manager.context_version if self.context_manager else None
+
+        cached = self.system_messages_cache.get(native_tools)
+        if cached and cached[0] == base_system_prompt and cached[1] == context_version:
+            return cached[2]
+
+        system_messages = [{"role": "system", "content": base_system_prompt, CACHE_BREAKPOINT: True}]
 
         # Add user context if available
         if self.context_manager:
             user_context = self.context_manager.get_context_for_prompt()
             if user_context and user_context != "No previous context about this user.":
-                system_prompt = f"""{self.base_system_prompt}
-    ### User-Context START
-    {user_context}
-    ### User-Context END
-    Note that the context above isn't updated on the last user reply, so while the context is very helpful, be aware of possible slight changes and updates in the user's last message. You are now continuing an ongoing conversation. The history of that conversation will follow this message. Respond to the user's latest message based on both their personal context above and the recent conversation history.
-    </User_Context>
-</System_Instructions>
-"""
+                system_messages.append({"role": "system",
+                                        "content": self.USER_CONTEXT_PROMPT.format(user_context=user_context)})
+
+        self.system_messages_cache[native_tools] = (base_system_prompt, context_version, system_messages)
+        return system_messages
+
+    def _build_dynamic_system_prompt(self, native_tools: bool = False) -> str:
+        """
+        Build dynamic system prompt with user context, as one text (for display)
+
+        Args:
+            native_tools: Use the prompt for native tool calling (without the text tool protocol)
 
-        return system_prompt
+        Returns:
+            Complete system prompt with context
+        """
+        return "\n".join(message["content"] for message in self._build_system_messages(native_tools))
 
     def send_message(self, user_message: str, model_type: str = "chat") -> Generator[Dict[str, Any], None, None]:
         """
@@ -225,7 +313,8 @@ class ConversationManager:
             model_type: "chat" or "reasoning"
 
         Yields:
-            Dicts with status updates, partial responses, or the final response.
+            Dicts with status updates, partial responses ("delta" chunks of text while
+            streaming), or the final response.
         """
         # Validate input
         validation_result = self._validate_input(user_message)
@@ -233,22 +322,34 @@ class ConversationManager:
             yield self._handle_validation_error(validation_result)
             return
 
-        # Capture context before processing (for tracking)
+        # Join point: let the previous turn's background context update land first,
+        # so the context captured for tracking and the prompt built below include it
+        if self.context_manager:
+            self.context_manager.wait_for_pending_update()
+
         context_before = self.context_manager.get_context_for_prompt() if self.context_manager else ""
 
+        # One retry budget for the whole turn, so a failing turn reaches the user quickly
+        self.retry_budget = RetryBudget()
+
         try:
             # Yield initial status
             yield {"type": "status", "content": "Thinking..."}
 
             # Prepare for API Call: creates dynamic system prompt, adds messages history and checks for edit/retry mode
-            messages_for_api, is_retry_or_edit = self._prepare_api_messages(user_message)
+            native_tools = self._use_native_tools(model_type)
+            messages_for_api, is_retry_or_edit = self._prepare_api_messages(user_message, native_tools, model_type)
 
-            # Get initial response from model
-            initial_result = self.client.chat(
-                messages=messages_for_api,
-                model_type=model_type,
-                response_type="chat"
-            )
+            # Get initial response from model (streamed as "delta" updates when enabled);
+            # tools start as soon as their blocks close, keyed by their index in the response
+            started_tools = {}
+            initial_result = yield from self._request_chat_completion(messages_for_api, model_type, started_tools,
+                                                                      "auto" if native_tools else None)
+
+            if not initial_result["success"] and native_tools and not self._use_native_tools(model_type):
+                # The model rejected the tools parameter: ask again using the text protocol
+                messages_for_api, is_retry_or_edit = self._prepare_api_messages(user_message, model_type=model_type)
+                initial_result = yield from self._request_chat_completion(messages_for_api, model_type, started_tools)
 
             if not initial_result["success"]:
                 yield from self._handle_api_error(initial_result, user_message, context_before)
@@ -256,7 +357,7 @@ class ConversationManager:
 
             # Process Response and Handle Tools
             initial_response = initial_result["content"]
-            tool_info = self._parse_tool_usage(initial_response)
+            tool_info = self._extract_tool_info(initial_result)
 
             # Yield any text that comes before a tool is used
             if tool_info["cleaned_response"]:
@@ -269,32 +370,26 @@ class ConversationManager:
                     initial_response_text=initial_response,
                     initial_api_result=initial_result,
                     messages_for_api=messages_for_api,
-                    model_type=model_type
+                    model_type=model_type,
+                    started_tools=started_tools
                 )
             else:
                 # No tool was used
-                response_data = {
-                    "assistant_response": initial_response,
-                    "model_used": initial_result["model_used"],
-                    "usage_info": initial_result.get("usage")
-                }
+                response_data = self._response_data(initial_response, initial_result)
                 yield {"type": "response", "content": initial_response}
 
             # Update conversation history (without system message)
             # Avoid duplicating user message on retry/edit
-            yield from self._update_conversation_context(
-                user_message, response_data["assistant_response"], is_retry_or_edit
+            pending_context = self._update_conversation_context(
+                user_message, response_data["assistant_response"], is_retry_or_edit, model_type
             )
 
-            # Capture context after processing (for tracking)
-            context_after = self.context_manager.get_context_for_prompt() if self.context_manager else ""
-
             yield from self._finalize_and_track_response(
                 response_data=response_data,
                 tool_info=tool_info,
                 user_message=user_message,
                 context_before=context_before,
-                context_after=context_after
+                pending_context=pending_context
             )
 
 
@@ -302,10 +397,128 @@ class ConversationManager:
             yield from self._handle_unexpected_error(e, user_message, context_before)
 
     # ========== HELPERS for send_message method =====================
-    def _prepare_api_messages(self, user_message: str) -> tuple[list[dict], bool]:
+    def _request_chat_completion(self, messages_for_api: list, model_type: str, started_tools: Dict[int, Future] = None,
+                                 tool_choice: str = None) -> Generator[Dict, None, Dict]:
+        """
+        Requests a chat completion, streaming visible text as "delta" updates when enabled.
+
+        Anything from the first tool block onwards is held back: it is replaced by the
+        interim response and the tool results once the stream completes.
+
+        Args:
+            started_tools: If given, each tool block is started as soon as it closes, while the
+                model keeps generating; its future is stored here under the block's index.
+                Generation also stops after the last tool block (see Config.STOP_AFTER_TOOL_BLOCKS)
+            tool_choice: If given, the tools are declared for native tool calling with this tool_choice
+
+        Returns:
+            The result dict from the client, same shape as OpenRouterClient.chat()
+        """
+        tools = TOOL_DEFINITIONS if tool_choice else None
+        if not Config.STREAM_RESPONSES:
+            return self.client.chat(messages_for_api, model_type=model_type, response_type="chat",
+                                    retry_budget=self.retry_budget, tools=tools, tool_choice=tool_choice)
+
+        parser = ToolBlockParser()
+        stream = self.client.chat_stream(messages_for_api, model_type=model_type, response_type="chat",
+                                         retry_budget=self.retry_budget,
+                                         stop_when=self._tool_stop_condition(parser, started_tools),
+                                         tools=tools, tool_choice=tool_choice)
+        emitted_length = 0
+
+        while True:
+            try:
+                closed_tools = parser.feed(next(stream))
+            except StopIteration as stop:
+                return self._clip_stopped_reply(parser, stop.value)
+
+            if closed_tools and started_tools is not None:
+                self._start_tools_early(parser, closed_tools, started_tools)
+
+            update, emitted_length = self._delta_update(parser, emitted_length)
+            if update:
+                yield update
+
+    def _delta_update(self, parser: ToolBlockParser, emitted_length: int) -> tuple[Optional[dict], int]:
+        """The "delta" update for text that became visible since emitted_length (None if none), and the new length."""
+        visible_length = parser.visible_length
+        if visible_length <= emitted_length:
+            return None, emitted_length
+        return {"type": "delta", "content": parser.text[emitted_length:visible_length]}, visible_length
+
+    def _clip_stopped_reply(self, parser: ToolBlockParser, result: dict) -> dict:
+        """
+        Drops the clipped text after the tool blocks from a reply that stop_when ended (the chunk that
+        tripped it carries the start of text the model never finished). The planner's block ends the reply.
+        """
+        if not result.get("success") or result.get("finish_reason") != "stop_when" or not parser.block_ends:
+            return result
+        planner_index = next((index for index, tool_data in enumerate(parser.tools)
+                              if tool_data.get("Tool") == "Deep_Planning"), None)
+        end = parser.block_ends[-1 if planner_index is None else planner_index]
+        return {**result, "content": parser.text[:end]}
+
+    def _tool_stop_condition(self, parser: ToolBlockParser, started_tools: Optional[dict]):
+        """Returns the stop_when check that ends generation after the last tool block, or None if disabled."""
+        if started_tools is None or not Config.STOP_AFTER_TOOL_BLOCKS:
+            return None
+        return lambda: self._tool_blocks_complete(parser)
+
+    def _tool_blocks_complete(self, parser: ToolBlockParser) -> bool:
+        """
+        Whether the reply is done with tool calls, so anything it writes next would be thrown away.
+        The planner ends the turn on its own, so its block is always the last one that matters.
+        """
+        if not parser.tools or parser.in_block:
+            return False
+        return parser.tools[-1].get("Tool") == "Deep_Planning" or parser.past_last_block
+
+    def _start_tools_early(self, parser: ToolBlockParser, closed_tools: list, started_tools: Dict[int, Future]):
+        """Starts the tools of just-closed blocks in worker threads, keyed by their index in the response."""
+        for index, tool_data in self._tools_to_start_early(parser, closed_tools):
+            if tool_data["Tool"] == "Weather":
+                started_tools[index] = _tool_executor.submit(self._execute_weather_tool, tool_data)
+            else:
+                started_tools[index] = _planner_executor.submit(self._execute_planner_tool, tool_data)
+
+    def _tools_to_start_early(self, parser: ToolBlockParser, closed_tools: list) -> List[tuple[int, dict]]:
+        """The just-closed blocks worth starting while the reply streams, with their index in the response."""
+        first_index = len(parser.tools) - len(closed_tools)
+        to_start = []
+        for index, tool_data in enumerate(closed_tools, start=first_index):
+            tool_name = tool_data.get("Tool")
+            if tool_name == "Weather" or (tool_name == "Deep_Planning" and not self._planner_started(parser, index)):
+                print(f"⚡ Started {tool_name} tool while the reply is still streaming")
+                to_start.append((index, tool_data))
+        return to_start
+
+    def _planner_started(self, parser: ToolBlockParser, index: int) -> bool:
+        """Whether an earlier block already called the planner (it only runs once per response)."""
+        return any(tool_data.get("Tool") == "Deep_Planning" for tool_data in parser.tools[:index])
+
+    def _use_native_tools(self, model_type: str) -> bool:
+        """Whether to declare tools through the API: configured, and supported by the primary and backup model."""
+        if not Config.NATIVE_TOOL_CALLING:
+            return False
+        models = [Config.get_model(model_type), Config.get_model(model_type, backup=True)]
+        return all(supports_tool_calling(model) for model in models)
+
+    def _extract_tool_info(self, result: dict) -> Dict[str, Any]:
+        """Tool info from the model's native tool calls if it made any, else parsed from the text protocol."""
+        if not result.get("tool_calls"):
+            return self._parse_tool_usage(result["content"])
+        return {
+            "has_tool": True,
+            "cleaned_response": result["content"].strip(),
+            "tools": tool_calls_to_tools(result["tool_calls"]),
+            "tool_calls": result["tool_calls"]
+        }
+
+    def _prepare_api_messages(self, user_message: str, native_tools: bool = False,
+                              model_type: str = "chat") -> tuple[list[dict], bool]:
         """Prepares the list of messages for the API call and checks for retry/edit."""
 
-        dynamic_system_prompt = self._build_dynamic_system_prompt()
+        system_messages = self._build_system_messages(native_tools)
 
         is_retry_or_edit = (
                 self.conversation_history and
@@ -313,7 +526,7 @@ class ConversationManager:
                 self.conversation_history[-1]["content"] == user_message
         )
 
-        messages = [{"role": "system", "content": dynamic_system_prompt}] + self.conversation_history
+        messages = system_messages + self._history_for_prompt(model_type)
         if not is_retry_or_edit:
             messages.append({"role": "user", "content": user_message})
 
@@ -336,19 +549,20 @@ class ConversationManager:
             "model_used": result.get("model_used"),
             "conversation_length": len(self.conversation_history)
         }
-        if self.tracker:
-            self.tracker.track_message_exchange(
-                user_message=user_message, response_data=error_response,
-                context_before=context_before, context_after=context_before
-            )
+        self._track_exchange(user_message, error_response, context_before, context_before)
         yield error_response
 
     def _handle_tool_usage(self, tool_info: dict, initial_response_text: str, initial_api_result: dict,
-                           messages_for_api: list, model_type: str) -> Generator[Dict, None, Dict]:
+                           messages_for_api: list, model_type: str,
+                           started_tools: Dict[int, Future] = None) -> Generator[Dict, None, Dict]:
         """Handles the logic for executing tool(s) and getting an enriched response."""
 
-        # Get all tools to execute
+        # Get all tools to execute (some may already be running, started while the reply streamed)
         tools = tool_info.get("tools", [])
+        started_tools = started_tools or {}
+
+        # Weather lookups run concurrently; their results are read back below in tool order
+        weather_results = yield from self._run_weather_tools(tools, started_tools)
 
         # Execute all tools and collect results
         all_tool_results = []
@@ -359,27 +573,8 @@ class ConversationManager:
 
             # --- Weather Tool Logic ---
             if tool_name == "Weather":
-                location = tool_data.get('Location', 'Unknown')
-                yield {"type": "status", "content": f"🌤️ Checking weather for {location}... ({i + 1}/{len(tools)})", "tool_name": "Weather"}
-
-                weather_result = self._execute_weather_tool(tool_data)
-
-                if weather_result["success"]:
-                    yield {"type": "tool_success", "content": f"✓ Weather data retrieved for {location}", "tool_name": "Weather"}
-                    all_tool_results.append({
-                        "tool": "Weather",
-                        "success": True,
-                        "location": location,
-                        "data": weather_result['data']
-                    })
-                else:
-                    yield {"type": "tool_error", "content": f"✗ Weather unavailable for {location}"}
-                    all_tool_results.append({
-                        "tool": "Weather",
-                        "success": False,
-                        "location": location,
-                        "error": weather_result['data']
-                    })
+                all_tool_results.append(weather_results[i])
+                if not weather_results[i]["success"]:
                     all_tools_successful = False
 
             # --- Deep Planning Tool Logic ---
@@ -387,116 +582,257 @@ class ConversationManager:
                 # For planning tool, we typically only have one call
                 yield {"type": "status", "content": "Reasoning for a detailed plan...", "tool_name": "Planning"}
 
-                planner_result = self._execute_planner_tool(tool_data)
+                if i in started_tools:
+                    planner_result = started_tools[i].result()
+                else:
+                    planner_result = self._execute_planner_tool(tool_data)
 
                 if planner_result["success"]:
                     yield {"type": "tool_success", "content": "✅ Detailed plan created"}
-
                     # For planning tool, return immediately with the plan
-                    final_content = planner_result["data"]
-                    yield {"type": "response", "content": final_content}
-
-                    full_content = planner_result.get("full_output", final_content)
-                    history_marker = "\n\n---\n🧠 **Detailed plan generated using reasoning model**\n---\n\n"
-                    combined_response = tool_info["cleaned_response"] + history_marker + full_content
-
-                    return {
-                        "assistant_response": combined_response,
-                        "model_used": planner_result.get("model_used", initial_api_result["model_used"]),
-                        "usage_info": initial_api_result.get("usage")
-                    }
+                    yield {"type": "response", "content": planner_result["data"]}
+                    return self._planner_response(tool_info, tool_data, planner_result, initial_api_result)
                 else:
                     yield {"type": "tool_error", "content": "⚠️ Planning failed"}
-                    all_tool_results.append({
-                        "tool": "Deep_Planning",
-                        "success": False,
-                        "error": planner_result.get('error', 'Unknown error')
-                    })
+                    all_tool_results.append(self._failed_planner_entry(planner_result))
+                    all_tools_successful = False
+
+            # --- Plan Details Tool Logic (reads a stored plan back) ---
+            elif tool_name == "Plan_Details":
+                plan_result = self._execute_plan_details_tool(tool_data)
+                yield self._plan_details_update(plan_result)
+                all_tool_results.append(plan_result)
+                if not plan_result["success"]:
                     all_tools_successful = False
 
             # --- Unknown Tool ---
             else:
-                yield {"type": "tool_error", "content": f"⚠️ Unknown tool: {tool_name or 'Unknown'}"}
-                print(f"⚠️ Unknown tool requested: {tool_name}")
-                all_tool_results.append({
-                    "tool": tool_name or "Unknown",
-                    "success": False,
-                    "error": "Unknown tool"
-                })
+                update, entry = self._unknown_tool_result(tool_name)
+                yield update
+                all_tool_results.append(entry)
                 all_tools_successful = False
 
-        # Process results for Weather tools (multiple locations possible)
-        if all_tool_results and all_tool_results[0].get("tool") == "Weather":
-            # Build combined weather data string
-            combined_weather_data = "Tool execution results:\n\n"
+        # Process results for Weather tools (multiple locations possible) and plan lookups
+        if all_tool_results and all_tool_results[0].get("tool") in self.FOLLOWUP_TOOLS:
+            followup_tool = all_tool_results[0]["tool"]
+            followup_messages, history_marker = self._build_tool_followup_messages(
+                tool_info, initial_response_text, all_tool_results, all_tools_successful
+            )
 
-            for result in all_tool_results:
-                if result["success"]:
-                    combined_weather_data += f"Weather data for {result['location']}:\n{result['data']}\n\n"
-                else:
-                    combined_weather_data += f"Weather lookup failed for {result['location']}: {result['error']}\n\n"
+            # Re-call LLM with all tool results
+            yield {"type": "status", "content": self.FOLLOWUP_TOOLS[followup_tool]["status"], "tool_name": followup_tool}
 
-            # Prepare system prompt based on success
-            if all_tools_successful:
-                system_prompt = f"{combined_weather_data}\nHere are the weather results for your earlier requests. Now please complete your previous response."
-                history_marker = f"\n\n---\n🌤️ **Weather data checked for {len(all_tool_results)} location(s)**\n---\n\n"
-            else:
-                system_prompt = f"{combined_weather_data}\nProvide helpful travel advice incorporating the available weather data and general advice for locations where weather data was unavailable."
-                history_marker = f"\n\n---\n⚠️ **Weather data partially retrieved ({sum(1 for r in all_tool_results if r['success'])}/{len(all_tool_results)} locations)**\n---\n\n"
+            enriched_messages = messages_for_api + followup_messages
 
-            # Re-call LLM with all tool results
-            yield {"type": "status", "content": "Interpreting weather data...", "tool_name": "Weather"}
+            final_result = yield from self._request_chat_completion(
+                enriched_messages, model_type, tool_choice="none" if tool_info.get("tool_calls") else None
+            )
 
-            enriched_messages = messages_for_api + [
-                {"role": "assistant", "content": initial_response_text},
-                {"role": "system", "content": system_prompt}
-            ]
-
-            final_result = self.client.chat(enriched_messages, model_type=model_type, response_type="chat")
-
-            if final_result["success"]:
-                final_content = final_result["content"]
-                yield {"type": "response", "content": final_content}
-                combined_response = tool_info["cleaned_response"] + history_marker + final_content
-                return {
-                    "assistant_response": combined_response,
-                    "model_used": final_result["model_used"],
-                    "usage_info": final_result.get("usage")
-                }
-            else:
-                # Fallback if the second LLM call fails
-                yield {"type": "tool_error", "content": "⚠️ Could not process weather data"}
-                fallback_response = tool_info[
-                                        "cleaned_response"] + "\n\n---\n⚠️ **Weather data retrieved but processing failed**\n---"
-                return {
-                    "assistant_response": fallback_response,
-                    "model_used": initial_api_result["model_used"],
-                    "usage_info": initial_api_result.get("usage")
-                }
+            update, response_data = self._followup_response(tool_info, history_marker, followup_tool,
+                                                            final_result, initial_api_result)
+            yield update
+            return response_data
 
         # Fallback for other cases
+        return self._response_data(tool_info["cleaned_response"], initial_api_result)
+
+    def _response_data(self, assistant_response: str, api_result: dict, model_used: str = None) -> Dict[str, Any]:
+        """The turn's response data: what goes into the history, and the model and usage to report."""
         return {
-            "assistant_response": tool_info["cleaned_response"],
-            "model_used": initial_api_result["model_used"],
-            "usage_info": initial_api_result.get("usage")
+            "assistant_response": assistant_response,
+            "model_used": model_used or api_result["model_used"],
+            "usage_info": api_result.get("usage")
         }
 
-    def _update_conversation_context(self, user_message: str, assistant_response: str, is_retry_or_edit: bool):
-        """Updates and trims conversation history and context manager."""
+    def _planner_response(self, tool_info: dict, tool_data: dict, planner_result: dict,
+                          initial_api_result: dict) -> Dict[str, Any]:
+        """Stores a successful plan and builds the turn's response data around it."""
+        final_content = planner_result["data"]
+        full_content = planner_result.get("full_output", final_content)
+        history_marker = "\n\n---\n🧠 **Detailed plan generated using reasoning model**\n---\n\n"
+        self._store_plan(final_content, full_content, tool_data)
+        return self._response_data(tool_info["cleaned_response"] + history_marker + full_content, initial_api_result,
+                                   model_used=planner_result.get("model_used"))
+
+    def _failed_planner_entry(self, planner_result: dict) -> Dict[str, Any]:
+        """The follow-up prompt's entry for a failed planner call."""
+        return {"tool": "Deep_Planning", "success": False, "error": planner_result.get('error', 'Unknown error')}
+
+    def _unknown_tool_result(self, tool_name: Optional[str]) -> tuple[dict, dict]:
+        """The UI update and follow-up prompt entry for a tool the assistant doesn't have."""
+        print(f"⚠️ Unknown tool requested: {tool_name}")
+        update = {"type": "tool_error", "content": f"⚠️ Unknown tool: {tool_name or 'Unknown'}"}
+        return update, {"tool": tool_name or "Unknown", "success": False, "error": "Unknown tool"}
+
+    def _followup_response(self, tool_info: dict, history_marker: str, followup_tool: str, final_result: dict,
+                           initial_api_result: dict) -> tuple[dict, Dict[str, Any]]:
+        """The UI update and the turn's response data once the model answered (or failed to) with the tool results."""
+        if final_result["success"]:
+            final_content = final_result["content"]
+            return ({"type": "response", "content": final_content},
+                    self._response_data(tool_info["cleaned_response"] + history_marker + final_content, final_result))
+
+        # Fallback if the second LLM call fails
+        subject = self.FOLLOWUP_TOOLS[followup_tool]["subject"]
+        fallback_response = tool_info["cleaned_response"] + f"\n\n---\n⚠️ **{subject.capitalize()} retrieved but processing failed**\n---"
+        return ({"type": "tool_error", "content": f"⚠️ Could not process {subject}"},
+                self._response_data(fallback_response, initial_api_result))
+
+    def _run_weather_tools(self, tools: list,
+                           started_tools: Dict[int, Future] = None) -> Generator[Dict, None, Dict[int, dict]]:
+        """
+        Runs every Weather call concurrently, yielding an update as each finishes; returns results by tool index.
+        Calls already in started_tools are awaited rather than started again.
+        """
+        weather_calls = {i: tool_data for i, tool_data in enumerate(tools) if tool_data.get("Tool") == "Weather"}
+        if not weather_calls:
+            return {}
+
+        yield self._weather_status_update(weather_calls)
+
+        started_tools = started_tools or {}
+        futures = {started_tools[i] if i in started_tools else _tool_executor.submit(self._execute_weather_tool, tool_data): i
+                   for i, tool_data in weather_calls.items()}
+        results = {}
+        for future in as_completed(futures):
+            i = futures[future]
+            update, results[i] = self._summarize_weather_result(weather_calls[i], self._weather_future_result(future))
+            yield update
+        return results
+
+    def _weather_status_update(self, weather_calls: Dict[int, dict]) -> Dict[str, str]:
+        """Builds the status update announcing the weather lookups."""
+        locations = [tool_data.get('Location', 'Unknown') for tool_data in weather_calls.values()]
+        if len(locations) == 1:
+            content = f"🌤️ Checking weather for {locations[0]}..."
+        else:
+            content = f"🌤️ Checking weather for {len(locations)} locations: {', '.join(locations)}..."
+        return {"type": "status", "content": content, "tool_name": "Weather"}
+
+    def _weather_future_result(self, future) -> Dict[str, Any]:
+        """The result of a finished weather lookup (thread or asyncio future), with a failure turned into a result."""
+        try:
+            return future.result()
+        except Exception as e:
+            return {"success": False, "data": f"Weather lookup failed: {str(e)}"}
+
+    def _summarize_weather_result(self, tool_data: dict, weather_result: dict) -> tuple[dict, dict]:
+        """Turns one weather lookup into its UI update and its entry for the follow-up prompt."""
+        location = tool_data.get('Location', 'Unknown')
+        if weather_result["success"]:
+            update = {"type": "tool_success", "content": f"✓ Weather data retrieved for {location}", "tool_name": "Weather"}
+            entry = {"tool": "Weather", "success": True, "location": location, "data": weather_result['data']}
+        else:
+            update = {"type": "tool_error", "content": f"✗ Weather unavailable for {location}"}
+            entry = {"tool": "Weather", "success": False, "location": location, "error": weather_result['data']}
+        return update, entry
+
+    def _store_plan(self, final_plan: str, full_content: str, tool_data: dict):
+        """Keeps a planner result in the plan store, so the history carries its digest instead."""
+        if Config.COMPACT_PLANS_IN_HISTORY:
+            self.plan_store.add(final_plan, full_content, tool_data.get("Prompt", ""))
+
+    def _execute_plan_details_tool(self, tool_data: Dict[str, str]) -> Dict[str, Any]:
+        """Executes the Plan_Details tool: looks up a stored plan (no API call)."""
+        return {"tool": "Plan_Details", **self.plan_store.lookup(tool_data.get("Plan_Id", ""))}
+
+    def _plan_details_update(self, plan_result: dict) -> Dict[str, str]:
+        """Builds the UI update for a Plan_Details lookup."""
+        if plan_result["success"]:
+            return {"type": "tool_success", "content": f"✓ Retrieved {plan_result['plan_id']}", "tool_name": "Plan_Details"}
+        return {"type": "tool_error", "content": "✗ Stored plan not found"}
+
+    def _build_tool_followup_messages(self, tool_info: dict, initial_response_text: str, all_tool_results: list,
+                                      all_tools_successful: bool) -> tuple[list, str]:
+        """Builds the messages handing the tool results back to the model, and the history marker."""
+        if not tool_info.get("tool_calls"):
+            system_prompt, history_marker = self._build_tool_followup(all_tool_results, all_tools_successful)
+            return [
+                {"role": "assistant", "content": initial_response_text},
+                {"role": "system", "content": system_prompt}
+            ], history_marker
+
+        # Native tool calls: each result answers its call in a tool message, the instruction follows
+        instruction, history_marker = self._build_tool_followup(all_tool_results, all_tools_successful,
+                                                                include_results=False)
+        messages = build_tool_result_messages(tool_info["cleaned_response"], tool_info["tool_calls"], all_tool_results)
+        return messages + [{"role": "system", "content": instruction}], history_marker
+
+    def _build_tool_followup(self, all_tool_results: list, all_tools_successful: bool,
+                             include_results: bool = True) -> tuple[str, str]:
+        """Builds the follow-up system prompt (optionally without the results) and the history marker for tool results."""
+        # Build combined weather data string
+        combined_results = "Tool execution results:\n\n" if include_results else ""
+
+        for result in all_tool_results if include_results else []:
+            if result["tool"] == "Plan_Details":
+                if result["success"]:
+                    combined_results += f"Full text of {result['plan_id']}:\n{result['data']}\n\n"
+                else:
+                    combined_results += f"Plan lookup failed: {result['error']}\n\n"
+            elif result["success"]:
+                combined_results += f"Weather data for {result['location']}:\n{result['data']}\n\n"
+            else:
+                combined_results += f"Weather lookup failed for {result['location']}: {result['error']}\n\n"
+
+        # Prepare system prompt based on success
+        if all(result["tool"] == "Plan_Details" for result in all_tool_results):
+            system_prompt = f"{combined_results}\nHere is the plan you asked for. Now please answer the user's question using it, without repeating the whole plan."
+            history_marker = "\n\n---\n📋 **Stored plan consulted**\n---\n\n"
+        elif all_tools_successful:
+            system_prompt = f"{combined_results}\nHere are the weather results for your earlier requests. Now please complete your previous response."
+            history_marker = f"\n\n---\n🌤️ **Weather data checked for {len(all_tool_results)} location(s)**\n---\n\n"
+        else:
+            system_prompt = f"{combined_results}\nProvide helpful travel advice incorporating the available weather data and general advice for locations where weather data was unavailable."
+            history_marker = f"\n\n---\n⚠️ **Weather data partially retrieved ({sum(1 for r in all_tool_results if r['success'])}/{len(all_tool_results)} locations)**\n---\n\n"
+
+        return system_prompt, history_marker
+
+    def _history_for_prompt(self, model_type: str = "chat") -> List[Dict[str, str]]:
+        """The history as sent to the model: the running summary (if any) and the recent turns, within budget."""
+        if not Config.HISTORY_SUMMARY_ENABLED:
+            return self.conversation_history
+        return self.history_summarizer.messages_for_prompt(self.conversation_history,
+                                                           Config.get_history_token_budget(model_type))
+
+    def _update_conversation_context(self, user_message: str, assistant_response: str, is_retry_or_edit: bool,
+                                     model_type: str = "chat") -> Optional[Future]:
+        """Updates and trims conversation history, and starts the context update (and summary fold) in the background."""
+        self._append_to_history(user_message, assistant_response, is_retry_or_edit, model_type)
+        if Config.HISTORY_SUMMARY_ENABLED:
+            self.history_summarizer.fold_in_background(self.conversation_history,
+                                                       Config.get_history_token_budget(model_type))
+
+        if not self.context_manager:
+            return None
+        # Not awaited here: the next turn joins on it at its start
+        return self.context_manager.update_context_in_background(self.conversation_history)
+
+    def _append_to_history(self, user_message: str, assistant_response: str, is_retry_or_edit: bool,
+                           model_type: str = "chat"):
+        """Appends the finished exchange to the conversation history (trimmed to the model's token budget, or past the summarized turns)."""
+        # Avoid duplicating user message on retry/edit
         if not is_retry_or_edit:
             self.conversation_history.append({"role": "user", "content": user_message})
-        self.conversation_history.append({"role": "assistant", "content": assistant_response})
+        # Stored plans go in as their digest; the model reads them back with the Plan_Details tool
+        self.conversation_history.append({"role": "assistant", "content": self.plan_store.compact(assistant_response)})
 
-        if len(self.conversation_history) > Config.MAX_CONVERSATION_HISTORY:
-            self.conversation_history = self.conversation_history[-Config.MAX_CONVERSATION_HISTORY:]
+        if Config.HISTORY_SUMMARY_ENABLED:
+            # The prompt gets the summary of the oldest turns instead (see _history_for_prompt); they are only
+            # stored until no retry/edit can step back past the summary
+            self.conversation_history = self.history_summarizer.compact(self.conversation_history)
+            return
 
-        if self.context_manager:
-            yield {"type": "context_update"}
-            self.context_manager.update_context(self.conversation_history)
+        # Drop whole turns (oldest first): a long planner reply costs as much as many short turns
+        self.conversation_history = trim_history_to_budget(self.conversation_history,
+                                                           Config.get_history_token_budget(model_type))
 
     def _finalize_and_track_response(self, response_data: dict, tool_info: dict, user_message: str, context_before: str,
-                                     context_after: str) -> Generator[Dict, None, None]:
-        """Builds the final response dict, tracks the exchange, and yields it."""
+                                     pending_context=None) -> Generator[Dict, None, None]:
+        """
+        Builds the final response dict, tracks the exchange, and yields it.
+        The tracked context_after is filled in once the background context update (pending_context) finishes.
+        """
         final_response = {
             "type": "final_response",
             "success": True,
@@ -507,18 +843,21 @@ class ConversationManager:
             "tool_used": tool_info["has_tool"]
         }
 
-        if self.tracker:
-            tracking_data = final_response.copy()
-            tracking_data["response"] = tracking_data["content"]
-            self.tracker.track_message_exchange(
-                user_message=user_message,
-                response_data=tracking_data,
-                context_before=context_before,
-                context_after=context_after
-            )
+        self._track_exchange(user_message, {**final_response, "response": final_response["content"]},
+                             context_before, context_before)
+        if pending_context is not None and self.tracker:
+            # Registered after tracking, so the turn exists even if the update already finished
+            turn = self.tracker.get_current_session_info().get("turns_tracked")
+            pending_context.add_done_callback(lambda future: self._track_context_after(turn, future))
 
         yield final_response
 
+    def _track_context_after(self, turn: Optional[int], future):
+        """Records the result of a background context update against the turn that started it."""
+        if turn is None or future.cancelled() or future.exception() or future.result() is None:
+            return
+        self.tracker.update_context_after(turn, future.result())
+
     def _handle_unexpected_error(self, e: Exception, user_message: str, context_before: str) -> Generator[
         Dict, None, None]:
         """Handles any unexpected exception, tracks it, and yields the error."""
@@ -528,13 +867,288 @@ class ConversationManager:
             "type": "error", "success": False, "content": error_msg,
             "error": str(e), "conversation_length": len(self.conversation_history)
         }
-        if self.tracker:
-            self.tracker.track_message_exchange(
-                user_message=user_message, response_data=error_response,
-                context_before=context_before, context_after=context_before
-            )
+        self._track_exchange(user_message, error_response, context_before, context_before)
         yield error_response
+
+    def _track_exchange(self, user_message: str, response_data: Dict[str, Any], context_before: str,
+                        context_after: str):
+        """Records an exchange with the tracker (if any), adding the client's response-cache counters."""
+        if not self.tracker:
+            return
+        self.tracker.track_message_exchange(
+            user_message=user_message,
+            response_data={**response_data, "response_cache": self.client.get_cache_stats()},
+            context_before=context_before,
+            context_after=context_after
+        )
     # ============= end of send_message HELPERS =====================
+
+    # ========== ASYNC twin of send_message =====================
+    async def send_message_async(self, user_message: str, model_type: str = "chat") -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Async-generator twin of send_message, for serving many sessions from one event loop.
+        Yields exactly the same updates as send_message.
+
+        LLM calls go through the injected AsyncOpenRouterClient; weather lookups use blocking
+        HTTP and therefore run in worker threads.
+
+        Args:
+            user_message: The user's message/question to send to the travel assistant
+            model_type: "chat" or "reasoning"
+
+        Yields:
+            Dicts with status updates, partial responses, or the final response.
+        """
+        if not self.async_client:
+            raise ValueError("No async client configured - pass async_client to ConversationManager")
+
+        # Validate input
+        validation_result = self._validate_input(user_message)
+        if not validation_result["valid"]:
+            yield self._handle_validation_error(validation_result)
+            return
+
+        # Let the previous turn's background context update land first (so the prompt build won't block)
+        if self.context_manager:
+            await self.context_manager.wait_for_pending_update_async()
+
+        # Capture context before processing (for tracking)
+        context_before = self.context_manager.get_context_for_prompt() if self.context_manager else ""
+
+        # One retry budget for the whole turn, so a failing turn reaches the user quickly
+        self.retry_budget = RetryBudget()
+
+        try:
+            yield {"type": "status", "content": "Thinking..."}
+
+            native_tools = self._use_native_tools(model_type)
+            messages_for_api, is_retry_or_edit = self._prepare_api_messages(user_message, native_tools, model_type)
+
+            # Async generators cannot return values, so helpers fill in a result dict instead
+            initial_result = {}
+            started_tools = {}
+            async for update in self._request_chat_completion_async(messages_for_api, model_type, initial_result,
+                                                                    started_tools, "auto" if native_tools else None):
+                yield update
+
+            if not initial_result["success"] and native_tools and not self._use_native_tools(model_type):
+                messages_for_api, is_retry_or_edit = self._prepare_api_messages(user_message, model_type=model_type)
+                initial_result = {}
+                async for update in self._request_chat_completion_async(messages_for_api, model_type, initial_result,
+                                                                        started_tools):
+                    yield update
+
+            if not initial_result["success"]:
+                for update in self._handle_api_error(initial_result, user_message, context_before):
+                    yield update
+                return
+
+            initial_response = initial_result["content"]
+            tool_info = self._extract_tool_info(initial_result)
+
+            if tool_info["cleaned_response"]:
+                yield {"type": "interim_response", "content": tool_info["cleaned_response"]}
+
+            response_data = {}
+            if tool_info["has_tool"]:
+                async for update in self._handle_tool_usage_async(
+                    tool_info=tool_info,
+                    initial_response_text=initial_response,
+                    initial_api_result=initial_result,
+                    messages_for_api=messages_for_api,
+                    model_type=model_type,
+                    response_data=response_data,
+                    started_tools=started_tools
+                ):
+                    yield update
+            else:
+                response_data.update(self._response_data(initial_response, initial_result))
+                yield {"type": "response", "content": initial_response}
+
+            self._append_to_history(user_message, response_data["assistant_response"], is_retry_or_edit, model_type)
+            if Config.HISTORY_SUMMARY_ENABLED:
+                self.history_summarizer.fold_in_background_async(self.conversation_history,
+                                                                 Config.get_history_token_budget(model_type))
+
+            pending_context = None
+            if self.context_manager:
+                pending_context = self.context_manager.update_context_in_background_async(self.conversation_history)
+
+            for update in self._finalize_and_track_response(
+                response_data=response_data,
+                tool_info=tool_info,
+                user_message=user_message,
+                context_before=context_before,
+                pending_context=pending_context
+            ):
+                yield update
+
+        except Exception as e:
+            for update in self._handle_unexpected_error(e, user_message, context_before):
+                yield update
+
+    async def _request_chat_completion_async(self, messages_for_api: list, model_type: str,
+                                             result: Dict[str, Any],
+                                             started_tools: Dict[int, asyncio.Future] = None,
+                                             tool_choice: str = None) -> AsyncGenerator[Dict, None]:
+        """Async twin of _request_chat_completion; the client result is written into `result`."""
+        tools = TOOL_DEFINITIONS if tool_choice else None
+        if not Config.STREAM_RESPONSES:
+            result.update(await self.async_client.chat(messages_for_api, model_type=model_type, response_type="chat",
+                                                       retry_budget=self.retry_budget, tools=tools,
+                                                       tool_choice=tool_choice))
+            return
+
+        parser = ToolBlockParser()
+        emitted_length = 0
+
+        async for item in self.async_client.chat_stream(messages_for_api, model_type=model_type, response_type="chat",
+                                                        retry_budget=self.retry_budget,
+                                                        stop_when=self._tool_stop_condition(parser, started_tools),
+                                                        tools=tools, tool_choice=tool_choice):
+            # The stream ends with the result dict
+            if isinstance(item, dict):
+                result.update(self._clip_stopped_reply(parser, item))
+                continue
+
+            closed_tools = parser.feed(item)
+            if closed_tools and started_tools is not None:
+                self._start_tools_early_async(parser, closed_tools, started_tools)
+
+            update, emitted_length = self._delta_update(parser, emitted_length)
+            if update:
+                yield update
+
+    def _start_tools_early_async(self, parser: ToolBlockParser, closed_tools: list,
+                                 started_tools: Dict[int, asyncio.Future]):
+        """Async twin of _start_tools_early: weather runs in worker threads, the planner as a task."""
+        loop = asyncio.get_running_loop()
+        for index, tool_data in self._tools_to_start_early(parser, closed_tools):
+            if tool_data["Tool"] == "Weather":
+                started_tools[index] = loop.run_in_executor(_tool_executor, self._execute_weather_tool, tool_data)
+            else:
+                started_tools[index] = asyncio.create_task(self._execute_planner_tool_async(tool_data))
+
+    async def _handle_tool_usage_async(self, tool_info: dict, initial_response_text: str, initial_api_result: dict,
+                                       messages_for_api: list, model_type: str,
+                                       response_data: Dict[str, Any],
+                                       started_tools: Dict[int, asyncio.Future] = None) -> AsyncGenerator[Dict, None]:
+        """Async twin of _handle_tool_usage; the enriched response is written into `response_data`."""
+        tools = tool_info.get("tools", [])
+        started_tools = started_tools or {}
+
+        weather_results = {}
+        async for update in self._run_weather_tools_async(tools, weather_results, started_tools):
+            yield update
+
+        all_tool_results = []
+        all_tools_successful = True
+
+        for i, tool_data in enumerate(tools):
+            tool_name = tool_data.get("Tool")
+
+            if tool_name == "Weather":
+                all_tool_results.append(weather_results[i])
+                if not weather_results[i]["success"]:
+                    all_tools_successful = False
+
+            elif tool_name == "Deep_Planning":
+                yield {"type": "status", "content": "Reasoning for a detailed plan...", "tool_name": "Planning"}
+
+                if i in started_tools:
+                    planner_result = await started_tools[i]
+                else:
+                    planner_result = await self._execute_planner_tool_async(tool_data)
+
+                if planner_result["success"]:
+                    yield {"type": "tool_success", "content": "✅ Detailed plan created"}
+                    yield {"type": "response", "content": planner_result["data"]}
+                    response_data.update(self._planner_response(tool_info, tool_data, planner_result, initial_api_result))
+                    return
+                else:
+                    yield {"type": "tool_error", "content": "⚠️ Planning failed"}
+                    all_tool_results.append(self._failed_planner_entry(planner_result))
+                    all_tools_successful = False
+
+            elif tool_name == "Plan_Details":
+                plan_result = self._execute_plan_details_tool(tool_data)
+                yield self._plan_details_update(plan_result)
+                all_tool_results.append(plan_result)
+                if not plan_result["success"]:
+                    all_tools_successful = False
+
+            else:
+                update, entry = self._unknown_tool_result(tool_name)
+                yield update
+                all_tool_results.append(entry)
+                all_tools_successful = False
+
+        if all_tool_results and all_tool_results[0].get("tool") in self.FOLLOWUP_TOOLS:
+            followup_tool = all_tool_results[0]["tool"]
+            followup_messages, history_marker = self._build_tool_followup_messages(
+                tool_info, initial_response_text, all_tool_results, all_tools_successful
+            )
+
+            yield {"type": "status", "content": self.FOLLOWUP_TOOLS[followup_tool]["status"], "tool_name": followup_tool}
+
+            enriched_messages = messages_for_api + followup_messages
+
+            final_result = {}
+            async for update in self._request_chat_completion_async(
+                    enriched_messages, model_type, final_result,
+                    tool_choice="none" if tool_info.get("tool_calls") else None):
+                yield update
+
+            update, followup_data = self._followup_response(tool_info, history_marker, followup_tool,
+                                                            final_result, initial_api_result)
+            yield update
+            response_data.update(followup_data)
+            return
+
+        # Fallback for other cases
+        response_data.update(self._response_data(tool_info["cleaned_response"], initial_api_result))
+
+    async def _run_weather_tools_async(self, tools: list, results: Dict[int, dict],
+                                       started_tools: Dict[int, asyncio.Future] = None) -> AsyncGenerator[Dict, None]:
+        """Async twin of _run_weather_tools; results are written into `results` by tool index."""
+        weather_calls = {i: tool_data for i, tool_data in enumerate(tools) if tool_data.get("Tool") == "Weather"}
+        if not weather_calls:
+            return
+
+        yield self._weather_status_update(weather_calls)
+
+        loop = asyncio.get_running_loop()
+        started_tools = started_tools or {}
+        futures = {started_tools[i] if i in started_tools else loop.run_in_executor(_tool_executor, self._execute_weather_tool, tool_data): i
+                   for i, tool_data in weather_calls.items()}
+        pending = set(futures)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                i = futures[future]
+                update, results[i] = self._summarize_weather_result(weather_calls[i], self._weather_future_result(future))
+                yield update
+
+    async def _execute_planner_tool_async(self, tool_data: Dict[str, str]) -> Dict[str, Any]:
+        """Async twin of _execute_planner_tool."""
+        planner_request_prompt = tool_data.get("Prompt", "").strip()
+
+        if not planner_request_prompt:
+            return {
+                "success": False,
+                "data": "The planning tool was called, but no prompt was provided."
+            }
+
+        result = await self.async_client.chat(
+            messages=[{"role": "user", "content": self._build_planner_prompt(planner_request_prompt)}],
+            model_type="reasoning",
+            response_type="reasoning",
+            retry_budget=self.retry_budget,
+            use_cache=True
+        )
+
+        return self._process_planner_result(result)
+    # ============= end of ASYNC twin =====================
     def _validate_input(self, user_message: str) -> Dict[str, Any]:
         """
         Validate user input
@@ -573,65 +1187,10 @@ class ConversationManager:
         Returns:
             Dict with parsed tool info and cleaned response
         """
-        #print for debugging
-        #print(response)
-        # Pattern to match tool usage blocks
-        pattern = r'\$!\$TOOL_USE_START\$!\$(.*?)\$!\$TOOL_USE_END\$!\$'
-
-        # Find all tool matches
-        tool_matches = re.finditer(pattern, response, re.DOTALL)
-        tool_matches_list = list(tool_matches)
-
-        if not tool_matches_list:
-            return {
-                "has_tool": False,
-                "cleaned_response": response,
-                "tools": []
-            }
-
-        # Parse all tools
-        tools = []
-        for match in tool_matches_list:
-            # Extract tool block content
-            tool_block = match.group(1).strip()
-
-            # Parse tool parameters with support for multi-line values
-            tool_data = {}
-            lines = tool_block.split('\n')
-
-            current_key = None
-            current_value_lines = []
-
-            for line in lines:
-                # Check if this line starts a new key:value pair
-                if ':' in line and not line.startswith(' ') and not line.startswith('\t'):
-                    # Save previous key-value pair if exists
-                    if current_key:
-                        tool_data[current_key] = '\n'.join(current_value_lines).strip()
-
-                    # Start new key-value pair
-                    key, value = line.split(':', 1)
-                    current_key = key.strip()
-                    current_value_lines = [value.strip()]
-                else:
-                    # This is a continuation of the current value (multi-line)
-                    if current_key:
-                        current_value_lines.append(line)
-
-            # Don't forget the last key-value pair
-            if current_key:
-                tool_data[current_key] = '\n'.join(current_value_lines).strip()
-
-            tools.append(tool_data)
-
-        # Remove all tool blocks from response for user display
-        cleaned_response = re.sub(pattern, '', response, flags=re.DOTALL).strip()
-
-        return {
-            "has_tool": True,
-            "cleaned_response": cleaned_response,
-            "tools": tools
-        }
+        # Same incremental parser as the streaming path, fed the whole response at once
+        parser = ToolBlockParser()
+        parser.feed(response)
+        return parser.finish()
 
     def _execute_weather_tool(self, tool_data: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -700,6 +1259,22 @@ class ConversationManager:
                 "data": "The planning tool was called, but no prompt was provided."
             }
 
+        final_prompt_for_planner = self._build_planner_prompt(planner_request_prompt)
+
+        # Call the OpenRouter client using the 'reasoning' model configuration.
+        #print(f"🧠 Engaging reasoning model for: {planner_request_prompt[:300]}...")
+        result = self.client.chat(
+            messages=[{"role": "user", "content": final_prompt_for_planner}],
+            model_type="reasoning",  # Use the powerful reasoning model
+            response_type="reasoning",  # Allow for a higher token limit for detailed plans
+            retry_budget=self.retry_budget,
+            use_cache=True  # identical planner prompts get the same plan
+        )
+
+        return self._process_planner_result(result)
+
+    def _build_planner_prompt(self, planner_request_prompt: str) -> str:
+        """Builds the Chain of Thought prompt for the reasoning model."""
         # Construct prompt for the reasoning model.
         # This prompt teaches the model how to approach the task.
         final_prompt_for_planner = f"""
@@ -747,14 +1322,10 @@ start context about the user:
 end context.
 """
 
-        # Call the OpenRouter client using the 'reasoning' model configuration.
-        #print(f"🧠 Engaging reasoning model for: {planner_request_prompt[:300]}...")
-        result = self.client.chat(
-            messages=[{"role": "user", "content": final_prompt_for_planner}],
-            model_type="reasoning",  # Use the powerful reasoning model
-            response_type="reasoning"  # Allow for a higher token limit for detailed plans
-        )
+        return final_prompt_for_planner
 
+    def _process_planner_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Turns the reasoning model's raw result into the planner tool result."""
         # Return the result in a structured format.
         if result["success"]:
             full_output = result["content"]
@@ -812,37 +1383,137 @@ end context.
         """
         user_messages = [msg for msg in self.conversation_history if msg["role"] == "user"]
         assistant_messages = [msg for msg in self.conversation_history if msg["role"] == "assistant"]
+        history_tokens = count_message_tokens(self._history_for_prompt())  # as sent, after summary and trimming
+        history_budget = Config.get_history_token_budget()
+        # Summarized turns no longer stored still count
+        dropped_messages = self.history_summarizer.dropped_messages
+        dropped_turns = self.history_summarizer.dropped_turns
 
         return {
-            "total_messages": len(self.conversation_history),
-            "user_messages": len(user_messages),
-            "assistant_messages": len(assistant_messages),
-            "conversation_turns": len(user_messages),  # Each user message is a turn
-            "history_limit": Config.MAX_CONVERSATION_HISTORY,
-            "approaching_limit": len(self.conversation_history) > (Config.MAX_CONVERSATION_HISTORY * 0.8)
+            "total_messages": len(self.conversation_history) + dropped_messages,
+            "user_messages": len(user_messages) + dropped_turns,
+            "assistant_messages": len(assistant_messages) + dropped_messages - dropped_turns,
+            "conversation_turns": len(user_messages) + dropped_turns,  # Each user message is a turn
+            "history_tokens": history_tokens,
+            "history_limit": history_budget,  # in tokens
+            "approaching_limit": history_tokens > (history_budget * 0.8)
         }
 
     def reset_conversation(self):
         """Reset the conversation to start fresh"""
         self.conversation_history = []
+        self.plan_store.clear()
+        self.history_summarizer.reset()
         print("🔄 Conversation reset - starting fresh!")
 
-    def get_conversation_history(self, include_system: bool = False) -> List[Dict[str, str]]:
+    def get_conversation_history(self, include_system: bool = False, full_plans: bool = False) -> List[Dict[str, str]]:
         """
         Get the conversation history
 
         Args:
             include_system: Whether to include system message (will be dynamically generated)
+            full_plans: Whether to show stored plans in full instead of their digest (for display and export)
 
         Returns:
             List of conversation messages
         """
+        if full_plans:
+            history = [{**message, "content": self.plan_store.expand(message["content"])}
+                       for message in self.conversation_history]
+        else:
+            history = self.conversation_history
+
         if include_system:
-            # Build with current dynamic system prompt
+            # Build with current dynamic system prompt (memoized per context version)
             dynamic_system_prompt = self._build_dynamic_system_prompt()
-            return [{"role": "system", "content": dynamic_system_prompt}] + self.conversation_history.copy()
+            return [{"role": "system", "content": dynamic_system_prompt}, *history]
+        else:
+            return history if full_plans else history.copy()
+
+    def set_conversation_history(self, messages: List[Dict[str, str]]):
+        """
+        Replace the conversation history, e.g. when the UI steps back to an earlier message
+
+        Args:
+            messages: User and assistant messages as displayed (stored plans may appear in full), from the
+                first turn on; turns already dropped from the stored history are skipped
+        """
+        dropped = self.history_summarizer.dropped_messages
+        if len(messages) >= dropped:
+            messages = messages[dropped:]
         else:
-            return self.conversation_history.copy()
+            # Stepped back past the stored history: the summaries describe turns no longer there
+            self.history_summarizer.reset()
+
+        # Displayed replies differ from the stored ones (tool markers, plan digests), so turns that are
+        # still the same exchange keep their stored messages; that also keeps history summaries valid
+        stored_turns = split_into_turns(self.conversation_history)
+        next_stored = 0
+        history = []
+        for turn in split_into_turns(messages):
+            if (next_stored < len(stored_turns) and len(stored_turns[next_stored]) == len(turn) and
+                    stored_turns[next_stored][0] == turn[0]):
+                history.extend(stored_turns[next_stored])
+                next_stored += 1
+            else:
+                history.extend({**message, "content": self.plan_store.compact(message["content"])} for message in turn)
+        self.conversation_history = history
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """
+        Capture the session's state, so any worker can resume it with from_checkpoint()
+
+        Covers the history, stored plans, history summaries, user context and tracking data.
+        Clients and the built-in system prompt are not included; they come from the resuming process.
+
+        Returns:
+            JSON-serializable dict (see checkpoints.encode_checkpoint for the stored form)
+        """
+        return {
+            "version": CHECKPOINT_VERSION,
+            "history": self.conversation_history,
+            "plans": self.plan_store.to_checkpoint(),
+            "summaries": self.history_summarizer.to_checkpoint(self.conversation_history),
+            "context": self.context_manager.to_checkpoint() if self.context_manager else None,
+            "tracker": self.tracker.to_checkpoint() if self.tracker else None,
+            "system_prompt": self.custom_system_prompt
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], client: OpenRouterClient,
+                        async_client: AsyncOpenRouterClient = None, weather_client: WeatherClient = None,
+                        tracking_dir: str = "conversations") -> "ConversationManager":
+        """
+        Resume a session from to_checkpoint() output
+
+        Args:
+            checkpoint: Dict from to_checkpoint()
+            client: OpenRouter client instance (dependency injection)
+            async_client: AsyncOpenRouterClient instance (optional)
+            weather_client: WeatherClient instance, may be shared between sessions (optional)
+            tracking_dir: Base output directory of the restored ConversationTracker
+
+        Returns:
+            The restored ConversationManager
+
+        Raises:
+            ValueError: If the checkpoint was written in another format version
+        """
+        check_checkpoint_version(checkpoint)
+        context_manager = (ContextManager.from_checkpoint(checkpoint["context"], client, async_client)
+                           if checkpoint["context"] is not None else None)
+        tracker = (ConversationTracker.from_checkpoint(checkpoint["tracker"], base_output_dir=tracking_dir)
+                   if checkpoint["tracker"] is not None else None)
+
+        manager = cls(client, context_manager=context_manager, tracker=tracker, async_client=async_client,
+                      weather_client=weather_client)
+        manager.conversation_history = checkpoint["history"]
+        manager.plan_store = PlanStore.from_checkpoint(checkpoint["plans"], Config.PLAN_DIGEST_TOKENS)
+        manager.history_summarizer = HistorySummarizer.from_checkpoint(checkpoint["summaries"], manager.conversation_history,
+                                                                       client, async_client)
+        if checkpoint["system_prompt"]:
+            manager.change_system_prompt(checkpoint["system_prompt"])
+        return manager
 
     def start_interactive_session(self, enable_tracking: bool = True):
         """
@@ -884,7 +1555,7 @@ end context.
                         print(f"   Turns: {summary['conversation_turns']}")
                         print(f"   Total messages: {summary['total_messages']}")
                         if summary['approaching_limit']:
-                            print(f"   ⚠️  Approaching history limit ({summary['history_limit']})")
+                            print(f"   ⚠️  Approaching history limit ({summary['history_tokens']}/{summary['history_limit']} tokens)")
 
                         # Show tracking info if available
                         tracking_info = self.get_tracking_info()
@@ -930,6 +1601,8 @@ end context.
             raise ValueError("System prompt cannot be empty")
 
         self.base_system_prompt = new_prompt.strip()
+        self.custom_system_prompt = self.base_system_prompt
+        self.native_tools_system_prompt = self._build_native_tools_prompt(self.base_system_prompt)
         print(f"✅ Base system prompt updated")
         # Note: No need to reset conversation - dynamic prompts will use new base immediately
 
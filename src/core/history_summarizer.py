@@ -0,0 +1,290 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+from ..clients.openrouter_client import OpenRouterClient, AsyncOpenRouterClient
+from ..utils.config import Config
+from ..utils.tokens import count_message_tokens, split_into_turns, trim_history_to_budget
+
+SUMMARY_SYSTEM_PROMPT = """You maintain the running summary of a conversation between a user and Phileas, a travel assistant.
+You receive the current summary and the next messages of the conversation. Reply with the updated summary only.
+
+Keep everything a travel assistant needs to continue the conversation: destinations, dates, travelers, budget,
+preferences, decisions made, open questions, weather results, and the ids of plans created (e.g. plan-1).
+Drop greetings, small talk and anything superseded later. Write compact bullet points, at most 250 words."""
+
+# Shared by all sessions; a conversation has at most one fold in flight
+_summary_executor = ThreadPoolExecutor(max_workers=Config.HISTORY_SUMMARY_MAX_WORKERS, thread_name_prefix="summary")
+
+
+class HistorySummarizer:
+    """
+    Folds the oldest turns of a conversation into a running summary, in the background
+
+    A summary covers a prefix of the history, and is only used while the history still
+    starts with exactly the messages it was built from. After a retry/edit rollback the
+    latest summary whose messages are all still there is used (older ones are kept for
+    that), and with none the history is trimmed as before until the next fold.
+
+    Once no rollback (Config.HISTORY_ROLLBACK_TURNS) can reach past a summary, compact()
+    drops the messages it covers from the stored history, so a session stays flat in size.
+    """
+
+    def __init__(self, client: OpenRouterClient, async_client: AsyncOpenRouterClient = None):
+        """
+        Initialize the summarizer with dependency injection
+
+        Args:
+            client: OpenRouter client instance (dependency injection)
+            async_client: AsyncOpenRouterClient instance for fold_in_background_async (optional)
+        """
+        self.client = client
+        self.async_client = async_client
+        self.summaries = deque(maxlen=5)  # {"summary", "messages"}, newest last; messages is the prefix it covers
+        self.pending_fold: Optional[Union[Future, asyncio.Task]] = None
+        self.dropped_messages = 0  # oldest messages removed from the stored history by compact()
+        self.dropped_turns = 0
+        self.lock = threading.Lock()
+
+    def messages_for_prompt(self, history: List[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+        """
+        Build the history part of a prompt: the summary, then the messages after it
+
+        Args:
+            history: Full conversation history
+            token_budget: Maximum tokens for the result; the oldest verbatim turns are dropped beyond it
+
+        Returns:
+            Messages to send after the system prompt
+        """
+        summary, covered_count = self._summary_for(history)
+        if not summary:
+            return trim_history_to_budget(history, token_budget)
+
+        summary_messages = [{"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}]
+        recent_budget = token_budget - count_message_tokens(summary_messages)
+        return summary_messages + trim_history_to_budget(history[covered_count:], recent_budget)
+
+    def fold_in_background(self, history: List[Dict[str, str]], token_budget: int) -> Optional[Future]:
+        """
+        Start folding the oldest turns into the summary if the verbatim history has grown too long
+
+        Args:
+            history: Full conversation history (the needed messages are copied)
+            token_budget: The model's history token budget (see Config.HISTORY_SUMMARY_TRIGGER_RATIO)
+
+        Returns:
+            Future resolving to the new summary (None if the fold failed), or None if no fold was started
+        """
+        fold = self._plan_fold(history, token_budget)
+        if fold is None:
+            return None
+
+        self.pending_fold = _summary_executor.submit(self._run_fold, *fold)
+        return self.pending_fold
+
+    def fold_in_background_async(self, history: List[Dict[str, str]], token_budget: int) -> Optional[asyncio.Task]:
+        """Async twin of fold_in_background: schedules the fold as a task on the running loop"""
+        fold = self._plan_fold(history, token_budget)
+        if fold is None:
+            return None
+
+        self.pending_fold = asyncio.create_task(self._run_fold_async(*fold))
+        return self.pending_fold
+
+    def reset(self):
+        """Forget every summary (a fold still running covers the old messages, so it won't be used)"""
+        with self.lock:
+            self.summaries.clear()
+            self.dropped_messages = 0
+            self.dropped_turns = 0
+
+    def compact(self, history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Drop the oldest messages the stored history no longer needs verbatim
+
+        A prefix can go once a summary covers it that stays usable after any rollback of up to
+        Config.HISTORY_ROLLBACK_TURNS turns. Beyond Config.HISTORY_MAX_STORED_TURNS the oldest
+        turns are dropped regardless (e.g. while folds keep failing), as trimming would.
+
+        Args:
+            history: Full stored conversation history
+
+        Returns:
+            The history without the dropped prefix (the same list object if nothing was dropped)
+        """
+        turns = split_into_turns(history)
+        drop_count = 0
+
+        reachable_turns = min(Config.HISTORY_ROLLBACK_TURNS, len(turns))
+        oldest_reachable = len(history) - sum(len(turn) for turn in turns[len(turns) - reachable_turns:])
+        entry = self._entry_for(history[:oldest_reachable]) if reachable_turns < len(turns) else None
+        if entry:
+            drop_count = len(entry["messages"])
+
+        excess_turns = len(turns) - Config.HISTORY_MAX_STORED_TURNS
+        if excess_turns > 0:
+            drop_count = max(drop_count, sum(len(turn) for turn in turns[:excess_turns]))
+
+        if not drop_count:
+            return history
+
+        # Summaries keep referring to a prefix of the stored history: rebase the ones still reachable
+        with self.lock:
+            kept = [{**entry, "messages": entry["messages"][drop_count:]}
+                    for entry in self.summaries if len(entry["messages"]) >= drop_count]
+            self.summaries.clear()
+            self.summaries.extend(kept)
+            self.dropped_messages += drop_count
+            self.dropped_turns += len(split_into_turns(history[:drop_count]))
+        print(f"🗜️  Dropped {drop_count} summarized messages from the stored history")
+        return history[drop_count:]
+
+    def to_checkpoint(self, history: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        The summaries still valid for this history, for a session checkpoint
+
+        Args:
+            history: The conversation history checkpointed alongside
+
+        Returns:
+            Dict with "summaries" (each {"summary", "covered"}: the number of history messages it
+            covers) and the counts of messages/turns already dropped from the history
+        """
+        with self.lock:
+            summaries = list(self.summaries)
+            dropped_messages, dropped_turns = self.dropped_messages, self.dropped_turns
+        return {
+            "summaries": [
+                {"summary": entry["summary"], "covered": len(entry["messages"])}
+                for entry in summaries
+                if len(entry["messages"]) <= len(history) and self._starts_with(history, entry["messages"])
+            ],
+            "dropped_messages": dropped_messages,
+            "dropped_turns": dropped_turns
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], history: List[Dict[str, str]],
+                        client: OpenRouterClient, async_client: AsyncOpenRouterClient = None) -> "HistorySummarizer":
+        """
+        Rebuild a summarizer from to_checkpoint() output
+
+        Args:
+            checkpoint: Dict from to_checkpoint()
+            history: The restored conversation history
+            client: OpenRouter client instance (dependency injection)
+            async_client: AsyncOpenRouterClient instance (optional)
+
+        Returns:
+            The restored HistorySummarizer
+        """
+        summarizer = cls(client, async_client)
+        summarizer.summaries.extend({"summary": entry["summary"], "messages": history[:entry["covered"]]}
+                                    for entry in checkpoint["summaries"])
+        summarizer.dropped_messages = checkpoint["dropped_messages"]
+        summarizer.dropped_turns = checkpoint["dropped_turns"]
+        return summarizer
+
+    def _summary_for(self, history: List[Dict[str, str]]) -> Tuple[str, int]:
+        """The newest summary still valid for this history, and how many messages it covers ("" and 0 if none)"""
+        entry = self._entry_for(history)
+        return (entry["summary"], len(entry["messages"])) if entry else ("", 0)
+
+    def _entry_for(self, history: List[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        """The newest summary entry still valid for this history, or None"""
+        with self.lock:
+            summaries = list(self.summaries)
+
+        # After a rollback, a summary must still leave the newest turns verbatim
+        recent_turns = split_into_turns(history)[-Config.HISTORY_SUMMARY_KEEP_TURNS:] if Config.HISTORY_SUMMARY_KEEP_TURNS else []
+        max_covered = len(history) - sum(len(turn) for turn in recent_turns)
+        for entry in reversed(summaries):
+            covered = entry["messages"]
+            if len(covered) <= max_covered and self._starts_with(history, covered):
+                return entry
+        return None
+
+    @staticmethod
+    def _starts_with(history: List[Dict[str, str]], prefix: List[Dict[str, str]]) -> bool:
+        """Whether history starts with exactly these messages (without slicing a copy of it)"""
+        return all(message is expected or message == expected for message, expected in zip(history, prefix))
+
+    def _plan_fold(self, history: List[Dict[str, str]],
+                   token_budget: int) -> Optional[Tuple[str, List[Dict[str, str]], List[Dict[str, str]], int]]:
+        """
+        Decide whether to fold, and what
+
+        Returns:
+            None if a fold is running or not needed yet, else a tuple of:
+            - the summary to build on
+            - the messages to fold in
+            - the history prefix the new summary will cover
+            - dropped_messages when the fold was planned
+        """
+        if self.pending_fold is not None and not self.pending_fold.done():
+            return None
+
+        summary, covered_count = self._summary_for(history)
+        recent = history[covered_count:]
+        if count_message_tokens(recent) <= token_budget * Config.HISTORY_SUMMARY_TRIGGER_RATIO:
+            return None
+
+        # The newest turns always stay verbatim
+        turns = split_into_turns(recent)
+        fold_turns = turns[:-Config.HISTORY_SUMMARY_KEEP_TURNS] if Config.HISTORY_SUMMARY_KEEP_TURNS else turns
+        if not fold_turns:
+            return None
+
+        to_fold = [message for turn in fold_turns for message in turn]
+        return summary, to_fold, list(history[:covered_count + len(to_fold)]), self.dropped_messages
+
+    def _build_fold_messages(self, summary: str, to_fold: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the request asking the context model for the updated summary"""
+        transcript = "\n\n".join(f"{message['role'].capitalize()}: {message['content']}" for message in to_fold)
+        return [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Current summary:\n{summary or '(none yet)'}\n\nNext messages:\n{transcript}"}
+        ]
+
+    def _run_fold(self, summary: str, to_fold: List[Dict[str, str]], covered: List[Dict[str, str]],
+                  dropped_messages: int) -> Optional[str]:
+        """Worker body of fold_in_background"""
+        result = self.client.chat(self._build_fold_messages(summary, to_fold), model_type="context",
+                                  response_type="summary", use_cache=True)  # identical after retry/edit rollbacks
+        return self._apply_fold(result, covered, dropped_messages)
+
+    async def _run_fold_async(self, summary: str, to_fold: List[Dict[str, str]],
+                              covered: List[Dict[str, str]], dropped_messages: int) -> Optional[str]:
+        """Task body of fold_in_background_async"""
+        if not self.async_client:
+            return await asyncio.to_thread(self._run_fold, summary, to_fold, covered, dropped_messages)
+
+        result = await self.async_client.chat(self._build_fold_messages(summary, to_fold), model_type="context",
+                                              response_type="summary", use_cache=True)
+        return self._apply_fold(result, covered, dropped_messages)
+
+    def _apply_fold(self, result: Dict[str, Any], covered: List[Dict[str, str]], dropped_messages: int) -> Optional[str]:
+        """
+        Store the summary returned by the context model
+
+        Args:
+            result: Result of the summary request
+            covered: History prefix the summary covers, as it was when the fold started
+            dropped_messages: dropped_messages when the fold started (compact() may have run since)
+
+        Returns:
+            The new summary, or None if the request failed
+        """
+        if not result["success"] or not result["content"].strip():
+            print(f"⚠️  Could not summarize older turns: {result.get('error', 'empty summary')}")
+            return None
+
+        summary = result["content"].strip()
+        with self.lock:
+            covered = covered[self.dropped_messages - dropped_messages:]
+            self.summaries.append({"summary": summary, "messages": covered})
+        print(f"🗜️  Folded older turns into the conversation summary ({len(covered)} messages covered)")
+        return summary
@@ -0,0 +1,163 @@
+import re
+import threading
+from typing import Dict, Any, Optional
+
+from ..utils.tokens import count_tokens
+
+# Lines kept in a plan digest: markdown headings, bold lead-ins ("**Day 1: Kyoto**") and totals
+_OUTLINE_LINE = re.compile(r"^\s*(#{1,6}\s|\*\*[^*]+\*\*|.*\btotal\b)", re.IGNORECASE)
+_MAX_OUTLINE_LINE_LENGTH = 120
+
+
+def build_plan_digest(plan_id: str, plan: str, token_budget: int) -> str:
+    """
+    Build a compact stand-in for a plan, to keep in the conversation history
+
+    The digest is the plan's outline (headings, day lines, totals) cut to the token budget,
+    followed by a note telling the model how to get the full text back.
+
+    Args:
+        plan_id: Id of the plan in the PlanStore
+        plan: The user-facing plan text
+        token_budget: Approximate maximum size of the outline
+
+    Returns:
+        The digest text
+    """
+    outline_lines = [line.strip()[:_MAX_OUTLINE_LINE_LENGTH] for line in plan.splitlines() if _OUTLINE_LINE.match(line)]
+    if not outline_lines:
+        # No structure to outline: keep the opening of the plan instead
+        outline_lines = [line.strip()[:_MAX_OUTLINE_LINE_LENGTH] for line in plan.splitlines() if line.strip()]
+
+    kept_lines = []
+    used_tokens = 0
+    for line in outline_lines:
+        line_tokens = count_tokens(line) + 1
+        if used_tokens + line_tokens > token_budget:
+            kept_lines.append("...")
+            break
+        kept_lines.append(line)
+        used_tokens += line_tokens
+
+    outline = "\n".join(kept_lines)
+    return (f"[Plan {plan_id} - outline only, the user sees the full plan]\n{outline}\n"
+            f"[Use the Plan_Details tool with Plan_Id: {plan_id} to read the full plan]")
+
+
+class PlanStore:
+    """
+    Side store for the planner's full output, so the history only carries a digest
+
+    Each conversation has its own store. The history holds the digest in place of the
+    full plan; compact() and expand() convert between the two representations, so the
+    UI and exports can still show the full text.
+    """
+
+    def __init__(self, digest_tokens: int):
+        """
+        Initialize an empty store
+
+        Args:
+            digest_tokens: Token budget for each plan digest
+        """
+        self.digest_tokens = digest_tokens
+        self.plans: Dict[str, Dict[str, str]] = {}
+        self.next_number = 1
+        self.lock = threading.Lock()
+
+    def add(self, plan: str, full_text: str, request_prompt: str = "") -> str:
+        """
+        Store a plan
+
+        Args:
+            plan: The user-facing plan (returned by the Plan_Details tool)
+            full_text: The text shown to the user for it, replaced by the digest in the history
+            request_prompt: The planner request, kept for reference
+
+        Returns:
+            The new plan's id
+        """
+        with self.lock:
+            plan_id = f"plan-{self.next_number}"
+            self.next_number += 1
+            self.plans[plan_id] = {
+                "plan": plan,
+                "full_text": full_text,
+                "digest": build_plan_digest(plan_id, plan, self.digest_tokens),
+                "request_prompt": request_prompt
+            }
+        print(f"📋 Stored {plan_id} ({count_tokens(full_text)} tokens, kept as a digest in the history)")
+        return plan_id
+
+    def get(self, plan_id: str = None) -> Optional[Dict[str, str]]:
+        """Get a stored plan by id (the latest plan if no id is given), or None"""
+        with self.lock:
+            if not plan_id:
+                return self.plans[next(reversed(self.plans))] if self.plans else None
+            return self.plans.get(plan_id.strip().lower())
+
+    def lookup(self, plan_id: str = None) -> Dict[str, Any]:
+        """
+        Plan_Details tool: the full text of a stored plan
+
+        Args:
+            plan_id: Id from the plan's digest (the latest plan if empty)
+
+        Returns:
+            Dict with success, plan_id and data (the plan) or error
+        """
+        entry = self.get(plan_id)
+        if entry is None:
+            with self.lock:
+                known_ids = ", ".join(self.plans) or "none"
+            return {"success": False, "plan_id": plan_id or "latest",
+                    "error": f"No plan with id '{plan_id}' (stored plans: {known_ids})"}
+        return {"success": True, "plan_id": plan_id or "latest", "data": entry["plan"]}
+
+    def compact(self, text: str) -> str:
+        """Replace every stored plan in `text` (its full text, or just the plan as the UI shows it) with its digest"""
+        with self.lock:
+            entries = list(self.plans.values())
+        for entry in entries:
+            for shown_text in (entry["full_text"], entry["plan"]):
+                if shown_text and shown_text in text:
+                    text = text.replace(shown_text, entry["digest"])
+                    break
+        return text
+
+    def expand(self, text: str) -> str:
+        """Inverse of compact(): put the full text back in place of each digest"""
+        with self.lock:
+            entries = list(self.plans.values())
+        for entry in entries:
+            if entry["digest"] in text:
+                text = text.replace(entry["digest"], entry["full_text"])
+        return text
+
+    def clear(self):
+        """Forget every stored plan"""
+        with self.lock:
+            self.plans = {}
+            self.next_number = 1
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """The stored plans and the next plan number, for a session checkpoint"""
+        with self.lock:
+            return {"plans": dict(self.plans), "next_number": self.next_number}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], digest_tokens: int) -> "PlanStore":
+        """
+        Rebuild a store from to_checkpoint() output
+
+        Args:
+            checkpoint: Dict from to_checkpoint()
+            digest_tokens: Token budget for digests of new plans
+
+        Returns:
+            The restored PlanStore (stored digests are kept as is, since the history refers to them)
+        """
+        store = cls(digest_tokens)
+        store.plans = dict(checkpoint["plans"])
+        store.next_number = checkpoint["next_number"]
+        return store
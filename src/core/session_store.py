@@ -0,0 +1,247 @@
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+from ..clients.openrouter_client import OpenRouterClient, AsyncOpenRouterClient
+from ..clients.weather_client import WeatherClient
+from ..tracking.conversation_tracker import ConversationTracker
+from ..utils.config import Config
+from .checkpoints import get_checkpoint_store
+from .context_manager import ContextManager
+from .conversation_manager import ConversationManager
+
+
+class SessionStore:
+    """
+    Holds the conversations of many users in one process, keyed by session id
+
+    Every session shares the injected clients and one WeatherClient. Sessions in use are
+    pinned; idle ones are checkpointed to the checkpoint store and dropped from memory, least
+    recently used first, once the store holds more than Config.SESSION_STORE_MAX_ACTIVE
+    sessions or roughly Config.SESSION_STORE_MAX_MEMORY_MB of conversation text, or after
+    Config.SESSION_IDLE_TIMEOUT seconds. A spilled session is restored on its next use, by
+    any worker process sharing the checkpoint store.
+    """
+
+    def __init__(self, client: OpenRouterClient, async_client: AsyncOpenRouterClient = None,
+                 checkpoint_store=None, tracking_dir: str = "conversations"):
+        """
+        Initialize the session store with dependency injection
+
+        Args:
+            client: OpenRouter client shared by every session (dependency injection)
+            async_client: AsyncOpenRouterClient shared by every session (optional)
+            checkpoint_store: DirectoryCheckpointStore or SQLiteCheckpointStore for spilled sessions
+                (default: the process-wide store from Config)
+            tracking_dir: Base output directory of each session's ConversationTracker
+        """
+        self.client = client
+        self.async_client = async_client
+        self.weather_client = WeatherClient()  # stateless, so one serves every session
+        self.checkpoint_store = checkpoint_store or get_checkpoint_store()
+        self.tracking_dir = tracking_dir
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # least recently used first
+        self.spilling: Dict[str, threading.Event] = {}  # sessions being checkpointed -> set once that is done
+        self.restoring: Dict[str, threading.Event] = {}  # sessions being restored or built -> set once in memory
+        self.lock = threading.RLock()
+        self.stats = {"created": 0, "spilled": 0, "restored": 0}
+
+        print("✅ Session Store initialized")
+
+    # ============= Public API =====================
+
+    @contextmanager
+    def session(self, session_id: str = None) -> Iterator[ConversationManager]:
+        """
+        Use a session for the duration of a request; it can't be spilled meanwhile
+
+        Args:
+            session_id: Id of the session (created if unknown, restored if spilled)
+
+        Yields:
+            The session's ConversationManager
+        """
+        manager = self.acquire(session_id)
+        try:
+            yield manager
+        finally:
+            self.release(session_id)
+
+    def acquire(self, session_id: str) -> ConversationManager:
+        """
+        Get a session's manager and pin it in memory until release()
+
+        Args:
+            session_id: Id of the session (created if unknown, restored if spilled)
+
+        Returns:
+            The session's ConversationManager
+        """
+        while True:
+            with self.lock:
+                busy = self.spilling.get(session_id) or self.restoring.get(session_id)
+                if busy is None:
+                    entry = self.sessions.get(session_id)
+                    if entry is not None:
+                        return self._pin(session_id, entry)
+                    restoring = self.restoring[session_id] = threading.Event()
+                    break
+            # Its checkpoint is being written or read outside the lock; take it over once that is done
+            busy.wait()
+
+        # Loading the checkpoint and building the session happen outside the lock, so other sessions aren't held up
+        try:
+            manager = self._restore(session_id)
+            created = manager is None
+            if created:
+                manager = self._build_manager()
+            with self.lock:
+                self.stats["created" if created else "restored"] += 1
+                entry = {"manager": manager, "pins": 0, "last_used": time.time(), "size": 0}
+                self.sessions[session_id] = entry
+                return self._pin(session_id, entry)
+        finally:
+            with self.lock:
+                self.restoring.pop(session_id)
+            restoring.set()
+
+    def release(self, session_id: str):
+        """
+        Unpin a session after a request, then spill idle sessions if the store is over its caps
+
+        Args:
+            session_id: Id passed to acquire()
+        """
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is not None:
+                entry["pins"] -= 1
+                entry["last_used"] = time.time()
+                entry["size"] = self._estimate_size(entry["manager"])
+        self.evict()
+
+    def new_session_id(self) -> str:
+        """Generate an id for a new session"""
+        return uuid.uuid4().hex
+
+    def evict(self):
+        """Spill idle sessions to the checkpoint store until the store is back under its caps"""
+        victims = []
+        with self.lock:
+            now = time.time()
+            max_bytes = Config.SESSION_STORE_MAX_MEMORY_MB * 1024 * 1024
+            total_bytes = sum(entry["size"] for entry in self.sessions.values())
+
+            for session_id, entry in list(self.sessions.items()):
+                over_caps = len(self.sessions) > Config.SESSION_STORE_MAX_ACTIVE or total_bytes > max_bytes
+                expired = now - entry["last_used"] > Config.SESSION_IDLE_TIMEOUT
+                if not over_caps and not expired:
+                    continue
+                if entry["pins"] > 0 or self._has_background_work(entry["manager"]):
+                    continue
+                total_bytes -= entry["size"]
+                del self.sessions[session_id]
+                self.spilling[session_id] = threading.Event()
+                victims.append((session_id, entry))
+
+        # Checkpointing (encoding and I/O) happens outside the lock, so other sessions aren't held up
+        for session_id, entry in victims:
+            try:
+                self._spill(session_id, entry["manager"])
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print(f"⚠️ Could not spill session {session_id[:8]}, keeping it in memory: {str(e)}")
+                with self.lock:
+                    self.sessions[session_id] = entry
+                    self.sessions.move_to_end(session_id, last=False)
+            finally:
+                with self.lock:
+                    self.spilling.pop(session_id).set()
+
+    def discard(self, session_id: str):
+        """Forget a session, in memory and in the checkpoint store"""
+        while True:
+            with self.lock:
+                busy = self.spilling.get(session_id) or self.restoring.get(session_id)
+                if busy is None:
+                    self.sessions.pop(session_id, None)
+                    self.checkpoint_store.delete(session_id)
+                    return
+            busy.wait()  # otherwise the spill would write the checkpoint back, or the restore re-add the session
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sessions in memory, their approximate size, and created/spilled/restored counters"""
+        with self.lock:
+            return {
+                "active_sessions": len(self.sessions),
+                "active_bytes": sum(entry["size"] for entry in self.sessions.values()),
+                **self.stats
+            }
+
+    # ============= Helpers =====================
+
+    def _pin(self, session_id: str, entry: Dict[str, Any]) -> ConversationManager:
+        """Mark a session in memory as most recently used and pin it (caller holds the lock)"""
+        self.sessions.move_to_end(session_id)
+        entry["pins"] += 1
+        entry["last_used"] = time.time()
+        return entry["manager"]
+
+    def _build_manager(self) -> ConversationManager:
+        """Build a fresh session graph around the shared clients"""
+        return ConversationManager(
+            client=self.client,
+            context_manager=ContextManager(self.client, async_client=self.async_client),
+            tracker=ConversationTracker(base_output_dir=self.tracking_dir),
+            async_client=self.async_client,
+            weather_client=self.weather_client
+        )
+
+    def _estimate_size(self, manager: ConversationManager) -> int:
+        """Approximate bytes of conversation text a session holds (the shared prompt and clients excluded)"""
+        size = sum(len(message["content"] or "") for message in manager.conversation_history)
+        size += sum(len(plan["full_text"]) + len(plan["plan"]) + len(plan["digest"])
+                    for plan in manager.plan_store.plans.values())
+        size += sum(len(entry["summary"]) for entry in manager.history_summarizer.summaries)
+        if manager.context_manager:
+            size += len(manager.context_manager.user_context or "")
+            size += sum(len(snapshot or "") for snapshot in manager.context_manager.context_snapshots)
+        if manager.tracker:
+            size += sum(len(exchange["assistant_response"] or "") + len(exchange["user_message"] or "")
+                        for exchange in manager.tracker.conversation_transcript)
+        return size
+
+    def _has_background_work(self, manager: ConversationManager) -> bool:
+        """Whether a session's background context update or summary fold is still running (it is spilled once they land)"""
+        pending = [manager.history_summarizer.pending_fold]
+        if manager.context_manager:
+            pending += [manager.context_manager.pending_update, manager.context_manager.pending_async_update]
+        return any(work is not None and not work.done() for work in pending)
+
+    def _spill(self, session_id: str, manager: ConversationManager):
+        """Checkpoint a session to the checkpoint store (called without the lock, once it left self.sessions)"""
+        self.checkpoint_store.save(session_id, manager.to_checkpoint())
+        with self.lock:
+            self.stats["spilled"] += 1
+        print(f"💤 Spilled idle session {session_id[:8]} to the checkpoint store")
+
+    def _restore(self, session_id: str) -> Optional[ConversationManager]:
+        """Resume a session from its checkpoint, or None if it has none (called without the lock)"""
+        try:
+            checkpoint = self.checkpoint_store.load(session_id)
+            if checkpoint is None:
+                return None
+            manager = ConversationManager.from_checkpoint(
+                checkpoint, self.client, async_client=self.async_client,
+                weather_client=self.weather_client, tracking_dir=self.tracking_dir
+            )
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            print(f"⚠️ Could not restore session {session_id[:8]}: {str(e)}")
+            return None
+
+        # The checkpoint stays until the next spill replaces it, so a crash meanwhile doesn't lose the session
+        print(f"♻️ Restored session {session_id[:8]} from its checkpoint")
+        return manager
@@ -0,0 +1,122 @@
+import json
+from typing import List, Dict, Any
+
+# Function definitions for native tool calling; parameter names match the text protocol's keys,
+# so tool calls convert to the same tool dicts that ToolBlockParser produces
+TOOL_DEFINITIONS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "Weather",
+            "description": "Get the weather forecast for one location and date range. Only works up to 6 days from "
+                           "today. Call it once per location (up to 5 calls at once, in parallel).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "Location": {"type": "string", "description": "City and country, or a specific location"},
+                    "Start_Date": {"type": "string", "description": "First day, YYYY-MM-DD"},
+                    "End_Date": {"type": "string", "description": "Last day, YYYY-MM-DD"}
+                },
+                "required": ["Location", "Start_Date", "End_Date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "Deep_Planning",
+            "description": "Hand a planning task (trip itinerary, problem solving, anything needing a longer, "
+                           "detailed answer) to a specialist planner. Use at most once per response, never "
+                           "together with Weather.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "Prompt": {
+                        "type": "string",
+                        "description": "Short, self-contained description of the user and the task. The planner "
+                                       "can't see the conversation, so include every relevant detail (note missing "
+                                       "ones such as 'Budget is not specified'), but give no instructions about "
+                                       "format or content."
+                    }
+                },
+                "required": ["Prompt"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "Plan_Details",
+            "description": "Read the full text of a plan you created earlier. Earlier plans appear in the "
+                           "conversation as a short outline with a plan id. Use at most once per response.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "Plan_Id": {"type": "string", "description": "The plan id from the outline, e.g. plan-1"}
+                },
+                "required": ["Plan_Id"]
+            }
+        }
+    }
+]
+
+# Replaces the text-protocol <Tool_Usage> section of the system prompt when tools are declared natively
+NATIVE_TOOL_USAGE_PROMPT = """    <Tool_Usage>
+        You have access to external tools (Weather, Deep_Planning, Plan_Details) that can provide real-time information or that will enhance your travel advice. Their parameters are described in the tool definitions.
+
+        - **Weather:** Use it when forecast information would genuinely improve your advice (packing, weather concerns, weather-dependent activities, outdoor plans). If dates aren't specified, ask the user for their travel dates first. For dates more than 6 days away, don't use it: explain your limitation and give a very short approximation based on averages. Never check the same location and dates twice.
+        - **Deep_Planning:** Use it for any plan, concrete suggestions or problem solving that needs a longer answer. Gather the necessary information first (for trip planning, generally a destination and duration).
+        - **Plan_Details:** Earlier plans appear in the conversation as a short outline (the user saw them in full). Use it when the user asks about details the outline doesn't show, then answer without repeating the whole plan.
+        - Before calling a tool, tell the user in a short sentence that you're checking the weather or using the advanced planner for him. Don't present results you don't have yet, and don't ask a question in the same message.
+        - When you receive weather results, **never share them raw** (they include notes meant only for you). Give a simple report that a 10 year old would understand; a nice table is optimal.
+    </Tool_Usage>"""
+
+
+def tool_calls_to_tools(tool_calls: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Convert native tool calls into the tool dicts used by the text protocol
+
+    Args:
+        tool_calls: Tool calls as returned by the client ({"id", "name", "arguments"})
+
+    Returns:
+        List of dicts like {"Tool": "Weather", "Location": "Paris", ...}, one per call
+    """
+    tools = []
+    for call in tool_calls:
+        try:
+            arguments = json.loads(call["arguments"] or "{}")
+        except json.JSONDecodeError:
+            print(f"⚠️ Could not parse arguments of tool call {call['name']}: {call['arguments'][:100]}")
+            arguments = {}
+        if not isinstance(arguments, dict):
+            arguments = {}
+        tools.append({"Tool": call["name"], **{key: str(value) for key, value in arguments.items()}})
+    return tools
+
+
+def build_tool_result_messages(assistant_text: str, tool_calls: List[Dict[str, str]],
+                               tool_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the assistant tool-call message and one tool message per call, for the follow-up request
+
+    Args:
+        assistant_text: Text the model wrote alongside its tool calls
+        tool_calls: Tool calls as returned by the client
+        tool_results: Result entries in call order ("success" plus "data" or "error")
+
+    Returns:
+        Messages to append after the original request messages
+    """
+    messages = [{
+        "role": "assistant",
+        "content": assistant_text or None,
+        "tool_calls": [
+            {"id": call["id"], "type": "function", "function": {"name": call["name"], "arguments": call["arguments"]}}
+            for call in tool_calls
+        ]
+    }]
+    for call, result in zip(tool_calls, tool_results):
+        content = result["data"] if result["success"] else f"Tool call failed: {result.get('error', 'Unknown error')}"
+        messages.append({"role": "tool", "tool_call_id": call["id"], "content": content})
+    return messages
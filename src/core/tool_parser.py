@@ -0,0 +1,151 @@
+from typing import List, Dict, Any
+
+TOOL_START_MARKER = "$!$TOOL_USE_START$!$"
+TOOL_END_MARKER = "$!$TOOL_USE_END$!$"
+
+
+def parse_tool_block(tool_block: str) -> Dict[str, str]:
+    """
+    Parse the "Key: value" lines of one tool block (values may span several lines)
+
+    Args:
+        tool_block: Text between the start and end markers
+
+    Returns:
+        Dict of tool parameters, e.g. {"Tool": "Weather", "Location": "Paris", ...}
+    """
+    tool_data = {}
+    current_key = None
+    current_value_lines = []
+
+    for line in tool_block.strip().split('\n'):
+        # Check if this line starts a new key:value pair
+        if ':' in line and not line.startswith(' ') and not line.startswith('\t'):
+            # Save previous key-value pair if exists
+            if current_key:
+                tool_data[current_key] = '\n'.join(current_value_lines).strip()
+
+            # Start new key-value pair
+            key, value = line.split(':', 1)
+            current_key = key.strip()
+            current_value_lines = [value.strip()]
+        else:
+            # This is a continuation of the current value (multi-line)
+            if current_key:
+                current_value_lines.append(line)
+
+    # Don't forget the last key-value pair
+    if current_key:
+        tool_data[current_key] = '\n'.join(current_value_lines).strip()
+
+    return tool_data
+
+
+class ToolBlockParser:
+    """
+    Incremental parser for tool blocks in a model response
+
+    Text is fed as it streams in, and each tool block is reported as soon as its end
+    marker arrives, so the tool can start while the model is still generating.
+    Feeding a whole response at once gives the same result.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser, outside any tool block"""
+        self.text = ""
+        self.in_block = False
+        self.consumed = 0  # text before this index has been assigned to the response or a block
+        self.search_from = 0  # where the next marker search starts (avoids rescanning long text)
+        self.block_start = 0  # start of the open block's content
+        self.first_marker = None  # index of the first start marker, if seen
+        self.cleaned_parts = []  # response text outside tool blocks
+        self.tools: List[Dict[str, str]] = []
+        self.block_ends: List[int] = []  # index just past each closed block's end marker, parallel to tools
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """
+        Add streamed text
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            The tools whose blocks were completed by this chunk, in order
+        """
+        self.text += chunk
+        closed_tools = []
+
+        while True:
+            marker = TOOL_END_MARKER if self.in_block else TOOL_START_MARKER
+            index = self.text.find(marker, self.search_from)
+            if index == -1:
+                # A marker may still be split across chunks, so keep its possible prefix searchable
+                self.search_from = max(self.consumed, len(self.text) - len(marker) + 1)
+                break
+
+            if self.in_block:
+                tool_data = parse_tool_block(self.text[self.block_start:index])
+                self.tools.append(tool_data)
+                self.block_ends.append(index + len(marker))
+                closed_tools.append(tool_data)
+                self.in_block = False
+            else:
+                self.cleaned_parts.append(self.text[self.consumed:index])
+                if self.first_marker is None:
+                    self.first_marker = index
+                self.in_block = True
+                self.block_start = index + len(marker)
+
+            self.consumed = self.search_from = index + len(marker)
+
+        return closed_tools
+
+    @property
+    def visible_length(self) -> int:
+        """How much of the text can be shown to the user: everything before the first tool block"""
+        if self.first_marker is not None:
+            return self.first_marker
+
+        # Hold back a trailing partial marker until the next chunk settles it
+        for prefix_length in range(min(len(TOOL_START_MARKER) - 1, len(self.text)), 0, -1):
+            if self.text.endswith(TOOL_START_MARKER[:prefix_length]):
+                return len(self.text) - prefix_length
+        return len(self.text)
+
+    @property
+    def past_last_block(self) -> bool:
+        """
+        Whether the response has moved on from its tool blocks
+
+        True once a block has closed and the text after it is something other than the
+        start of another block, so consecutive blocks are still read in full.
+        """
+        if not self.tools or self.in_block:
+            return False
+        trailing = self.text[self.consumed:].lstrip()
+        return bool(trailing) and not TOOL_START_MARKER.startswith(trailing[:len(TOOL_START_MARKER)])
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Finish parsing (an unclosed block is kept as plain text)
+
+        Returns:
+            Dict with has_tool, the response without tool blocks (cleaned_response) and the parsed tools
+        """
+        if not self.tools:
+            return {
+                "has_tool": False,
+                "cleaned_response": self.text,
+                "tools": []
+            }
+
+        if self.in_block:
+            remainder = self.text[self.block_start - len(TOOL_START_MARKER):]
+        else:
+            remainder = self.text[self.consumed:]
+
+        return {
+            "has_tool": True,
+            "cleaned_response": ("".join(self.cleaned_parts) + remainder).strip(),
+            "tools": list(self.tools)
+        }
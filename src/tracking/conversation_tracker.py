@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -27,6 +28,7 @@ class ConversationTracker:
         self.performance_metrics = []
         self.session_metadata = {}
         self.step_back_events = []  # Track retry/edit events separately
+        self.lock = threading.RLock()  # background context updates report from worker threads
 
         print("✅ ConversationTracker initialized")
 
@@ -62,7 +64,9 @@ class ConversationTracker:
             "total_turns": 0,
             "total_duration": None,
             "models_used": set(),
-            "errors_encountered": []
+            "errors_encountered": [],
+            "prompt_tokens_cached": 0,  # served from the provider's prompt cache
+            "prompt_tokens_uncached": 0
         }
 
         print(f"📁 Started tracking session: {session_id}")
@@ -86,50 +90,75 @@ class ConversationTracker:
             print("⚠️ No active session - call start_session() first")
             return
 
-        timestamp = datetime.now()
-        turn_number = len(self.conversation_transcript) + 1
-
-        # Track conversation transcript
-        self.conversation_transcript.append({
-            "turn": turn_number,
-            "timestamp": timestamp.isoformat(),
-            "user_message": user_message,
-            "assistant_response": response_data.get("response", ""),
-            "success": response_data.get("success", False)
-        })
-
-        # Track context progression
-        self.context_progression.append({
-            "turn": turn_number,
-            "timestamp": timestamp.isoformat(),
-            "context_before": context_before,
-            "context_after": context_after,
-            "context_changed": context_before != context_after
-        })
-
-        # Track performance metrics
-        self.performance_metrics.append({
-            "turn": turn_number,
-            "timestamp": timestamp.isoformat(),
-            "model_used": response_data.get("model_used", "unknown"),
-            "success": response_data.get("success", False),
-            "conversation_length": response_data.get("conversation_length", 0),
-            "usage": response_data.get("usage"),
-            "error": response_data.get("error") if not response_data.get("success") else None
-        })
-
-        # Update session metadata
-        self.session_metadata["total_turns"] = turn_number
-        if response_data.get("model_used"):
-            self.session_metadata["models_used"].add(response_data["model_used"])
-        if not response_data.get("success") and response_data.get("error"):
-            self.session_metadata["errors_encountered"].append({
+        # Background context updates fill in context_after from worker threads meanwhile
+        with self.lock:
+            timestamp = datetime.now()
+            turn_number = len(self.conversation_transcript) + 1
+
+            # Track conversation transcript
+            self.conversation_transcript.append({
                 "turn": turn_number,
-                "error": response_data["error"]
+                "timestamp": timestamp.isoformat(),
+                "user_message": user_message,
+                "assistant_response": response_data.get("response", ""),
+                "success": response_data.get("success", False)
             })
 
-        # Write files after each exchange (lightweight, non-blocking)
-        self._write_files()
+            # Track context progression
+            self.context_progression.append({
+                "turn": turn_number,
+                "timestamp": timestamp.isoformat(),
+                "context_before": context_before,
+                "context_after": context_after,
+                "context_changed": context_before != context_after
+            })
+
+            # Track performance metrics
+            prompt_cache = self._prompt_cache_usage(response_data.get("usage"))
+            self.performance_metrics.append({
+                "turn": turn_number,
+                "timestamp": timestamp.isoformat(),
+                "model_used": response_data.get("model_used", "unknown"),
+                "success": response_data.get("success", False),
+                "conversation_length": response_data.get("conversation_length", 0),
+                "usage": response_data.get("usage"),
+                "prompt_cache": prompt_cache,  # cached vs uncached prompt tokens, from usage.prompt_tokens_details
+                "response_cache": response_data.get("response_cache"),  # client's cumulative hit/miss counters
+                "error": response_data.get("error") if not response_data.get("success") else None
+            })
+
+            # Update session metadata
+            self.session_metadata["total_turns"] = turn_number
+            if response_data.get("model_used"):
+                self.session_metadata["models_used"].add(response_data["model_used"])
+            if prompt_cache:
+                self.session_metadata["prompt_tokens_cached"] += prompt_cache["cached_tokens"]
+                self.session_metadata["prompt_tokens_uncached"] += prompt_cache["uncached_tokens"]
+            if not response_data.get("success") and response_data.get("error"):
+                self.session_metadata["errors_encountered"].append({
+                    "turn": turn_number,
+                    "error": response_data["error"]
+                })
+
+            # Write files after each exchange (lightweight, non-blocking)
+            self._write_files()
+
+    @staticmethod
+    def _prompt_cache_usage(usage: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """
+        Split a response's prompt tokens into cached and uncached ones
+
+        Args:
+            usage: The "usage" dict of the response (may be None)
+
+        Returns:
+            Dict with cached_tokens and uncached_tokens, or None without usage data
+        """
+        if not usage or usage.get("prompt_tokens") is None:
+            return None
+        details = usage.get("prompt_tokens_details") or {}
+        cached_tokens = details.get("cached_tokens") or 0
+        return {"cached_tokens": cached_tokens, "uncached_tokens": usage["prompt_tokens"] - cached_tokens}
 
     def track_step_back_event(self, event_type: str, target_index: int, original_content: str = "",
                               new_content: str = ""):
@@ -145,40 +174,65 @@ class ConversationTracker:
         if not self.session_id:
             return
 
-        timestamp = datetime.now()
+        with self.lock:
+            timestamp = datetime.now()
 
-        # Store step-back event separately (not as a conversation turn)
-        event_data = {
-            "timestamp": timestamp.isoformat(),
-            "event_type": event_type,
-            "target_index": target_index,
-            "original_content": original_content,
-            "new_content": new_content
-        }
-
-        self.step_back_events.append(event_data)
-
-        # Also track in context progression
-        self.context_progression.append({
-            "turn": len(self.conversation_transcript) + 1,
-            "timestamp": timestamp.isoformat(),
-            "context_before": "",
-            "context_after": "",
-            "context_changed": False,
-            "step_back_event": {
-                "type": event_type,
+            # Store step-back event separately (not as a conversation turn)
+            event_data = {
+                "timestamp": timestamp.isoformat(),
+                "event_type": event_type,
                 "target_index": target_index,
-                "description": f"User {event_type}ed message at index {target_index}"
+                "original_content": original_content,
+                "new_content": new_content
             }
-        })
 
-        # Write files after tracking the event
-        self._write_files()
+            self.step_back_events.append(event_data)
+
+            # Also track in context progression
+            self.context_progression.append({
+                "turn": len(self.conversation_transcript) + 1,
+                "timestamp": timestamp.isoformat(),
+                "context_before": "",
+                "context_after": "",
+                "context_changed": False,
+                "step_back_event": {
+                    "type": event_type,
+                    "target_index": target_index,
+                    "description": f"User {event_type}ed message at index {target_index}"
+                }
+            })
+
+            # Write files after tracking the event
+            self._write_files()
 
         print(f"📝 Tracked {event_type} event for message {target_index}")
 
+    def update_context_after(self, turn: int, context_after: str):
+        """
+        Fill in a turn's context_after once its background context update has finished
+
+        Args:
+            turn: Turn number returned in get_current_session_info()["turns_tracked"] after tracking it
+            context_after: User context produced by the update
+        """
+        with self.lock:
+            if not self.session_id:
+                return
+
+            for entry in self.context_progression:
+                if entry["turn"] == turn and "step_back_event" not in entry:
+                    entry["context_after"] = context_after
+                    entry["context_changed"] = entry["context_before"] != context_after
+                    self._write_files()
+                    return
+
     def _write_files(self):
         """Write all tracking data to files in appropriate formats"""
+        with self.lock:
+            self._write_files_locked()
+
+    def _write_files_locked(self):
+        """Body of _write_files (caller holds the lock)"""
         try:
             # Write transcript.md (human-readable conversation)
             self._write_transcript_md()
@@ -365,7 +419,9 @@ class ConversationTracker:
         summary += f"**Duration:** {self.session_metadata.get('total_duration', 'N/A')}\n"
         summary += f"**Total Turns:** {self.session_metadata['total_turns']}\n"
         summary += f"**Models Used:** {', '.join(self.session_metadata['models_used'])}\n"
-        summary += f"**Errors:** {len(self.session_metadata['errors_encountered'])}\n\n"
+        summary += f"**Errors:** {len(self.session_metadata['errors_encountered'])}\n"
+        summary += (f"**Prompt Tokens:** {self.session_metadata['prompt_tokens_cached']} cached, "
+                    f"{self.session_metadata['prompt_tokens_uncached']} uncached\n\n")
 
         if self.session_metadata['errors_encountered']:
             summary += "## Errors Encountered\n\n"
@@ -382,6 +438,51 @@ class ConversationTracker:
         with open(self.session_dir / "Session_Summary.md", "w", encoding="utf-8") as f:
             f.write(summary)
 
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """The session's tracking data, for a session checkpoint ({"session_id": None} if no session is active)"""
+        if not self.session_id:
+            return {"session_id": None}
+
+        with self.lock:
+            return {
+                "session_id": self.session_id,
+                "start_time": self.session_start_time.isoformat(),
+                "conversation_transcript": list(self.conversation_transcript),
+                "context_progression": list(self.context_progression),
+                "performance_metrics": list(self.performance_metrics),
+                "session_metadata": {**self.session_metadata,
+                                     "models_used": sorted(self.session_metadata["models_used"])},
+                "step_back_events": list(self.step_back_events)
+            }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], base_output_dir: str = "conversations") -> "ConversationTracker":
+        """
+        Rebuild a tracker from to_checkpoint() output; it keeps writing to the same session folder
+
+        Args:
+            checkpoint: Dict from to_checkpoint()
+            base_output_dir: Base directory where conversation folders are created
+
+        Returns:
+            The restored ConversationTracker
+        """
+        tracker = cls(base_output_dir=base_output_dir)
+        if not checkpoint["session_id"]:
+            return tracker
+
+        tracker.session_id = checkpoint["session_id"]
+        tracker.session_start_time = datetime.fromisoformat(checkpoint["start_time"])
+        tracker.session_dir = tracker.base_output_dir / tracker.session_id
+        tracker.session_dir.mkdir(parents=True, exist_ok=True)
+        tracker.conversation_transcript = checkpoint["conversation_transcript"]
+        tracker.context_progression = checkpoint["context_progression"]
+        tracker.performance_metrics = checkpoint["performance_metrics"]
+        tracker.session_metadata = {**checkpoint["session_metadata"],
+                                    "models_used": set(checkpoint["session_metadata"]["models_used"])}
+        tracker.step_back_events = checkpoint["step_back_events"]
+        return tracker
+
     def get_current_session_info(self) -> Dict[str, Any]:
         """Get information about the current session"""
         if not self.session_id:
@@ -26,23 +26,101 @@ class Config:
     # Weather API Configuration
     OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
     OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+    OPENWEATHER_GEO_URL = "https://api.openweathermap.org/geo/1.0"
+    WEATHER_HTTP_POOL_SIZE = 10  # keep-alive connections to OpenWeather, shared by all WeatherClients in the process
+    WEATHER_HTTP_MAX_RETRIES = 2  # retries of failed weather GETs (connection errors, 429, 5xx)
+    WEATHER_HTTP_RETRY_BACKOFF = 0.5  # base delay (seconds) of the exponential backoff between those retries
+    GEOCODE_CACHE_PATH = "cache/geocode.sqlite3"  # geocoding results kept across restarts ("" for memory only)
+    GEOCODE_CACHE_MAX_ENTRIES = 1024  # locations kept in the in-memory LRU in front of the SQLite file
+    GEOCODE_CACHE_TTL = 30 * 24 * 3600  # seconds coordinates stay valid (they practically never change)
+    GEOCODE_NEGATIVE_TTL = 24 * 3600  # seconds a "location not found" result is remembered
+    WEATHER_CURRENT_FROM_FORECAST = True  # low-latency mode: current conditions come from the nearest forecast slot (one data call instead of two)
+    FORECAST_UPDATE_INTERVAL = 3 * 3600  # the 5-day/3-hour forecast changes on this cadence; cached copies expire at its boundaries
+    CURRENT_WEATHER_UPDATE_INTERVAL = 600  # current conditions change about every 10 minutes
+    WEATHER_STALE_TTL = 1800  # seconds expired weather is still served while a background request refreshes it
+    WEATHER_CACHE_COORD_DECIMALS = 2  # lat/lon rounding of weather cache keys (~1 km)
+    WEATHER_CACHE_MAX_ENTRIES = 512  # weather payloads kept in memory, shared by all sessions
+    WEATHER_REFRESH_MAX_WORKERS = 2  # background refreshes of stale weather running at once
 
     # Rate Limits & Timeouts
     REQUEST_TIMEOUT = 7  # seconds
-    MAX_RETRIES = 2
-    RETRY_DELAY = 1  # seconds between retries
+    HTTP_MAX_CONNECTIONS = 20  # shared OpenRouter connection pool, across all clients in the process
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 10  # idle connections kept warm for reuse
+    HTTP_KEEPALIVE_EXPIRY = 60  # seconds an idle connection is kept open
+    HTTP2_ENABLED = False  # requires the optional 'h2' package
+    HEALTH_CHECK_TTL = 60  # seconds a health result (probe or real request) is trusted
+    MAX_RETRIES = 2  # retries per model, only for transient errors (timeouts, 429, 5xx)
+    RETRY_DELAY = 1  # base delay (seconds) for exponential backoff with full jitter
+    RETRY_MAX_DELAY = 8  # cap on a single backoff delay (a server Retry-After may exceed it)
+    TURN_RETRY_BUDGET_SECONDS = 20  # no retries start after this long into a turn
+    TURN_MAX_RETRIES = 4  # total retries across all requests of a turn
+
+    # Circuit breaker (per model): skip a failing primary and go straight to its backup
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # consecutive transient failures that open the circuit
+    CIRCUIT_BREAKER_COOLDOWN = 30  # seconds before a half-open trial request is allowed
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS = 1  # concurrent trial requests while half-open
+
+    # Hedged requests: race chat_backup when chat_primary is slower than usual
+    HEDGE_CHAT_REQUESTS = False  # default for chat calls; costs a second request whenever it fires
+    HEDGE_PERCENTILE = 90  # start the backup once the primary exceeds this latency percentile
+    HEDGE_MIN_SAMPLES = 10  # primary latency samples needed before the percentile is trusted
+    HEDGE_DEFAULT_DELAY = 4.0  # seconds to wait for the primary until enough samples exist
+    HEDGE_MIN_DELAY = 1.0  # never hedge sooner than this (seconds)
+    HEDGE_LATENCY_WINDOW = 100  # recent latency samples kept per model
+    HEDGE_MAX_WORKERS = 8  # threads running hedged request legs in the sync client
 
     # OpenRouter Rate Limits (free tier)
-    REQUESTS_PER_MINUTE = 20
+    REQUESTS_PER_MINUTE = 20  # enforced per model by the shared token-bucket limiter
+    MODEL_REQUESTS_PER_MINUTE = {}  # per-model overrides, e.g. {"deepseek/deepseek-r1:free": 10}
+    RATE_LIMIT_BURST = 5  # requests a model may send back-to-back before queuing
+    RATE_LIMIT_MAX_WAIT = 30  # seconds a request may queue locally before failing
+
+    # Response cache for repeated identical requests (opt-in per call with use_cache=True)
+    TEMPERATURE = 0.7  # sampling temperature for every request (part of the cache key)
+    RESPONSE_CACHE_BACKEND = "memory"  # "memory" (per process) or "sqlite" (survives restarts)
+    RESPONSE_CACHE_TTL = 3600  # seconds a cached response stays valid
+    RESPONSE_CACHE_MAX_ENTRIES = 256  # least recently used entries are evicted beyond this
+    RESPONSE_CACHE_PATH = "cache/llm_responses.sqlite3"  # used by the sqlite backend
+
+    # Provider prompt caching of the static system prompt
+    PROMPT_CACHE_CONTROL_MODELS = ["anthropic/", "google/gemini"]  # model prefixes needing explicit cache_control breakpoints (others cache automatically)
 
     # Conversation Settings
-    MAX_CONVERSATION_HISTORY = 25  # number of turns to remember
+    STREAM_RESPONSES = True  # stream chat replies token by token to the UI
+    NATIVE_TOOL_CALLING = False  # declare tools via the API's `tools` parameter instead of the text protocol
+    MODELS_WITHOUT_TOOL_SUPPORT = []  # models that always use the text protocol (others are detected on first failure)
+    STOP_AFTER_TOOL_BLOCKS = True  # end a streamed reply once it moves past its tool blocks (later text is discarded anyway)
+    TOOL_MAX_WORKERS = 8  # weather lookups running at once, shared by all sessions in the process
+    PLANNER_MAX_WORKERS = 4  # planner calls started early while a reply streams, shared by all sessions (own pool)
+    CONTEXT_UPDATE_MAX_WORKERS = 4  # background user-context updates running at once, shared by all sessions
+    CONTEXT_UPDATE_JOIN_TIMEOUT = 30  # seconds the next turn waits for a running context update
+    COMPACT_PLANS_IN_HISTORY = True  # keep a digest of planner replies in the history; the full plan stays in the plan store
+    PLAN_DIGEST_TOKENS = 300  # size of the outline kept for each plan
+    HISTORY_TOKEN_BUDGET = 3000  # tokens of history kept for the prompt; oldest turns are dropped whole
+    MODEL_HISTORY_TOKEN_BUDGET = {}  # per-model overrides, e.g. {"meta-llama/llama-3.3-70b-instruct:free": 2000}
+    HISTORY_SUMMARY_ENABLED = True  # fold the oldest turns into a running summary (context model) instead of dropping them
+    HISTORY_SUMMARY_TRIGGER_RATIO = 0.6  # fold once the verbatim history passes this fraction of the token budget
+    HISTORY_SUMMARY_KEEP_TURNS = 3  # most recent turns always sent verbatim
+    HISTORY_SUMMARY_MAX_WORKERS = 4  # background folds running at once, shared by all sessions
+    HISTORY_ROLLBACK_TURNS = 5  # turns a retry/edit can step back (context snapshots kept); summarized turns older than that are dropped
+    HISTORY_MAX_STORED_TURNS = 40  # hard cap on stored turns, even if no summary covers the oldest ones yet
     MAX_TOKENS = {
         "chat": 800,  # Normal responses
         "reasoning": 4000,  # Detailed itineraries
-        "simple": 300  # Quick answers
+        "simple": 300,  # Quick answers
+        "summary": 400  # Running summary of older turns
     }
 
+    # Session store (many conversations in one process)
+    SESSION_STORE_MAX_ACTIVE = 200  # sessions kept in memory; the least recently used idle ones are spilled to disk beyond this
+    SESSION_STORE_MAX_MEMORY_MB = 256  # approximate conversation text kept in memory across sessions
+    SESSION_IDLE_TIMEOUT = 1800  # seconds of inactivity after which a session is spilled to disk
+
+    # Session checkpoints (spilled sessions can be resumed by any worker sharing the store)
+    CHECKPOINT_BACKEND = "directory"  # "directory" (one file per session) or "sqlite" (one database file)
+    CHECKPOINT_DIR = "sessions"  # used by the directory backend
+    CHECKPOINT_DB_PATH = "sessions/checkpoints.sqlite3"  # used by the sqlite backend
+
     # External API Keys (will add these later)
     WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "")
     EXCHANGE_RATE_API_KEY = os.getenv("EXCHANGE_RATE_API_KEY", "")
@@ -68,6 +146,10 @@ class Config:
         if cls.REQUEST_TIMEOUT <= 0:
             issues.append("REQUEST_TIMEOUT must be positive")
 
+        # Validate rate limits
+        if cls.REQUESTS_PER_MINUTE <= 0 or any(rpm <= 0 for rpm in cls.MODEL_REQUESTS_PER_MINUTE.values()):
+            issues.append("REQUESTS_PER_MINUTE must be positive")
+
         # Check weather API key
         if not cls.OPENWEATHER_API_KEY:
             issues.append("OPENWEATHER_API_KEY not found - weather features will be disabled")
@@ -99,6 +181,11 @@ class Config:
         else:
             raise ValueError(f"Unknown model type: {model_type}")
 
+    @classmethod
+    def get_history_token_budget(cls, model_type: str = "chat") -> int:
+        """Get the history token budget for the primary model of a model type"""
+        return cls.MODEL_HISTORY_TOKEN_BUDGET.get(cls.get_model(model_type), cls.HISTORY_TOKEN_BUDGET)
+
     @classmethod
     def display_config(cls):
         """Display current configuration (without sensitive data)"""
@@ -106,14 +193,16 @@ class Config:
         print(f"OpenRouter URL: {cls.OPENROUTER_BASE_URL}")
         print(f"API Key Present: {bool(cls.OPENROUTER_API_KEY)}")
         print(f"Request Timeout: {cls.REQUEST_TIMEOUT}s")
-        print(f"Max Retries: {cls.MAX_RETRIES}")
+        print(f"Max Retries: {cls.MAX_RETRIES} per model, {cls.TURN_MAX_RETRIES} per turn ({cls.TURN_RETRY_BUDGET_SECONDS}s budget)")
         print("\nModels:")
         for key, model in cls.MODELS.items():
             print(f"  {key}: {model}")
         print(f"\nMax Tokens:")
         for key, tokens in cls.MAX_TOKENS.items():
             print(f"  {key}: {tokens}")
-        print(f"\nRate Limits: {cls.REQUESTS_PER_MINUTE}/min")
+        print(f"\nHistory Budget: {cls.HISTORY_TOKEN_BUDGET} tokens")
+        print(f"Rate Limits: {cls.REQUESTS_PER_MINUTE}/min per model (burst {cls.RATE_LIMIT_BURST})")
+        print(f"Hedged Chat Requests: {'on' if cls.HEDGE_CHAT_REQUESTS else 'off'} (p{cls.HEDGE_PERCENTILE})")
         print("=" * 40)
 
 
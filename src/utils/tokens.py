@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import List, Dict
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a byte-length estimate
+    tiktoken = None
+
+BYTES_PER_TOKEN = 4  # heuristic without tiktoken; UTF-8 bytes keep non-Latin text (e.g. Hebrew) from being undercounted
+MESSAGE_OVERHEAD_TOKENS = 4  # role and separators added per chat message
+TOKEN_COUNT_CACHE_SIZE = 4096  # texts whose counts are remembered: history messages are recounted every turn
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once (OpenRouter models differ, cl100k_base is a close approximation)"""
+    return tiktoken.get_encoding("cl100k_base") if tiktoken else None
+
+
+@lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+def count_tokens(text: str) -> int:
+    """
+    Count (or estimate) the tokens in a piece of text
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count from tiktoken if installed, else an estimate from the UTF-8 length
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Count the tokens of a list of chat messages, including per-message overhead"""
+    return sum(count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def split_into_turns(history: List[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+    """Group messages into turns: a user message plus the replies that follow it"""
+    turns = []
+    for message in history:
+        if message["role"] == "user" or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def trim_history_to_budget(history: List[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+    """
+    Keep the most recent turns that fit in a token budget
+
+    A turn is a user message plus the replies that follow it, and turns are dropped whole
+    (oldest first) so a user/assistant pair is never split. The newest turn is always kept.
+
+    Args:
+        history: Conversation messages without the system prompt
+        token_budget: Maximum tokens the kept history may use
+
+    Returns:
+        The trimmed history (the same list object if nothing had to be dropped)
+    """
+    turns = split_into_turns(history)
+
+    kept_turns = []
+    total_tokens = 0
+    for turn in reversed(turns):
+        turn_tokens = count_message_tokens(turn)
+        if kept_turns and total_tokens + turn_tokens > token_budget:
+            break
+        kept_turns.append(turn)
+        total_tokens += turn_tokens
+
+    if len(kept_turns) == len(turns):
+        return history
+    return [message for turn in reversed(kept_turns) for message in turn]
@@ -0,0 +1,22 @@
+"""Shared test fixtures"""
+
+import pytest
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """A FakeClock to inject wherever the code under test takes a clock"""
+    return FakeClock()
@@ -0,0 +1,131 @@
+"""Tests for session checkpoints: round-trips through both stores, and version checks"""
+
+import json
+import zlib
+
+import pytest
+
+from src.core.checkpoints import (CHECKPOINT_VERSION, check_checkpoint_version, encode_checkpoint, decode_checkpoint,
+                                  DirectoryCheckpointStore, SQLiteCheckpointStore)
+from src.core.context_manager import ContextManager
+from src.core.conversation_manager import ConversationManager
+from src.tracking.conversation_tracker import ConversationTracker
+
+
+class StubClient:
+    """Client stand-in; a checkpoint round-trip makes no requests"""
+
+    def chat(self, messages, **kwargs):
+        raise AssertionError("no request expected")
+
+    def get_cache_stats(self):
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+class StubWeatherClient:
+    """Weather client stand-in (never called)"""
+
+
+def build_session(tmp_path):
+    """A session with something in every checkpointed part"""
+    client = StubClient()
+    manager = ConversationManager(client, context_manager=ContextManager(client),
+                                  tracker=ConversationTracker(base_output_dir=str(tmp_path / "conversations")),
+                                  weather_client=StubWeatherClient())
+    manager.start_tracking_session("session-1")
+
+    plan_id = manager.plan_store.add("# Day 1\nColosseum", "Thinking...\n# Day 1\nColosseum", "Plan Rome")
+    manager.conversation_history = [
+        {"role": "user", "content": "Plan two days in Rome"},
+        {"role": "assistant", "content": manager.plan_store.compact("Thinking...\n# Day 1\nColosseum")},
+        {"role": "user", "content": "Where should I eat?"},
+        {"role": "assistant", "content": "Try Trastevere."}
+    ]
+    manager.history_summarizer.summaries.append({"summary": "- User plans Rome",
+                                                 "messages": manager.conversation_history[:2]})
+    manager.history_summarizer.dropped_messages = 6
+    manager.history_summarizer.dropped_turns = 3
+    manager.context_manager.save_context_snapshot()
+    manager.context_manager.set_context_manually("User likes Rome and good food.")
+    manager.tracker.track_message_exchange("Where should I eat?", {"success": True, "response": "Try Trastevere."})
+    manager.change_system_prompt("You are a terse travel agent.")
+    return manager, plan_id
+
+
+def assert_same_session(restored, original, plan_id):
+    assert restored.conversation_history == original.conversation_history
+    assert restored.plan_store.get(plan_id) == original.plan_store.get(plan_id)
+    assert restored.plan_store.next_number == original.plan_store.next_number
+    assert list(restored.history_summarizer.summaries) == list(original.history_summarizer.summaries)
+    assert restored.history_summarizer.dropped_messages == 6
+    assert restored.history_summarizer.dropped_turns == 3
+    assert restored.context_manager.user_context == "User likes Rome and good food."
+    assert list(restored.context_manager.context_snapshots) == list(original.context_manager.context_snapshots)
+    assert restored.tracker.session_id == original.tracker.session_id
+    assert restored.tracker.conversation_transcript == original.tracker.conversation_transcript
+    assert restored.base_system_prompt == "You are a terse travel agent."
+
+
+def test_round_trip_through_encoding(tmp_path):
+    manager, plan_id = build_session(tmp_path)
+
+    checkpoint = decode_checkpoint(encode_checkpoint(manager.to_checkpoint()))
+    restored = ConversationManager.from_checkpoint(checkpoint, StubClient(), weather_client=StubWeatherClient(),
+                                                   tracking_dir=str(tmp_path / "conversations"))
+
+    assert_same_session(restored, manager, plan_id)
+    # The restored summary still covers the restored history's prefix
+    assert restored.history_summarizer.summaries[0]["messages"] == restored.conversation_history[:2]
+
+
+@pytest.mark.parametrize("store_type", [DirectoryCheckpointStore, SQLiteCheckpointStore])
+def test_round_trip_through_stores(tmp_path, store_type):
+    manager, plan_id = build_session(tmp_path)
+    store = store_type(str(tmp_path / "checkpoints"))
+
+    store.save("session-1", manager.to_checkpoint())
+    restored = ConversationManager.from_checkpoint(store.load("session-1"), StubClient(),
+                                                   weather_client=StubWeatherClient(),
+                                                   tracking_dir=str(tmp_path / "conversations"))
+
+    assert_same_session(restored, manager, plan_id)
+    store.delete("session-1")
+    assert store.load("session-1") is None
+
+
+def test_future_version_is_rejected(tmp_path):
+    manager, _ = build_session(tmp_path)
+    checkpoint = {**manager.to_checkpoint(), "version": CHECKPOINT_VERSION + 1}
+
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        check_checkpoint_version(checkpoint)
+    with pytest.raises(ValueError):
+        ConversationManager.from_checkpoint(checkpoint, StubClient(), weather_client=StubWeatherClient())
+    with pytest.raises(ValueError):
+        encode_checkpoint(checkpoint)
+
+
+def test_stored_future_version_is_rejected_on_load(tmp_path):
+    manager, _ = build_session(tmp_path)
+    store = DirectoryCheckpointStore(str(tmp_path / "checkpoints"))
+    store.save("session-1", manager.to_checkpoint())
+
+    # Written by a newer release sharing the volume
+    path = tmp_path / "checkpoints" / "session-1.ckpt"
+    checkpoint = decode_checkpoint(path.read_bytes())
+    checkpoint["version"] = CHECKPOINT_VERSION + 1
+    path.write_bytes(zlib.compress(json.dumps(checkpoint).encode("utf-8")))
+
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        store.load("session-1")
+
+
+def test_corrupt_checkpoint_is_rejected():
+    with pytest.raises(ValueError, match="Corrupt checkpoint"):
+        decode_checkpoint(b"not a checkpoint")
+
+
+def test_invalid_session_id_is_rejected(tmp_path):
+    store = DirectoryCheckpointStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.load("../escape")
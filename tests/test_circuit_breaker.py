@@ -0,0 +1,97 @@
+"""Tests for the per-model circuit breaker, driven by an injected clock"""
+
+from src.clients.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+def make_breaker(clock, half_open_max_calls=1):
+    return CircuitBreaker("model", failure_threshold=3, cooldown_seconds=30,
+                          half_open_max_calls=half_open_max_calls, clock=clock)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_stays_closed_below_the_threshold(clock):
+    breaker = make_breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.get_state()["state"] == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = make_breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.get_state()["state"] == CircuitBreaker.CLOSED
+
+
+def test_closed_open_half_open_closed(clock):
+    breaker = make_breaker(clock)
+
+    open_breaker(breaker)
+    assert breaker.get_state()["state"] == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.advance(29)
+    assert not breaker.allow_request()
+    assert breaker.get_state()["seconds_until_trial"] == 1
+
+    clock.advance(1)
+    assert breaker.allow_request()  # the trial request
+    assert breaker.get_state()["state"] == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # only one trial at a time
+
+    breaker.record_success()
+    assert breaker.get_state() == {"state": CircuitBreaker.CLOSED, "consecutive_failures": 0,
+                                   "times_opened": 1, "seconds_until_trial": 0.0}
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens_for_a_full_cooldown(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.advance(30)
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    state = breaker.get_state()
+    assert state["state"] == CircuitBreaker.OPEN
+    assert state["times_opened"] == 2
+    assert not breaker.allow_request()
+
+    clock.advance(29)
+    assert not breaker.allow_request()
+    clock.advance(1)
+    assert breaker.allow_request()
+
+
+def test_half_open_allows_the_configured_number_of_trials(clock):
+    breaker = make_breaker(clock, half_open_max_calls=2)
+    open_breaker(breaker)
+    clock.advance(30)
+
+    assert [breaker.allow_request() for _ in range(3)] == [True, True, False]
+
+
+def test_unanswered_trial_rearms_after_the_cooldown(clock):
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.advance(30)
+    assert breaker.allow_request()  # trial never reports back
+
+    clock.advance(30)
+    assert breaker.allow_request()
+
+
+def test_registry_keeps_one_breaker_per_model():
+    registry = CircuitBreakerRegistry()
+    assert registry.get("a") is registry.get("a")
+    assert registry.get("a") is not registry.get("b")
+    assert set(registry.get_states()) == {"a", "b"}
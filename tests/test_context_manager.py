@@ -0,0 +1,62 @@
+"""Tests for undoing context updates while a background update is still in flight"""
+
+import asyncio
+
+from src.core.context_manager import ContextManager
+
+HISTORY = [{"role": "user", "content": "I'm vegetarian"}, {"role": "assistant", "content": "Noted!"}]
+
+
+class StubClient:
+    """Sync client stand-in: every context update lands right away"""
+
+    def simple_chat(self, user_message, **kwargs):
+        return "User is vegetarian and plans a trip to Rome."
+
+
+class BlockingAsyncClient:
+    """Async client stand-in whose context update only lands once released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def simple_chat(self, user_message, **kwargs):
+        await self.release.wait()
+        return "User is vegetarian, plans a trip to Rome and loves museums."
+
+
+def test_restore_pops_the_snapshot_of_a_landed_update():
+    manager = ContextManager(StubClient())
+    initial_context = manager.user_context
+
+    manager.update_context_in_background(HISTORY)
+    assert manager.restore_context_snapshot(1)
+
+    assert manager.user_context == initial_context
+    assert len(manager.context_snapshots) == 0
+
+
+def test_restore_accounts_for_an_async_update_in_flight():
+    async def scenario():
+        async_client = BlockingAsyncClient()
+        manager = ContextManager(StubClient(), async_client=async_client)
+        initial_context = manager.user_context
+
+        # First turn's update landed; the second turn's is still running
+        manager.update_context_in_background(HISTORY)
+        manager.wait_for_pending_update()
+        first_context = manager.user_context
+        task = manager.update_context_in_background_async(HISTORY)
+        await asyncio.sleep(0)
+
+        # Undoing the second turn keeps the first turn's context and its snapshot
+        assert manager.restore_context_snapshot(1)
+        assert manager.user_context == first_context
+        assert list(manager.context_snapshots) == [initial_context]
+
+        # The in-flight update is discarded when it lands
+        async_client.release.set()
+        assert await task is None
+        assert manager.user_context == first_context
+
+    asyncio.run(scenario())
@@ -0,0 +1,77 @@
+"""Tests for the token-bucket rate limiter, driven by an injected clock"""
+
+import pytest
+
+from src.clients.rate_limiter import TokenBucket, RateLimiter, RateLimitExceeded
+from src.utils.config import Config
+
+
+def test_bucket_starts_full_and_bursts(clock):
+    bucket = TokenBucket(requests_per_minute=60, capacity=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(clock):
+    bucket = TokenBucket(requests_per_minute=60, capacity=2, clock=clock)  # one token per second
+    bucket.try_acquire()
+    bucket.try_acquire()
+
+    clock.advance(1.0)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.advance(60.0)
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_reserve_hands_out_waits_in_fifo_order(clock):
+    bucket = TokenBucket(requests_per_minute=60, capacity=1, clock=clock)
+
+    # Each reservation goes further into debt, so later callers wait longer
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert bucket.reserve() == pytest.approx(3.0)
+
+    # Time passing pays the debt down
+    clock.advance(2.5)
+    assert bucket.reserve() == pytest.approx(1.5)
+
+
+def test_reserve_refuses_waits_over_max_wait_without_taking_a_token(clock):
+    bucket = TokenBucket(requests_per_minute=60, capacity=1, clock=clock)
+    bucket.reserve()
+
+    assert bucket.reserve(max_wait=0.5) is None
+    # The refused call left no debt behind
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(1.0)
+
+
+def test_limiter_reserve_raises_over_the_limit_and_counts_it(monkeypatch, clock):
+    monkeypatch.setattr(Config, "RATE_LIMIT_BURST", 1)
+    monkeypatch.setattr(Config, "REQUESTS_PER_MINUTE", 6)  # one token per 10 seconds
+    monkeypatch.setattr(Config, "MODEL_REQUESTS_PER_MINUTE", {})
+    limiter = RateLimiter(clock=clock)
+
+    assert limiter._reserve("model", timeout=5) == 0.0
+    with pytest.raises(RateLimitExceeded):
+        limiter._reserve("model", timeout=5)
+    assert limiter._reserve("model", timeout=15) == pytest.approx(10.0)
+
+    stats = limiter.get_stats()["model"]
+    assert (stats["acquired"], stats["rejected"]) == (2, 1)
+    assert stats["max_wait"] == pytest.approx(10.0)
+
+
+def test_limiter_keeps_a_bucket_per_model(monkeypatch, clock):
+    monkeypatch.setattr(Config, "RATE_LIMIT_BURST", 1)
+    monkeypatch.setattr(Config, "REQUESTS_PER_MINUTE", 6)
+    monkeypatch.setattr(Config, "MODEL_REQUESTS_PER_MINUTE", {"fast": 600})
+    limiter = RateLimiter(clock=clock)
+
+    assert limiter.try_acquire("slow") and limiter.try_acquire("fast")
+    assert not limiter.try_acquire("slow")
+    clock.advance(0.1)
+    assert limiter.try_acquire("fast")
+    assert not limiter.try_acquire("slow")
@@ -0,0 +1,112 @@
+"""Tests for retry classification, Retry-After parsing, backoff and the per-turn retry budget"""
+
+import threading
+from datetime import datetime, timezone
+
+import httpx
+import openai
+import pytest
+
+from src.clients import retry_policy
+from src.clients.retry_policy import RetryBudget, is_retryable_error, get_retry_after, compute_retry_delay
+from src.utils.config import Config
+
+REQUEST = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+NOW = datetime(2026, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def status_error(status_code, headers=None):
+    """An SDK error for an HTTP response with this status and headers"""
+    response = httpx.Response(status_code, headers=headers or {}, request=REQUEST)
+    return openai.APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+
+@pytest.mark.parametrize("status_code", [408, 409, 425, 429, 500, 502, 503, 504, 520])
+def test_retryable_statuses(status_code):
+    assert is_retryable_error(status_error(status_code))
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 404, 413, 422])
+def test_non_retryable_statuses(status_code):
+    assert not is_retryable_error(status_error(status_code))
+
+
+def test_timeouts_and_connection_errors_are_retryable():
+    assert is_retryable_error(openai.APITimeoutError(request=REQUEST))
+    assert is_retryable_error(openai.APIConnectionError(request=REQUEST))
+    assert not is_retryable_error(ValueError("bad request body"))
+
+
+def test_retry_after_ms_wins_over_seconds():
+    error = status_error(429, {"retry-after-ms": "1500", "retry-after": "9"})
+    assert get_retry_after(error, now=NOW) == pytest.approx(1.5)
+
+
+def test_retry_after_seconds():
+    assert get_retry_after(status_error(503, {"retry-after": "7"}), now=NOW) == 7.0
+
+
+def test_retry_after_http_date():
+    error = status_error(503, {"retry-after": "Fri, 01 May 2026 12:00:30 GMT"})
+    assert get_retry_after(error, now=NOW) == pytest.approx(30.0)
+
+
+def test_retry_after_in_the_past_means_no_wait():
+    error = status_error(503, {"retry-after": "Fri, 01 May 2026 11:59:00 GMT"})
+    assert get_retry_after(error, now=NOW) == 0.0
+
+
+def test_retry_after_missing_or_garbled():
+    assert get_retry_after(status_error(503), now=NOW) is None
+    assert get_retry_after(status_error(503, {"retry-after": "soon"}), now=NOW) is None
+    assert get_retry_after(openai.APITimeoutError(request=REQUEST), now=NOW) is None
+
+
+def test_retry_delay_uses_retry_after():
+    assert compute_retry_delay(status_error(429, {"retry-after": "4"}), attempt=3) == 4.0
+
+
+def test_retry_delay_is_full_jitter_under_the_exponential_cap(monkeypatch):
+    monkeypatch.setattr(Config, "RETRY_DELAY", 1.0)
+    monkeypatch.setattr(Config, "RETRY_MAX_DELAY", 5.0)
+    monkeypatch.setattr(retry_policy.random, "uniform", lambda low, high: (low, high))
+
+    error = status_error(502)
+    assert compute_retry_delay(error, attempt=0) == (0, 1.0)
+    assert compute_retry_delay(error, attempt=2) == (0, 4.0)
+    assert compute_retry_delay(error, attempt=5) == (0, 5.0)
+
+
+def test_budget_caps_the_number_of_retries(clock):
+    budget = RetryBudget(max_seconds=60, max_retries=2, clock=clock)
+    assert [budget.try_spend(1.0) for _ in range(3)] == [True, True, False]
+
+
+def test_budget_refuses_retries_past_its_deadline(clock):
+    budget = RetryBudget(max_seconds=10, max_retries=5, clock=clock)
+
+    assert not budget.try_spend(11.0)
+    clock.advance(8)
+    assert budget.remaining() == pytest.approx(2.0)
+    assert budget.try_spend(2.0)
+    assert not budget.try_spend(2.5)
+    clock.advance(5)
+    assert budget.remaining() == 0.0
+
+
+def test_budget_is_not_overspent_by_concurrent_callers():
+    budget = RetryBudget(max_seconds=60, max_retries=50)
+    spent = []
+
+    def spend():
+        for _ in range(20):
+            spent.append(budget.try_spend(0.0))
+
+    threads = [threading.Thread(target=spend) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert spent.count(True) == 50
+    assert budget.retries_left == 0
@@ -0,0 +1,132 @@
+"""
+Smoke check of ConversationManager.send_message_async, driven end to end with stub clients
+(no network, no API key needed)
+"""
+
+import asyncio
+
+from src.core.conversation_manager import ConversationManager
+from src.core.tool_parser import TOOL_START_MARKER, TOOL_END_MARKER
+from src.utils.config import Config
+
+MODEL = "stub/model"
+
+
+class StubClient:
+    """Sync client stand-in: only what send_message_async touches besides the async client"""
+
+    def chat(self, messages, **kwargs):
+        return {"success": True, "content": "- summary", "model_used": MODEL, "usage": None, "finish_reason": "stop"}
+
+    def get_cache_stats(self):
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+class StubAsyncClient:
+    """Async client stand-in: replies from a script, in chunks, like AsyncOpenRouterClient.chat_stream"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def chat(self, messages, **kwargs):
+        self.requests.append(messages)
+        return {"success": True, "content": self.replies.pop(0), "model_used": MODEL, "usage": None,
+                "finish_reason": "stop"}
+
+    async def chat_stream(self, messages, stop_when=None, **kwargs):
+        self.requests.append(messages)
+        reply = self.replies.pop(0)
+        content, finish_reason = "", "stop"
+        for start in range(0, len(reply), 7):
+            content += reply[start:start + 7]
+            yield reply[start:start + 7]
+            if stop_when and stop_when():
+                finish_reason = "stop_when"
+                break
+        yield {"success": True, "content": content, "model_used": MODEL, "usage": None,
+               "finish_reason": finish_reason}
+
+
+class StubWeatherClient:
+    """Weather client stand-in returning a fixed forecast"""
+
+    def get_forecast(self, location, start_date, end_date):
+        return {"success": True, "data": f"Sunny in {location}"}
+
+
+def run_turn(manager, message):
+    """Collect every update of one send_message_async turn"""
+    async def collect():
+        return [update async for update in manager.send_message_async(message)]
+    return asyncio.run(collect())
+
+
+def build_manager(replies):
+    async_client = StubAsyncClient(replies)
+    manager = ConversationManager(StubClient(), async_client=async_client, weather_client=StubWeatherClient())
+    return manager, async_client
+
+
+def test_plain_reply_streams_and_lands_in_history(monkeypatch):
+    monkeypatch.setattr(Config, "STREAM_RESPONSES", True)
+    monkeypatch.setattr(Config, "NATIVE_TOOL_CALLING", False)
+    manager, _ = build_manager(["Hello, I'm Phileas. Where would you like to go?"])
+
+    updates = run_turn(manager, "Hi")
+
+    types = [update["type"] for update in updates]
+    assert types[0] == "status" and types[-1] == "final_response"
+    assert "".join(update["content"] for update in updates if update["type"] == "delta") == \
+        "Hello, I'm Phileas. Where would you like to go?"
+    assert updates[-1]["success"] is True
+    assert manager.conversation_history == [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello, I'm Phileas. Where would you like to go?"}
+    ]
+
+
+def test_weather_tool_runs_and_gets_a_followup(monkeypatch):
+    monkeypatch.setattr(Config, "STREAM_RESPONSES", True)
+    monkeypatch.setattr(Config, "NATIVE_TOOL_CALLING", False)
+    tool_reply = (f"Let me check.\n{TOOL_START_MARKER}\nTool: Weather\nLocation: Rome\n"
+                  f"Start_Date: 2026-05-01\nEnd_Date: 2026-05-03\n{TOOL_END_MARKER}")
+    manager, async_client = build_manager([tool_reply, "Pack light clothes."])
+
+    updates = run_turn(manager, "Weather in Rome in May?")
+
+    types = [update["type"] for update in updates]
+    assert "interim_response" in types and "tool_success" in types
+    # The tool block itself never reaches the user
+    assert all(TOOL_START_MARKER not in update["content"] for update in updates if update["type"] == "delta")
+    # The follow-up request carries the weather result
+    assert any("Sunny in Rome" in message["content"] for message in async_client.requests[1])
+    assert updates[-1]["type"] == "final_response"
+    assert updates[-1]["content"].endswith("Pack light clothes.")
+    assert manager.conversation_history[-1]["role"] == "assistant"
+
+
+def test_text_clipped_by_stopping_after_the_tool_block_is_dropped(monkeypatch):
+    monkeypatch.setattr(Config, "STREAM_RESPONSES", True)
+    monkeypatch.setattr(Config, "NATIVE_TOOL_CALLING", False)
+    monkeypatch.setattr(Config, "STOP_AFTER_TOOL_BLOCKS", True)
+    tool_reply = (f"Let me check.\n{TOOL_START_MARKER}\nTool: Weather\nLocation: Rome\n"
+                  f"Start_Date: 2026-05-01\nEnd_Date: 2026-05-03\n{TOOL_END_MARKER}\n\nThis text is never finished")
+    manager, async_client = build_manager([tool_reply, "Pack light clothes."])
+
+    updates = run_turn(manager, "Weather in Rome in May?")
+
+    interim = [update["content"] for update in updates if update["type"] == "interim_response"]
+    assert interim == ["Let me check."]
+    assert async_client.requests[1][-2]["content"].endswith(TOOL_END_MARKER)
+    assert "Thi" not in manager.conversation_history[-1]["content"]
+
+
+def test_missing_async_client_is_reported():
+    manager = ConversationManager(StubClient(), weather_client=StubWeatherClient())
+    try:
+        run_turn(manager, "Hi")
+    except ValueError as e:
+        assert "async client" in str(e)
+    else:
+        raise AssertionError("send_message_async ran without an async client")
@@ -0,0 +1,56 @@
+"""Tests for token counting and token-budgeted history trimming"""
+
+from src.utils.tokens import count_message_tokens, split_into_turns, trim_history_to_budget
+
+
+def turn(index, reply_length=10, replies=1):
+    """One user message and its assistant replies"""
+    messages = [{"role": "user", "content": f"question {index}"}]
+    messages += [{"role": "assistant", "content": f"{index}:" + "x" * reply_length} for _ in range(replies)]
+    return messages
+
+
+def history_of(*turns):
+    return [message for messages in turns for message in messages]
+
+
+def test_split_into_turns_groups_replies_with_their_user_message():
+    history = history_of(turn(1), turn(2, replies=2))
+    assert split_into_turns(history) == [turn(1), turn(2, replies=2)]
+
+
+def test_history_within_budget_is_returned_as_is():
+    history = history_of(turn(1), turn(2))
+    assert trim_history_to_budget(history, count_message_tokens(history)) is history
+
+
+def test_oldest_turns_are_dropped_whole():
+    turns = [turn(1), turn(2, replies=2), turn(3), turn(4)]
+    history = history_of(*turns)
+    budget = count_message_tokens(history_of(*turns[2:])) + 1
+
+    trimmed = trim_history_to_budget(history, budget)
+
+    assert trimmed == history_of(*turns[2:])
+    assert trimmed[0]["role"] == "user"
+
+
+def test_a_turn_that_does_not_fit_is_not_split():
+    turns = [turn(1), turn(2, reply_length=400, replies=2), turn(3)]
+    history = history_of(*turns)
+    # Room for the newest turn plus the user message and one reply of the big turn, but not its second reply
+    budget = count_message_tokens(turns[2]) + count_message_tokens(turns[1][:2]) + 1
+
+    trimmed = trim_history_to_budget(history, budget)
+
+    assert trimmed == turns[2]
+
+
+def test_newest_turn_is_kept_even_over_budget():
+    history = history_of(turn(1), turn(2, reply_length=4000))
+    assert trim_history_to_budget(history, 10) == turn(2, reply_length=4000)
+
+
+def test_leading_assistant_messages_count_as_a_turn():
+    history = [{"role": "assistant", "content": "Hello, I'm Phileas."}] + turn(1)
+    assert trim_history_to_budget(history, count_message_tokens(turn(1))) == turn(1)
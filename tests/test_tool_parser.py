@@ -0,0 +1,114 @@
+"""Tests for the incremental tool-block parser used while streaming"""
+
+from src.core.tool_parser import ToolBlockParser, TOOL_START_MARKER, TOOL_END_MARKER
+
+WEATHER_BLOCK = f"{TOOL_START_MARKER}\nTool: Weather\nLocation: Rome\n{TOOL_END_MARKER}"
+PLAN_DETAILS_BLOCK = f"{TOOL_START_MARKER}\nTool: Plan_Details\nPlan_Id: plan-1\n{TOOL_END_MARKER}"
+
+
+def feed_in_chunks(parser, text, size):
+    """Feed text in fixed-size chunks, collecting the tools reported as each block closes"""
+    closed = []
+    for start in range(0, len(text), size):
+        closed.extend(parser.feed(text[start:start + size]))
+    return closed
+
+
+def test_markers_split_across_chunks():
+    text = f"Let me check. {WEATHER_BLOCK} Done."
+    for size in (1, 3, 7, len(TOOL_START_MARKER) - 1):
+        parser = ToolBlockParser()
+        closed = feed_in_chunks(parser, text, size)
+
+        assert closed == [{"Tool": "Weather", "Location": "Rome"}]
+        assert parser.finish() == {
+            "has_tool": True,
+            "cleaned_response": "Let me check.  Done.",
+            "tools": [{"Tool": "Weather", "Location": "Rome"}]
+        }
+
+
+def test_streamed_and_whole_feeds_agree():
+    text = f"Intro {WEATHER_BLOCK}\n{PLAN_DETAILS_BLOCK} outro"
+    streamed = ToolBlockParser()
+    feed_in_chunks(streamed, text, 5)
+    whole = ToolBlockParser()
+    whole.feed(text)
+
+    assert streamed.finish() == whole.finish()
+
+
+def test_block_reported_when_its_end_marker_arrives():
+    parser = ToolBlockParser()
+    assert parser.feed(f"Hi {TOOL_START_MARKER}\nTool: Weather\n") == []
+    assert parser.in_block
+    assert parser.feed(f"Location: Rome\n{TOOL_END_MARKER[:5]}") == []
+    assert parser.feed(TOOL_END_MARKER[5:]) == [{"Tool": "Weather", "Location": "Rome"}]
+    assert not parser.in_block
+
+
+def test_unclosed_block_is_kept_as_text():
+    parser = ToolBlockParser()
+    parser.feed(f"Checking {TOOL_START_MARKER}\nTool: Weather\nLocation: Rome")
+
+    assert parser.in_block
+    assert parser.finish() == {
+        "has_tool": False,
+        "cleaned_response": f"Checking {TOOL_START_MARKER}\nTool: Weather\nLocation: Rome",
+        "tools": []
+    }
+
+
+def test_unclosed_block_after_a_closed_one_stays_in_the_response():
+    parser = ToolBlockParser()
+    parser.feed(f"A {WEATHER_BLOCK} B {TOOL_START_MARKER}\nTool: Weather")
+
+    result = parser.finish()
+    assert result["tools"] == [{"Tool": "Weather", "Location": "Rome"}]
+    assert result["cleaned_response"] == f"A  B {TOOL_START_MARKER}\nTool: Weather"
+
+
+def test_visible_length_holds_back_a_partial_marker():
+    parser = ToolBlockParser()
+    parser.feed("Sure. " + TOOL_START_MARKER[:4])
+    assert parser.visible_length == len("Sure. ")
+
+    # The prefix turned out to be ordinary text
+    parser.feed("not a marker")
+    assert parser.visible_length == len(parser.text)
+
+
+def test_visible_length_stops_at_the_first_block():
+    parser = ToolBlockParser()
+    parser.feed(f"Sure. {WEATHER_BLOCK} More text")
+    assert parser.text[:parser.visible_length] == "Sure. "
+
+
+def test_past_last_block_waits_through_consecutive_blocks():
+    parser = ToolBlockParser()
+    parser.feed(WEATHER_BLOCK)
+    assert not parser.past_last_block  # nothing after the block yet
+
+    parser.feed("\n" + TOOL_START_MARKER[:3])
+    assert not parser.past_last_block  # could be the start of another block
+
+    parser.feed(TOOL_START_MARKER[3:] + "\nTool: Plan_Details")
+    assert not parser.past_last_block  # inside the second block
+
+    parser.feed(f"\nPlan_Id: plan-1\n{TOOL_END_MARKER}\n")
+    assert not parser.past_last_block
+    assert len(parser.tools) == 2
+
+
+def test_past_last_block_once_prose_follows():
+    parser = ToolBlockParser()
+    parser.feed(WEATHER_BLOCK)
+    parser.feed("\nMeanwhile, ")
+
+    assert parser.past_last_block
+
+
+def test_past_last_block_needs_a_closed_block():
+    parser = ToolBlockParser()
+    parser.feed("Just prose, no tools.")
+    assert not parser.past_last_block